@@ -0,0 +1,39 @@
+"""Composite indexes for the interrogation hot path
+
+Tables are still created by init_db (Base.metadata.create_all), which also
+creates these indexes on new databases; this revision adds them to existing
+ones. Lookups on session_suspect_topic_states, session_suspect_knowledge_states,
+session_suspect_states and session_evidence_usages are already served by their
+composite primary keys.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_npc_chat_messages_session_suspect_timestamp", "npc_chat_messages", ["session_id", "suspect_id", "timestamp"]),
+    ("ix_npc_chat_messages_session_suspect_sender", "npc_chat_messages", ["session_id", "suspect_id", "sender_type"]),
+    ("ix_secrets_suspect_evidence", "secrets", ["suspect_id", "evidence_id"]),
+    ("ix_suspects_scenario_id", "suspects", ["scenario_id"]),
+    ("ix_evidences_scenario_id", "evidences", ["scenario_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,40 @@
+"""Scenario content hash and schema version for incremental hot-reload
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = [
+    sa.Column("content_hash", sa.String(length=64), nullable=True),
+    sa.Column("schema_version", sa.Integer(), nullable=True),
+]
+
+
+def upgrade() -> None:
+    # init_db (create_all) already adds the columns on new databases
+    existing = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("scenarios")}
+    missing = [c for c in COLUMNS if c.name not in existing]
+    if not missing:
+        return
+
+    with op.batch_alter_table("scenarios") as batch_op:
+        for column in missing:
+            batch_op.add_column(column)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("scenarios") as batch_op:
+        batch_op.drop_column("schema_version")
+        batch_op.drop_column("content_hash")
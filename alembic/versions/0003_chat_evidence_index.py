@@ -0,0 +1,37 @@
+"""Partial index for evidence-bearing chat messages (NPC pressure points)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+WHERE = sa.text("evidence_id IS NOT NULL")
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_npc_chat_messages_session_suspect_evidence",
+        "npc_chat_messages",
+        ["session_id", "suspect_id"],
+        sqlite_where=WHERE,
+        postgresql_where=WHERE,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_npc_chat_messages_session_suspect_evidence",
+        table_name="npc_chat_messages",
+        if_exists=True
+    )
@@ -0,0 +1,39 @@
+"""Rolling conversation summary on session_suspect_states
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    sa.Column("conversation_summary", sa.String(), nullable=True),
+    sa.Column("summary_through_message_id", sa.Integer(), nullable=True),
+]
+
+
+def upgrade() -> None:
+    # init_db (create_all) already adds the columns on new databases
+    existing = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("session_suspect_states")}
+    missing = [c for c in COLUMNS if c.name not in existing]
+    if not missing:
+        return
+
+    with op.batch_alter_table("session_suspect_states") as batch_op:
+        for column in missing:
+            batch_op.add_column(column)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("session_suspect_states") as batch_op:
+        batch_op.drop_column("summary_through_message_id")
+        batch_op.drop_column("conversation_summary")
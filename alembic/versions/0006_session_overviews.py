@@ -0,0 +1,31 @@
+"""Denormalized session overview read model
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing sessions get their overview built on first read
+    op.create_table(
+        "session_overviews",
+        sa.Column("session_id", sa.Integer(), sa.ForeignKey("sessions.id"), primary_key=True),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("session_overviews", if_exists=True)
@@ -0,0 +1,65 @@
+"""Compact session state: dense bit indexes and state bitmasks
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = {
+    "secrets": [sa.Column("bit_index", sa.Integer(), nullable=True)],
+    "evidences": [sa.Column("bit_index", sa.Integer(), nullable=True)],
+    "session_suspect_states": [
+        sa.Column("revealed_secrets_mask", sa.LargeBinary(), nullable=True),
+        sa.Column("used_evidence_mask", sa.LargeBinary(), nullable=True),
+        sa.Column("effective_evidence_mask", sa.LargeBinary(), nullable=True),
+    ],
+}
+
+# (table, group column) whose rows get a dense bit_index per group, in id order
+BIT_INDEXES = [("secrets", "suspect_id"), ("evidences", "scenario_id")]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    for table, columns in COLUMNS.items():
+        # init_db (create_all) already adds the columns on new databases
+        existing = {c["name"] for c in sa.inspect(bind).get_columns(table)}
+        missing = [c for c in columns if c.name not in existing]
+        if missing:
+            with op.batch_alter_table(table) as batch_op:
+                for column in missing:
+                    batch_op.add_column(column)
+
+    for table, group in BIT_INDEXES:
+        rows = bind.execute(sa.text(
+            f"SELECT id, {group}, bit_index FROM {table} ORDER BY {group}, id"
+        )).all()
+
+        next_bit = {}
+        for _, group_id, bit in rows:
+            if bit is not None:
+                next_bit[group_id] = max(next_bit.get(group_id, 0), bit + 1)
+
+        for row_id, group_id, bit in rows:
+            if bit is None:
+                bit = next_bit.get(group_id, 0)
+                next_bit[group_id] = bit + 1
+                bind.execute(sa.text(f"UPDATE {table} SET bit_index = :bit WHERE id = :id"), {"bit": bit, "id": row_id})
+
+
+def downgrade() -> None:
+    for table, columns in COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in reversed(columns):
+                batch_op.drop_column(column.name)
@@ -0,0 +1,47 @@
+"""Interrogation turn journal
+
+The interrogation_turns table (InterrogationTurnModel) came with the turn
+journal, before this project had Alembic revisions, so it was only ever
+built by init_db's create_all. This revision adds it to the chain; like the
+other revisions it skips what create_all already built.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "interrogation_turns",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("session_id", sa.Integer(), sa.ForeignKey("sessions.id"), nullable=False),
+        sa.Column("suspect_id", sa.Integer(), sa.ForeignKey("suspects.id"), nullable=False),
+        sa.Column("turn_id", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("player_message_id", sa.Integer(), sa.ForeignKey("npc_chat_messages.id"), nullable=False),
+        sa.Column("npc_message_id", sa.Integer(), sa.ForeignKey("npc_chat_messages.id"), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("session_id", "suspect_id", "turn_id", name="uq_interrogation_turns_turn_id"),
+        if_not_exists=True
+    )
+    op.create_index(
+        "ix_interrogation_turns_id", "interrogation_turns", ["id"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_interrogation_turns_id", table_name="interrogation_turns", if_exists=True)
+    op.drop_table("interrogation_turns", if_exists=True)
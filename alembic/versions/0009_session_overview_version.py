@@ -0,0 +1,31 @@
+"""Optimistic version column on session overviews
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # init_db (create_all) already adds the column on new databases
+    existing = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("session_overviews")}
+    if "version" in existing:
+        return
+
+    with op.batch_alter_table("session_overviews") as batch_op:
+        batch_op.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("session_overviews") as batch_op:
+        batch_op.drop_column("version")
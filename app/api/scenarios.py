@@ -1,12 +1,17 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+import secrets
+from fastapi import APIRouter, Header, HTTPException
+from typing import List, Optional
 
+from app.core.config import settings
 from app.infra.db import SessionLocal
 from app.infra.db_models import ScenarioModel, SuspectModel, EvidenceModel
 from app.api.schemas.scenario import (
     ScenarioListItem,
-    ScenarioDetailResponse
+    ScenarioDetailResponse,
+    ScenarioReloadItem
 )
+from app.services.bootstrap_service import SCENARIOS_DIR
+from app.services.scenario_loader import load_scenarios_from_dir
 
 router = APIRouter(prefix="/scenarios", tags=["scenarios"])
 
@@ -32,6 +37,30 @@ def list_scenarios():
         db.close()
 
 
+# -----------------------------
+# POST /scenarios/reload (admin)
+# -----------------------------
+@router.post("/reload", response_model=List[ScenarioReloadItem])
+def reload_scenarios(x_admin_token: Optional[str] = Header(None)):
+    """
+    Re-syncs the scenario JSON files without a restart. Only files whose
+    content hash changed are written; in-flight sessions keep their state,
+    get states for added suspects and have their progress recomputed.
+
+    Disabled unless SCENARIO_RELOAD_TOKEN is set; the caller must send it
+    in the X-Admin-Token header.
+    """
+    if not settings.SCENARIO_RELOAD_TOKEN:
+        raise HTTPException(status_code=404, detail="Scenario reload is disabled")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.SCENARIO_RELOAD_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+    if not SCENARIOS_DIR.exists():
+        return []
+
+    return load_scenarios_from_dir(str(SCENARIOS_DIR))
+
+
 # -----------------------------
 # GET /scenarios/{id} (opcional)
 # -----------------------------
@@ -70,6 +70,8 @@ class TopicSignal(str, Enum):
 class PlayerChatInput(BaseModel):
     text: str
     evidence_id: Optional[int] = None
+    # Idempotency key: retrying with the same turn_id resumes or replays the turn
+    turn_id: Optional[str] = None
 
 
 class ChatMessageInfo(BaseModel):
@@ -87,10 +89,12 @@ class TurnDebugTrace(BaseModel):
     state_transition: Optional[StateTransitionResult] = None
     allowed_knowledge: list[str] = Field(default_factory=list)
     new_knowledge_this_turn: list[str] = Field(default_factory=list)
+    timings: Optional[dict] = None  # turn trace so far, when TURN_TRACING is on
 
-class PlayerTurnResponse(BaseModel):
+class PlayerTurnMechanics(BaseModel):
+    """Turn response minus the NPC message (first event of a streamed turn)."""
+    turn_id: Optional[str] = None
     player_message: ChatMessageInfo
-    npc_message: ChatMessageInfo
     revealed_secrets: list[dict]
     evidence_effect: str  # "none" | "revealed_secret" | "duplicate" | "out_of_context"
     suspect_state: dict
@@ -104,3 +108,6 @@ class PlayerTurnResponse(BaseModel):
     feedback_hints: List[str] = Field(default_factory=list)
     
     debug_trace: Optional[TurnDebugTrace] = None
+
+class PlayerTurnResponse(PlayerTurnMechanics):
+    npc_message: ChatMessageInfo
@@ -14,3 +14,11 @@ class ScenarioDetailResponse(BaseModel):
     description: Optional[str]
     suspects: List[dict]
     evidences: List[dict]
+
+
+class ScenarioReloadItem(BaseModel):
+    path: str
+    scenario_id: Optional[int] = None
+    title: Optional[str] = None
+    status: Optional[str] = None  # created, updated, unchanged
+    error: Optional[str] = None
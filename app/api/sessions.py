@@ -1,18 +1,32 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List
+import asyncio
+import json
 
-from app.api.schemas.chat import PlayerChatInput, PlayerTurnResponse
+from fastapi import APIRouter, Header, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from app.api.schemas.chat import PlayerChatInput, PlayerTurnResponse, PlayerTurnMechanics, ChatMessageInfo
 from app.api.schemas.verdict import AccuseRequest, AccuseResponse
 from app.api.schemas.evidence import EvidenceResponse
 from app.api.schemas.suspect import SuspectSessionResponse
 
-from app.services.interrogation_turn_service import run_interrogation_turn
+from app.services.interrogation_turn_service import arun_interrogation_turn, astream_interrogation_turn
 from app.services.session_finalize_service import finalize_session
-from app.services.session_service import create_session, get_session_overview, get_suspect_state
+from app.services.session_service import (
+    create_session,
+    create_sessions,
+    get_session_changes,
+    get_session_overview,
+    get_suspect_state
+)
+from app.services.chat_service import get_last_message_id, list_chat_messages
+from app.services.event_bus import get_event_bus, session_channel
+from app.core.exceptions import NotFoundError
 
 from app.infra.db import SessionLocal
-from app.infra.db_models import NpcChatMessageModel, SessionModel, SessionSuspectStateModel, SuspectModel, ScenarioModel, EvidenceModel
+from app.infra.db_models import SessionModel, SessionSuspectStateModel, SuspectModel, ScenarioModel, EvidenceModel
 
 
 router = APIRouter()
@@ -25,6 +39,11 @@ class CreateSessionRequest(BaseModel):
     scenario_id: int
 
 
+class CreateSessionBatchRequest(BaseModel):
+    scenario_id: int
+    count: int = Field(..., ge=1, le=500)
+
+
 # -----------------------------
 # Response schema
 # -----------------------------
@@ -34,6 +53,11 @@ class CreateSessionResponse(BaseModel):
     status: str
 
 
+class CreateSessionBatchResponse(BaseModel):
+    scenario_id: int
+    session_ids: List[int]
+
+
 # -----------------------------
 # POST /sessions
 # -----------------------------
@@ -47,30 +71,155 @@ def api_create_session(payload: CreateSessionRequest):
         status=session_data["status"]
     )
 
+
+# -----------------------------
+# POST /sessions/batch
+# -----------------------------
+@router.post("/sessions/batch", response_model=CreateSessionBatchResponse)
+def api_create_session_batch(payload: CreateSessionBatchRequest):
+    """Provisions many sessions of one scenario at once (classrooms, load tests)."""
+    sessions = create_sessions(payload.scenario_id, payload.count)
+
+    return CreateSessionBatchResponse(
+        scenario_id=payload.scenario_id,
+        session_ids=[s["id"] for s in sessions]
+    )
+
+
 @router.post(
     "/sessions/{session_id}/suspects/{suspect_id}/messages",
     response_model=PlayerTurnResponse
 )
-def send_message_to_suspect(session_id: int, suspect_id: int, payload: PlayerChatInput):
+async def send_message_to_suspect(session_id: int, suspect_id: int, payload: PlayerChatInput):
     """
-    Handles a full interrogation turn atomically.
+    Handles a full interrogation turn.
+
+    The turn mechanics are committed atomically before the NPC reply is
+    generated, and the reply is committed in a short second transaction.
+    Retrying with the same `turn_id` resumes or replays the turn.
+
+    Async route: database phases run in worker threads and the LLM call is
+    awaited, so waiting on the model does not hold a threadpool worker.
     """
     db = SessionLocal()
     try:
-        result = run_interrogation_turn(
+        return await arun_interrogation_turn(
             session_id=session_id,
             suspect_id=suspect_id,
             text=payload.text,
             evidence_id=payload.evidence_id,
-            db=db
+            db=db,
+            turn_id=payload.turn_id
+        )
+    finally:
+        await run_in_threadpool(db.close)
+
+
+def _sse_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def _serialize_stream_event(event: str, data: dict) -> str:
+    if event == "turn":
+        return PlayerTurnMechanics.model_validate(data).model_dump_json()
+    if event == "done":
+        return json.dumps(
+            {"npc_message": ChatMessageInfo.model_validate(data["npc_message"]).model_dump()},
+            ensure_ascii=False
         )
-        db.commit()
-        return result
+    return json.dumps(data, ensure_ascii=False)
+
+
+@router.post("/sessions/{session_id}/suspects/{suspect_id}/messages/stream")
+async def stream_message_to_suspect(session_id: int, suspect_id: int, payload: PlayerChatInput):
+    """
+    Streamed interrogation turn (Server-Sent Events).
+
+    The mechanical turn result is sent as the first `turn` event as soon as it
+    is committed, followed by `token` events with the NPC reply as the model
+    produces it and a final `done` event once the NPC message is saved.
+    Errors in the mechanical phase are returned as regular HTTP errors.
+    """
+    db = SessionLocal()
+    events = astream_interrogation_turn(
+        session_id=session_id,
+        suspect_id=suspect_id,
+        text=payload.text,
+        evidence_id=payload.evidence_id,
+        db=db,
+        turn_id=payload.turn_id
+    )
+
+    # Run the mechanical phase before the response starts, so domain errors
+    # still map to 404/409 instead of breaking an open stream.
+    try:
+        first_event = await anext(events)
     except Exception:
-        db.rollback()
+        await run_in_threadpool(db.close)
         raise
-    finally:
-        db.close()
+
+    async def event_stream():
+        try:
+            yield _sse_event(first_event[0], _serialize_stream_event(*first_event))
+            async for event, data in events:
+                yield _sse_event(event, _serialize_stream_event(event, data))
+        finally:
+            await events.aclose()
+            await run_in_threadpool(db.close)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# -----------------------------
+# WS /sessions/{session_id}/live
+# -----------------------------
+WS_CLOSE_NOT_FOUND = 4404
+
+
+@router.websocket("/sessions/{session_id}/live")
+async def session_live_channel(websocket: WebSocket, session_id: int):
+    """
+    Live session channel. Sends a `snapshot` event with the session overview,
+    then pushes every committed change of the session as it happens:
+    `suspect_state` (after a turn's mechanics), `turn` (the full
+    PlayerTurnResponse once the NPC reply is saved) and `verdict`.
+    Messages sent by the client are ignored.
+    """
+    await websocket.accept()
+
+    # Subscribe before the snapshot so nothing committed in between is missed
+    with get_event_bus().subscribe(session_channel(session_id)) as subscription:
+        try:
+            overview = await run_in_threadpool(get_session_overview, session_id)
+        except NotFoundError as e:
+            await websocket.close(code=WS_CLOSE_NOT_FOUND, reason=str(e))
+            return
+
+        await websocket.send_json({"type": "snapshot", "session_id": session_id, "suspect_id": None, "data": overview})
+
+        receive = asyncio.ensure_future(websocket.receive())
+        next_event = asyncio.ensure_future(subscription.get())
+        try:
+            while True:
+                done, _ = await asyncio.wait({receive, next_event}, return_when=asyncio.FIRST_COMPLETED)
+
+                if receive in done:
+                    if receive.result()["type"] == "websocket.disconnect":
+                        return
+                    receive = asyncio.ensure_future(websocket.receive())
+
+                if next_event in done:
+                    await websocket.send_json(next_event.result())
+                    next_event = asyncio.ensure_future(subscription.get())
+        except WebSocketDisconnect:
+            return
+        finally:
+            receive.cancel()
+            next_event.cancel()
 
 
 @router.post(
@@ -181,23 +330,59 @@ class ChatMessageResponse(BaseModel):
     evidence_id: int | None
     timestamp: str
 
+
+def _messages_etag(last_message_id: int) -> str:
+    return f'"msgs-{last_message_id}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 requires for this header)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
 @router.get("/sessions/{session_id}/suspects/{suspect_id}/messages",
             response_model=List[ChatMessageResponse])
-def get_chat_messages(session_id: int, suspect_id: int):
+def get_chat_messages(
+    session_id: int,
+    suspect_id: int,
+    response: Response,
+    after_id: Optional[int] = Query(None, ge=0, description="Only messages with a greater id"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Returns the chronological chat history between the player and the suspect
-    in the given session.
+    in the given session, optionally paginated with the `after_id` cursor.
+
+    Messages are append-only, so the id of the last one identifies the history:
+    it is sent as the ETag, and a poll with a matching If-None-Match is answered
+    with 304 after a single indexed lookup.
     """
 
     db = SessionLocal()
 
     try:
-        # 1. Ensure session exists
+        # 1. Cheap freshness check
+        last_message_id = get_last_message_id(session_id, suspect_id, db)
+        etag = _messages_etag(last_message_id)
+
+        # Messages only exist for valid (session, suspect) pairs, so an empty
+        # history still goes through validation to keep the 404s.
+        if last_message_id and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # 2. Ensure session exists
         session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
         if not session:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found.")
 
-        # 2. Ensure suspect belongs to scenario of the session
+        # 3. Ensure suspect belongs to scenario of the session
         suspect = db.query(SuspectModel).filter(
             SuspectModel.id == suspect_id,
             SuspectModel.scenario_id == session.scenario_id
@@ -209,30 +394,43 @@ def get_chat_messages(session_id: int, suspect_id: int):
                 detail=f"Suspect {suspect_id} not found in scenario {session.scenario_id}."
             )
 
-        # 3. Load chronological chat history
-        messages = db.query(NpcChatMessageModel).filter(
-            NpcChatMessageModel.session_id == session_id,
-            NpcChatMessageModel.suspect_id == suspect_id
-        ).order_by(NpcChatMessageModel.timestamp.asc()).all()
-
-        # 4. Serialize for output
-        result = [
-            ChatMessageResponse(
-                id=m.id,
-                sender_type=m.sender_type,
-                text=m.text,
-                evidence_id=m.evidence_id,
-                timestamp=m.timestamp.isoformat()
-            )
-            for m in messages
-        ]
+        # 4. Load chronological chat history (page)
+        messages = list_chat_messages(session_id, suspect_id, db, after_id=after_id, limit=limit)
 
-        return result
+        response.headers["ETag"] = etag
+
+        return [ChatMessageResponse.model_validate(m) for m in messages]
 
     finally:
         db.close()
 
 
+# -----------------------------
+# GET /sessions/{session_id}/changes
+# -----------------------------
+class SessionChangesResponse(BaseModel):
+    session_id: int
+    status: str
+    last_message_id: int
+    has_more: bool
+    messages: list
+    suspects: list
+
+
+@router.get("/sessions/{session_id}/changes", response_model=SessionChangesResponse)
+def api_get_session_changes(
+    session_id: int,
+    since: int = Query(0, ge=0, description="Last message id the client has seen"),
+    limit: int = Query(100, ge=1, le=500)
+):
+    """
+    Lightweight polling feed: new messages of every suspect after `since` and
+    the current state of the suspects they changed. Poll again with the
+    returned `last_message_id`.
+    """
+    return get_session_changes(session_id, since=since, limit=limit)
+
+
 @router.get(
     "/sessions/{session_id}/evidences",
     response_model=list[EvidenceResponse]
@@ -270,41 +468,17 @@ def get_session_evidences(session_id: int):
     response_model=list[SuspectSessionResponse]
 )
 def list_session_suspects(session_id: int):
-    db = SessionLocal()
-    try:
-        # 1. Validar sessão
-        session = db.query(SessionModel).filter(
-            SessionModel.id == session_id
-        ).first()
-
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-
-        # 2. Buscar suspeitos do cenário
-        suspects = db.query(SuspectModel).filter(
-            SuspectModel.scenario_id == session.scenario_id
-        ).all()
-
-        # 3. Buscar estados da sessão
-        states = db.query(SessionSuspectStateModel).filter(
-            SessionSuspectStateModel.session_id == session_id
-        ).all()
-
-        state_map = {s.suspect_id: s for s in states}
-
-        # 4. Montar resposta
-        return [
-            SuspectSessionResponse(
-                suspect_id=s.id,
-                name=s.name,
-                backstory=s.backstory,
-                initial_statement=s.initial_statement,
-                progress=state_map[s.id].progress if s.id in state_map else 0.0,
-                is_closed=state_map[s.id].is_closed if s.id in state_map else False
-            )
-            for s in suspects
-        ]
-
-    finally:
-        db.close()
+    # Served from the session overview read model (one primary-key lookup)
+    overview = get_session_overview(session_id)
 
+    return [
+        SuspectSessionResponse(
+            suspect_id=s["suspect_id"],
+            name=s["name"],
+            backstory=s["backstory"],
+            initial_statement=s["initial_statement"],
+            progress=s["progress"],
+            is_closed=s["is_closed"]
+        )
+        for s in overview["suspects"]
+    ]
@@ -0,0 +1,327 @@
+"""
+In-process metrics, exposed in the Prometheus text format on GET /metrics.
+
+Metrics live in a process-local registry. Updating one costs a lock and a
+dict update, so services record them inline on the hot path. With several
+worker processes each one reports its own values; Prometheus aggregates them
+across scrape targets.
+
+Sources:
+- turns: every finished `TurnTrace` (see app/core/tracing.py) feeds the turn
+  count, latency, per-stage latency, query count and LLM token histograms;
+- HTTP requests: `MetricsMiddleware` times each request and counts the SQL
+  statements it executed;
+- LLM calls, fallbacks and cache lookups: recorded by the adapters and caches;
+- session gauges: refreshed from the database on each scrape.
+
+METRICS_ENABLED is off by default: with it on, every turn is traced (see
+app/core/tracing.py) to feed the turn histograms, a small per-turn cost. With
+it off, turns are not traced for metrics, the middleware and the endpoint are
+not installed; inline counters still update (cheaply) but are never exposed.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.tracing import TurnTrace, add_finish_hook
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}"
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}.")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key: Tuple[str, ...], value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def replace(self, samples: Iterable[Tuple[float, Dict[str, object]]]) -> None:
+        """Swaps in a whole new set of (value, labels) samples at once, so a
+        concurrent scrape never renders a partially refreshed gauge."""
+        values = {self._key(labels): value for value, labels in samples}
+        with self._lock:
+            self._values = values
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._values.get(self._key(labels))
+            return series[2] if series else 0
+
+    def sum(self, **labels) -> float:
+        with self._lock:
+            series = self._values.get(self._key(labels))
+            return series[1] if series else 0.0
+
+    def _render_sample(self, key: Tuple[str, ...], value) -> List[str]:
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Turns
+TURNS = REGISTRY.counter(
+    "detective_turns_total", "Interrogation turns, by outcome.", ("outcome",)
+)
+TURN_DURATION = REGISTRY.histogram(
+    "detective_turn_duration_seconds", "Interrogation turn latency."
+)
+TURN_STAGE_DURATION = REGISTRY.histogram(
+    "detective_turn_stage_duration_seconds", "Interrogation turn latency by stage.", ("stage",)
+)
+TURN_QUERIES = REGISTRY.histogram(
+    "detective_turn_db_queries", "SQL statements executed per interrogation turn.", buckets=QUERY_BUCKETS
+)
+LLM_TOKENS = REGISTRY.histogram(
+    "detective_turn_llm_tokens", "LLM tokens used per interrogation turn.", ("direction",),
+    buckets=TOKEN_BUCKETS
+)
+
+# HTTP requests
+HTTP_REQUESTS = REGISTRY.counter(
+    "detective_http_requests_total", "HTTP requests, by route and status.", ("method", "route", "status")
+)
+HTTP_DURATION = REGISTRY.histogram(
+    "detective_http_request_duration_seconds", "HTTP request latency.", ("method", "route")
+)
+HTTP_QUERIES = REGISTRY.histogram(
+    "detective_http_request_db_queries", "SQL statements executed per HTTP request.", ("method", "route"),
+    buckets=QUERY_BUCKETS
+)
+
+# LLM
+LLM_DURATION = REGISTRY.histogram(
+    "detective_llm_request_duration_seconds",
+    "LLM provider latency (time to first chunk for streams).", ("mode",)
+)
+LLM_ERRORS = REGISTRY.counter(
+    "detective_llm_errors_total", "Failed LLM calls, retried ones included, by kind.", ("kind",)
+)
+LLM_FALLBACKS = REGISTRY.counter(
+    "detective_llm_fallbacks_total", "Replies answered by the fallback (Dummy) adapter, by reason.", ("reason",)
+)
+
+# Sessions
+SESSIONS = REGISTRY.gauge(
+    "detective_sessions", "Sessions in the database, by status.", ("status",)
+)
+SESSIONS_FINISHED = REGISTRY.counter(
+    "detective_sessions_finished_total", "Finalized sessions, by verdict result_type.", ("result_type",)
+)
+
+# Caches
+CACHE_REQUESTS = REGISTRY.counter(
+    "detective_cache_requests_total", "Cache lookups, by cache and result (hit or miss).", ("cache", "result")
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
+
+
+# ---------------------------------------
+# Turn traces
+# ---------------------------------------
+def _observe_turn(trace: TurnTrace) -> None:
+    TURNS.inc(outcome="error" if trace.error else "ok")
+    TURN_DURATION.observe(trace.duration_ms / 1000)
+    TURN_QUERIES.observe(trace.queries)
+    for span in trace.spans:
+        TURN_STAGE_DURATION.observe(span["duration_ms"] / 1000, stage=span["name"])
+    if trace.llm_calls:
+        LLM_TOKENS.observe(trace.llm_input_tokens, direction="input")
+        LLM_TOKENS.observe(trace.llm_output_tokens, direction="output")
+
+
+add_finish_hook(_observe_turn)
+
+
+# ---------------------------------------
+# HTTP requests
+# ---------------------------------------
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar("request_db_queries", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_request_query(conn, cursor, statement, parameters, context, executemany):
+    queries = _request_queries.get()
+    if queries is not None:
+        queries[0] += 1
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency and SQL statement count of each HTTP
+    request, labelled by route template (not raw path, to bound cardinality).
+    The counter is a mutable cell in a ContextVar, so statements run in
+    worker threads (sync routes, `asyncio.to_thread`) are counted too.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = [0]
+        status = [500]
+        token = _request_queries.set(queries)
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_queries.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method=method, route=route, status=status[0])
+            HTTP_DURATION.observe(time.perf_counter() - started, method=method, route=route)
+            HTTP_QUERIES.observe(queries[0], method=method, route=route)
@@ -0,0 +1,158 @@
+"""
+Lightweight tracing of the interrogation turn path.
+
+A turn opens a `TurnTrace` with `start_turn_trace`; each stage of the turn
+runs inside `span("stage")`. Spans record monotonic wall time and the number
+of SQL statements executed meanwhile (counted by a SQLAlchemy engine hook),
+and adapters report LLM token usage with `record_llm_usage`. When the turn
+ends, the trace is logged as one structured JSON line on the
+"app.turn_trace" logger (TURN_TRACING) and can be attached to
+`TurnDebugTrace`; finish hooks feed the /metrics histograms (METRICS_ENABLED).
+
+The active trace lives in a ContextVar, so it follows the turn into
+`asyncio.to_thread` phases and concurrent turns never mix. With both
+TURN_TRACING and METRICS_ENABLED off, `span()` returns a shared no-op context
+manager and the query hook is a single ContextVar lookup.
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.turn_trace")
+
+_current_trace: ContextVar[Optional["TurnTrace"]] = ContextVar("current_turn_trace", default=None)
+_NOOP_SPAN = nullcontext()
+
+# Called with every finished trace (e.g. to feed metrics)
+_finish_hooks: List[Callable[["TurnTrace"], None]] = []
+
+
+class _Span:
+    __slots__ = ("trace", "name", "_started", "_queries")
+
+    def __init__(self, trace: "TurnTrace", name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self._queries = self.trace.queries
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.trace.spans.append({
+            "name": self.name,
+            "duration_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "queries": self.trace.queries - self._queries,
+            **({"error": exc_type.__name__} if exc_type else {})
+        })
+
+
+class TurnTrace:
+    def __init__(self, name: str, **attributes: Any):
+        self.name = name
+        self.attributes = attributes
+        self.spans: List[Dict[str, Any]] = []
+        self.queries = 0
+        self.llm_input_tokens = 0
+        self.llm_output_tokens = 0
+        self.llm_calls = 0
+        self._started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def record_llm_usage(self, input_tokens: Optional[int], output_tokens: Optional[int]) -> None:
+        self.llm_calls += 1
+        self.llm_input_tokens += input_tokens or 0
+        self.llm_output_tokens += output_tokens or 0
+
+    def finish(self) -> None:
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = self.duration_ms
+        if elapsed is None:
+            elapsed = round((time.perf_counter() - self._started) * 1000, 3)
+        return {
+            "name": self.name,
+            **self.attributes,
+            "duration_ms": elapsed,
+            "queries": self.queries,
+            "llm_calls": self.llm_calls,
+            "llm_input_tokens": self.llm_input_tokens,
+            "llm_output_tokens": self.llm_output_tokens,
+            "spans": list(self.spans),
+            **({"error": self.error} if self.error else {})
+        }
+
+
+@contextmanager
+def start_turn_trace(name: str, **attributes: Any) -> Iterator[Optional[TurnTrace]]:
+    """
+    Opens the trace of a turn (None when neither TURN_TRACING nor
+    METRICS_ENABLED is on). A trace that is already active (e.g. a sync turn
+    called from a traced one) is reused.
+    """
+    if not (settings.TURN_TRACING or settings.METRICS_ENABLED) or _current_trace.get() is not None:
+        yield _current_trace.get()
+        return
+
+    trace = TurnTrace(name, **attributes)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    except Exception as exc:
+        trace.error = type(exc).__name__
+        raise
+    finally:
+        try:
+            _current_trace.reset(token)
+        except ValueError:
+            # Async generators (streamed turns) may finish in another context
+            _current_trace.set(None)
+        trace.finish()
+        if settings.TURN_TRACING:
+            logger.info(json.dumps({"event": "turn_trace", **trace.to_dict()}, ensure_ascii=False))
+        for hook in _finish_hooks:
+            hook(trace)
+
+
+def current_trace() -> Optional[TurnTrace]:
+    return _current_trace.get()
+
+
+def span(name: str):
+    """Times a stage of the current turn; a shared no-op outside traced turns."""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return trace.span(name)
+
+
+def record_llm_usage(input_tokens: Optional[int], output_tokens: Optional[int]) -> None:
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.record_llm_usage(input_tokens, output_tokens)
+
+
+def add_finish_hook(hook: Callable[[TurnTrace], None]) -> None:
+    _finish_hooks.append(hook)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.queries += 1
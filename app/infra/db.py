@@ -1,12 +1,106 @@
-from sqlalchemy import create_engine
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from app.core.config import settings
 from .db_models import Base
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./game.db"
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+ALEMBIC_INI_PATH = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def _is_sqlite_memory(url) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def apply_sqlite_pragmas(dbapi_connection, url=None) -> None:
+    """
+    SQLite production profile, applied on every new connection:
+    WAL lets readers proceed while a turn holds the write lock, busy_timeout
+    makes writers wait instead of failing with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        if url is None or not _is_sqlite_memory(url):
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_BYTES)}")
+        # Negative cache_size is in KiB instead of pages
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KIB)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def build_engine_kwargs(database_url: str) -> dict:
+    """Pool / driver options for the configured backend (SQLite or PostgreSQL)."""
+    url = make_url(database_url)
+
+    if url.get_backend_name() == "sqlite":
+        kwargs = {"connect_args": {"check_same_thread": False}}
+        if not _is_sqlite_memory(url):
+            kwargs.update(
+                poolclass=QueuePool,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            )
+        return kwargs
+
+    return {
+        "poolclass": QueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": True,
+    }
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+def build_engine(database_url: str = SQLALCHEMY_DATABASE_URL):
+    engine = create_engine(database_url, **build_engine_kwargs(database_url))
+
+    if engine.dialect.name == "sqlite":
+        url = engine.url
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection, url)
+
+    return engine
+
+
+engine = build_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def run_migrations(bind=None) -> None:
+    """
+    Upgrades the database to the latest Alembic revision. Every revision
+    checks for what create_all already built, so this is safe on new
+    databases and brings databases created by older versions up to date.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI_PATH))
+    config.set_main_option("script_location", str(ALEMBIC_INI_PATH.parent / "alembic"))
+    config.attributes["configure_logger"] = False
+
+    with (bind or engine).begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+
 def init_db():
+    """
+    Creates missing tables, then applies pending migrations: create_all never
+    alters existing tables, so columns and indexes added since a database was
+    created only arrive through the migrations.
+    """
     Base.metadata.create_all(bind=engine)
+    run_migrations()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Float, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Float, JSON, LargeBinary, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime
 from sqlalchemy.ext.mutable import MutableList
@@ -14,6 +14,10 @@ class ScenarioModel(Base):
     case_summary = Column(String)
     culprit_id = Column(Integer)  # Not FK, as it's a reference to Suspect
 
+    # Hot-reload bookkeeping (see scenario_loader.sync_scenario_from_json)
+    content_hash = Column(String(64), nullable=True)
+    schema_version = Column(Integer, nullable=True)
+
     required_evidence_ids = Column(
         MutableList.as_mutable(JSON), default=list
     )
@@ -32,6 +36,9 @@ class ScenarioModel(Base):
 
 class SuspectModel(Base):
     __tablename__ = "suspects"
+    __table_args__ = (
+        Index("ix_suspects_scenario_id", "scenario_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     scenario_id = Column(Integer, ForeignKey("scenarios.id"), nullable=False)
     name = Column(String, nullable=False)
@@ -51,11 +58,16 @@ class SuspectModel(Base):
 
 class EvidenceModel(Base):
     __tablename__ = "evidences"
+    __table_args__ = (
+        Index("ix_evidences_scenario_id", "scenario_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     scenario_id = Column(Integer, ForeignKey("scenarios.id"), nullable=False)
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     related_topic_id = Column(String, nullable=True)
+    # Dense position within the scenario, stable across reloads (compact session state)
+    bit_index = Column(Integer, nullable=True)
 
     scenario = relationship("ScenarioModel", back_populates="evidences")
     secrets = relationship("SecretModel", back_populates="evidence")
@@ -63,11 +75,16 @@ class EvidenceModel(Base):
 
 class SecretModel(Base):
     __tablename__ = "secrets"
+    __table_args__ = (
+        Index("ix_secrets_suspect_evidence", "suspect_id", "evidence_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     suspect_id = Column(Integer, ForeignKey("suspects.id"), nullable=False)
     evidence_id = Column(Integer, ForeignKey("evidences.id"), nullable=False)
     content = Column(String, nullable=False)
     is_core = Column(Boolean, default=False)
+    # Dense position within the suspect, stable across reloads (compact session state)
+    bit_index = Column(Integer, nullable=True)
 
     suspect = relationship("SuspectModel", back_populates="secrets")
     evidence = relationship("EvidenceModel", back_populates="secrets")
@@ -87,7 +104,7 @@ class SessionModel(Base):
 
     scenario = relationship("ScenarioModel", back_populates="sessions")
     session_states = relationship("SessionSuspectStateModel", back_populates="session")
-    chat_messages = relationship("NpcChatMessageModel", back_populates="session")
+    chat_messages = relationship("NpcChatMessageModel", back_populates="session", order_by="NpcChatMessageModel.id")
     evidence_usages = relationship("SessionEvidenceUsageModel", back_populates="session")
 
 class SessionSuspectStateModel(Base):
@@ -106,6 +123,18 @@ class SessionSuspectStateModel(Base):
     repetition_score = Column(Float, default=0.0)
     last_topic_id = Column(String, nullable=True)
 
+    # Rolling summary of the messages older than the prompt window
+    # (see conversation_summary_service)
+    conversation_summary = Column(String, nullable=True)
+    summary_through_message_id = Column(Integer, nullable=True)
+
+    # Compact encoding (see compact_state): bitmasks over SecretModel.bit_index
+    # and EvidenceModel.bit_index. NULL for states using revealed_secret_ids
+    # and session_evidence_usages rows.
+    revealed_secrets_mask = Column(LargeBinary, nullable=True)
+    used_evidence_mask = Column(LargeBinary, nullable=True)
+    effective_evidence_mask = Column(LargeBinary, nullable=True)
+
     session = relationship("SessionModel", back_populates="session_states")
     suspect = relationship("SuspectModel", back_populates="session_states")
 
@@ -124,6 +153,21 @@ class SessionSuspectTopicStateModel(Base):
 
 class NpcChatMessageModel(Base):
     __tablename__ = "npc_chat_messages"
+    __table_args__ = (
+        # Chronological history of one interrogation
+        Index("ix_npc_chat_messages_session_suspect_timestamp", "session_id", "suspect_id", "timestamp"),
+        # Recent player messages (novelty check); rowid order comes for free
+        Index("ix_npc_chat_messages_session_suspect_sender", "session_id", "suspect_id", "sender_type"),
+        # Cursor pagination / polling by message id, per interrogation and per session
+        Index("ix_npc_chat_messages_session_suspect_id", "session_id", "suspect_id", "id"),
+        Index("ix_npc_chat_messages_session_id", "session_id", "id"),
+        # Evidence-bearing messages (pressure points); partial, most messages carry no evidence
+        Index(
+            "ix_npc_chat_messages_session_suspect_evidence", "session_id", "suspect_id",
+            sqlite_where=text("evidence_id IS NOT NULL"),
+            postgresql_where=text("evidence_id IS NOT NULL")
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey("sessions.id"), nullable=False)
     suspect_id = Column(Integer, ForeignKey("suspects.id"), nullable=False)
@@ -157,3 +201,42 @@ class SessionSuspectKnowledgeStateModel(Base):
 
     session = relationship("SessionModel")
     suspect = relationship("SuspectModel")
+
+class InterrogationTurnModel(Base):
+    """
+    Journal of interrogation turns, written when the mechanical phase commits.
+    A turn stays "resolved" until its NPC reply is saved ("completed"), so a
+    crash while the reply is being generated can be resumed by turn_id.
+    """
+    __tablename__ = "interrogation_turns"
+    __table_args__ = (
+        UniqueConstraint("session_id", "suspect_id", "turn_id", name="uq_interrogation_turns_turn_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("sessions.id"), nullable=False)
+    suspect_id = Column(Integer, ForeignKey("suspects.id"), nullable=False)
+    turn_id = Column(String, nullable=False)
+    status = Column(String, default="resolved")  # resolved, completed
+    player_message_id = Column(Integer, ForeignKey("npc_chat_messages.id"), nullable=False)
+    npc_message_id = Column(Integer, ForeignKey("npc_chat_messages.id"), nullable=True)
+    payload = Column(JSON, default=dict)
+    created_at = Column(DateTime, default=datetime.now)
+    completed_at = Column(DateTime, nullable=True)
+
+    session = relationship("SessionModel")
+    suspect = relationship("SuspectModel")
+
+class SessionOverviewModel(Base):
+    """
+    Denormalized read model of a session (see session_overview_service):
+    scenario summary plus per-suspect progress, stance, evidence used and
+    topic heat, kept in one JSON row so overview reads are a primary-key lookup.
+    """
+    __tablename__ = "session_overviews"
+
+    session_id = Column(Integer, ForeignKey("sessions.id"), primary_key=True)
+    payload = Column(JSON, nullable=False)
+    # Bumped on every write; concurrent read-modify-writes compare it
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
@@ -1,11 +1,14 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from app.api.sessions import router as sessions_router
 from app.api.scenarios import router as scenarios_router
 from app.services.bootstrap_service import bootstrap_game
 from app.core.exception_handlers import register_exception_handlers
+from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, SESSIONS, MetricsMiddleware, render_metrics
+from app.services.session_service import count_sessions_by_status
 
 app = FastAPI(title="Detective AI Game")
 
@@ -26,3 +29,16 @@ app.include_router(scenarios_router)
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+# -----------------------------
+# Metrics (Prometheus text format)
+# -----------------------------
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        SESSIONS.replace(
+            (count, {"status": status}) for status, count in count_sessions_by_status().items()
+        )
+        return Response(render_metrics(), media_type=CONTENT_TYPE)
@@ -4,14 +4,38 @@ IA Adapter Interface for NPC Dialogue Generation.
 This module defines the base interface used by the game to generate NPC
 responses during interrogations. Real implementations (OpenAI, local LLM,
 Claude, etc.) should inherit from `NpcAIAdapter` and override `generate_reply`.
+Adapters backed by a network client should also override `agenerate_reply`
+with a native async call, so the async turn path never blocks a worker thread
+while waiting on the model, and `astream_reply` when the model can stream.
 
 No actual AI calls are performed in this interface.
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import AsyncIterator, List, Dict, Any, Optional
 from app.api.schemas.render_context import NpcResponseRenderContext
 
 
+def merge_history_windows(*windows: Optional[int]) -> Optional[int]:
+    """History window covering every given window (None when any needs it all)."""
+    if any(w is None for w in windows):
+        return None
+    return max(windows, default=0)
+
+
+def resolve_history_window(adapter: Any) -> Optional[int]:
+    """`adapter.history_window`, or None (full history) if it does not declare one."""
+    window = getattr(adapter, "history_window", None)
+    return window if isinstance(window, int) else None
+
+
+class FallbackReply(str):
+    """
+    Reply text produced by a fallback adapter instead of the model.
+    Behaves as a plain str; reply caches must not store it.
+    """
+
+
 class NpcAIAdapter:
     """
     Base interface for NPC dialogue generation.
@@ -51,6 +75,10 @@ class NpcAIAdapter:
         str: the textual reply of the NPC.
     """
 
+    # How many trailing chat_history messages the adapter reads (None = all).
+    # The turn path only loads this window from the database.
+    history_window: Optional[int] = None
+
     def generate_reply(
         self,
         suspect_state: Dict[str, Any],
@@ -66,3 +94,58 @@ class NpcAIAdapter:
             Pode conter cenário, verdades, mentiras, segredos revelados e regras.
         """
 
+    def is_retryable_error(self, exc: Exception) -> bool:
+        """
+        Whether a failed call is worth retrying (transient provider errors).
+        Used by ResilientNpcAIAdapter; adapters without transient failure
+        modes keep the default.
+        """
+        return False
+
+    async def agenerate_reply(
+        self,
+        suspect_state: Dict[str, Any],
+        chat_history: List[Dict[str, Any]],
+        player_message: Dict[str, Any],
+        render_context: NpcResponseRenderContext,
+        npc_context: Dict[str, Any] | None = None,
+        revealed_now: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        """
+        Async variant of `generate_reply`.
+
+        The default runs `generate_reply` in a worker thread so any adapter
+        works on the async path; network-backed adapters override it.
+        """
+        return await asyncio.to_thread(
+            self.generate_reply,
+            suspect_state=suspect_state,
+            chat_history=chat_history,
+            player_message=player_message,
+            render_context=render_context,
+            npc_context=npc_context,
+            revealed_now=revealed_now
+        )
+
+    async def astream_reply(
+        self,
+        suspect_state: Dict[str, Any],
+        chat_history: List[Dict[str, Any]],
+        player_message: Dict[str, Any],
+        render_context: NpcResponseRenderContext,
+        npc_context: Dict[str, Any] | None = None,
+        revealed_now: Optional[List[Dict[str, Any]]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streams the reply as text chunks whose concatenation is the full reply.
+
+        The default yields the whole `agenerate_reply` result as one chunk.
+        """
+        yield await self.agenerate_reply(
+            suspect_state=suspect_state,
+            chat_history=chat_history,
+            player_message=player_message,
+            render_context=render_context,
+            npc_context=npc_context,
+            revealed_now=revealed_now
+        )
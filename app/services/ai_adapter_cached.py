@@ -0,0 +1,170 @@
+"""
+Reply-caching wrapper for NPC AI adapters.
+
+`CachedNpcAIAdapter` wraps the resilience layer (see ai_adapter_factory), so
+final phrases and cache hits never wait for a model slot or the breaker:
+- `final_phrase` turns are answered with the suspect's final phrase without
+  calling the model at all;
+- otherwise, when a cache backend is configured, replies are served from / stored
+  in the cache under `build_reply_cache_key`.
+
+Only model replies are stored, never fallback ones (`FallbackReply`). The
+async paths run cache reads and writes in a worker thread, since a backend
+may do blocking I/O (sqlite).
+"""
+
+import asyncio
+from typing import AsyncIterator, Optional
+
+from app.services.ai_adapter import FallbackReply, NpcAIAdapter, resolve_history_window
+from app.core.metrics import record_cache_lookup
+from app.services.reply_cache import ReplyCacheBackend, build_reply_cache_key
+from app.api.schemas.render_context import ResponseMode
+
+
+class CachedNpcAIAdapter(NpcAIAdapter):
+    def __init__(self, inner: NpcAIAdapter, cache: Optional[ReplyCacheBackend] = None):
+        self.inner = inner
+        self.cache = cache
+
+    @property
+    def history_window(self) -> Optional[int]:
+        # The cache key hashes exactly the window the inner adapter reads
+        return resolve_history_window(self.inner)
+
+    def _short_circuit(self, suspect_state, render_context) -> Optional[str]:
+        if render_context.response_mode == ResponseMode.final_phrase:
+            return suspect_state.get("final_phrase") or "Já falei tudo que sabia."
+        return None
+
+    def _key(self, suspect_state, chat_history, player_message, render_context, npc_context) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return build_reply_cache_key(
+            suspect_state=suspect_state,
+            chat_history=chat_history,
+            player_message=player_message,
+            render_context=render_context,
+            npc_context=npc_context,
+            history_turns=resolve_history_window(self.inner)
+        )
+
+    @staticmethod
+    def _cacheable(reply: Optional[str]) -> bool:
+        return bool(reply) and not isinstance(reply, FallbackReply)
+
+    def _lookup(self, key: str) -> Optional[str]:
+        reply = self.cache.get(key)
+        record_cache_lookup("reply", reply is not None)
+        return reply
+
+    async def _alookup(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._lookup, key)
+
+    async def _astore(self, key: str, reply: str) -> None:
+        await asyncio.to_thread(self.cache.set, key, reply)
+
+    def generate_reply(
+        self,
+        suspect_state,
+        chat_history,
+        player_message,
+        render_context,
+        npc_context=None,
+        revealed_now=None
+    ) -> str:
+        reply = self._short_circuit(suspect_state, render_context)
+        if reply is not None:
+            return reply
+
+        key = self._key(suspect_state, chat_history, player_message, render_context, npc_context)
+        if key is not None:
+            reply = self._lookup(key)
+            if reply is not None:
+                return reply
+
+        reply = self.inner.generate_reply(
+            suspect_state=suspect_state,
+            chat_history=chat_history,
+            player_message=player_message,
+            render_context=render_context,
+            npc_context=npc_context,
+            revealed_now=revealed_now
+        )
+        if key is not None and self._cacheable(reply):
+            self.cache.set(key, reply)
+        return reply
+
+    async def agenerate_reply(
+        self,
+        suspect_state,
+        chat_history,
+        player_message,
+        render_context,
+        npc_context=None,
+        revealed_now=None
+    ) -> str:
+        reply = self._short_circuit(suspect_state, render_context)
+        if reply is not None:
+            return reply
+
+        key = self._key(suspect_state, chat_history, player_message, render_context, npc_context)
+        if key is not None:
+            reply = await self._alookup(key)
+            if reply is not None:
+                return reply
+
+        reply = await self.inner.agenerate_reply(
+            suspect_state=suspect_state,
+            chat_history=chat_history,
+            player_message=player_message,
+            render_context=render_context,
+            npc_context=npc_context,
+            revealed_now=revealed_now
+        )
+        if key is not None and self._cacheable(reply):
+            await self._astore(key, reply)
+        return reply
+
+    async def astream_reply(
+        self,
+        suspect_state,
+        chat_history,
+        player_message,
+        render_context,
+        npc_context=None,
+        revealed_now=None
+    ) -> AsyncIterator[str]:
+        reply = self._short_circuit(suspect_state, render_context)
+        if reply is not None:
+            yield reply
+            return
+
+        key = self._key(suspect_state, chat_history, player_message, render_context, npc_context)
+        if key is not None:
+            reply = await self._alookup(key)
+            if reply is not None:
+                yield reply
+                return
+
+        chunks = []
+        from_fallback = False
+        async for chunk in self.inner.astream_reply(
+            suspect_state=suspect_state,
+            chat_history=chat_history,
+            player_message=player_message,
+            render_context=render_context,
+            npc_context=npc_context,
+            revealed_now=revealed_now
+        ):
+            chunks.append(chunk)
+            from_fallback = from_fallback or isinstance(chunk, FallbackReply)
+            yield chunk
+
+        # Only complete model streams are cached
+        reply = "".join(chunks).strip()
+        if key is not None and reply and not from_fallback:
+            await self._astore(key, reply)
+
+    def is_retryable_error(self, exc: Exception) -> bool:
+        return self.inner.is_retryable_error(exc)
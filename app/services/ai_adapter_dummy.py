@@ -20,6 +20,8 @@ from app.api.schemas.render_context import NpcResponseRenderContext, ResponseMod
 class DummyNpcAIAdapter(NpcAIAdapter):
     """Deterministic, rule-based NPC reply generator."""
 
+    history_window = 0  # replies never look at the chat history
+
     def generate_reply(
         self,
         suspect_state: Dict[str, Any],
@@ -125,3 +127,22 @@ class DummyNpcAIAdapter(NpcAIAdapter):
             f"{name} responde calmamente: "
             "“Olha, estou cooperando. Mas você precisa ser mais específico.”"
         )
+
+    async def agenerate_reply(
+        self,
+        suspect_state: Dict[str, Any],
+        chat_history: List[Dict[str, Any]],
+        player_message: Dict[str, Any],
+        render_context: NpcResponseRenderContext,
+        npc_context: Dict[str, Any] | None = None,
+        revealed_now: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        # Pure CPU and instantaneous: no need for a worker thread.
+        return self.generate_reply(
+            suspect_state=suspect_state,
+            chat_history=chat_history,
+            player_message=player_message,
+            render_context=render_context,
+            npc_context=npc_context,
+            revealed_now=revealed_now
+        )
@@ -1,16 +1,30 @@
 import os
+from functools import lru_cache
 
 from app.services.ai_adapter_dummy import DummyNpcAIAdapter
 from app.services.ai_adapter_openai import OpenAINpcAIAdapter
+from app.services.ai_adapter_resilient import ResilientNpcAIAdapter
+from app.services.ai_adapter_cached import CachedNpcAIAdapter
+from app.services.reply_cache import get_reply_cache
 
 
+@lru_cache(maxsize=None)
 def get_npc_ai_adapter():
+    """
+    Returns the process-wide NPC adapter. It is built once and shared, so the
+    OpenAI client (and its connection pool), the concurrency cap, the
+    circuit breaker and the reply cache are shared by every turn.
+    """
     provider = os.getenv("NPC_AI_PROVIDER", "dummy").lower()
     print(f"[AI] NPC_AI_PROVIDER = {provider}")
 
     if provider == "openai":
         print("[AI] Using OpenAI adapter")
-        return OpenAINpcAIAdapter()
+        # The cache sits outside the resilience layer: final phrases and
+        # cache hits never wait for a model slot or the breaker.
+        return CachedNpcAIAdapter(
+            ResilientNpcAIAdapter(OpenAINpcAIAdapter()), cache=get_reply_cache()
+        )
 
     print("[AI] Using Dummy adapter")
     return DummyNpcAIAdapter()
@@ -1,11 +1,29 @@
 import os
-from typing import Dict, Any, List
+import time
+from typing import AsyncIterator, Dict, Any, List
 
-from openai import OpenAI
+from openai import (
+    OpenAI,
+    AsyncOpenAI,
+    Timeout,
+    APIConnectionError,
+    InternalServerError,
+    RateLimitError
+)
 from app.services.ai_adapter import NpcAIAdapter
-from app.services.prompt_builder import build_npc_prompt
+from app.services.prompt_builder import build_npc_prompt, PROMPT_HISTORY_WINDOW
 from app.api.schemas.render_context import NpcResponseRenderContext
 from app.core.exceptions import DomainError
+from app.core.config import settings
+from app.core.metrics import LLM_DURATION
+from app.core.tracing import record_llm_usage
+
+
+def _record_usage(response) -> None:
+    """Reports the token usage of a response to the current turn trace."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        record_llm_usage(getattr(usage, "input_tokens", None), getattr(usage, "output_tokens", None))
 
 
 class OpenAINpcAIAdapter(NpcAIAdapter):
@@ -15,14 +33,26 @@ class OpenAINpcAIAdapter(NpcAIAdapter):
     IMPORTANT:
     - This adapter receives ONLY already-allowed information
     - It must never infer or invent secrets
+
+    The sync and async SDK clients are created once per adapter, and the
+    factory shares one adapter per process, so HTTP connections are pooled
+    and reused across turns. SDK retries are disabled: retries, deadlines and
+    the circuit breaker are handled by ResilientNpcAIAdapter.
     """
 
+    history_window = PROMPT_HISTORY_WINDOW
+
     def __init__(self):
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY not set")
 
-        self.client = OpenAI(api_key=api_key)
+        timeout = Timeout(
+            settings.LLM_REQUEST_TIMEOUT_SECONDS,
+            connect=settings.LLM_CONNECT_TIMEOUT_SECONDS
+        )
+        self.client = OpenAI(api_key=api_key, timeout=timeout, max_retries=0)
+        self.async_client = AsyncOpenAI(api_key=api_key, timeout=timeout, max_retries=0)
         self.model = os.getenv("OPENAI_MODEL", "gpt-5-mini")
 
     def generate_reply(
@@ -34,18 +64,84 @@ class OpenAINpcAIAdapter(NpcAIAdapter):
         npc_context: dict | None = None,
         revealed_now: list | None = None
     ) -> str:
-        if not npc_context:
-            raise DomainError("npc_context is required for OpenAI adapter")
+        prompt = self._build_prompt(npc_context, chat_history, render_context)
 
-        prompt = build_npc_prompt(
-            npc_context=npc_context,
-            chat_history=chat_history,
-            render_context=render_context
+        started = time.perf_counter()
+        response = self.client.responses.create(
+            model=self.model,
+            input=prompt
         )
+        LLM_DURATION.observe(time.perf_counter() - started, mode="sync")
+        _record_usage(response)
 
-        response = self.client.responses.create(
+        return response.output_text.strip()
+
+    async def agenerate_reply(
+        self,
+        suspect_state: dict,
+        chat_history: list,
+        player_message: dict,
+        render_context: NpcResponseRenderContext,
+        npc_context: dict | None = None,
+        revealed_now: list | None = None
+    ) -> str:
+        prompt = self._build_prompt(npc_context, chat_history, render_context)
+
+        started = time.perf_counter()
+        response = await self.async_client.responses.create(
             model=self.model,
             input=prompt
         )
+        LLM_DURATION.observe(time.perf_counter() - started, mode="async")
+        _record_usage(response)
 
         return response.output_text.strip()
+
+    async def astream_reply(
+        self,
+        suspect_state: dict,
+        chat_history: list,
+        player_message: dict,
+        render_context: NpcResponseRenderContext,
+        npc_context: dict | None = None,
+        revealed_now: list | None = None
+    ) -> AsyncIterator[str]:
+        prompt = self._build_prompt(npc_context, chat_history, render_context)
+
+        started = time.perf_counter()
+        stream = await self.async_client.responses.create(
+            model=self.model,
+            input=prompt,
+            stream=True
+        )
+
+        # Closing the stream releases its pooled HTTP connection, also when the
+        # consumer stops early (client disconnect) or an error is raised.
+        async with stream:
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    if started is not None:
+                        LLM_DURATION.observe(time.perf_counter() - started, mode="stream")
+                        started = None
+                    yield event.delta
+                elif event.type == "response.completed":
+                    _record_usage(event.response)
+
+    def is_retryable_error(self, exc: Exception) -> bool:
+        # Timeouts, connection errors, 429 and 5xx; 4xx request errors are not retried
+        return isinstance(exc, (APIConnectionError, RateLimitError, InternalServerError))
+
+    def _build_prompt(
+        self,
+        npc_context: dict | None,
+        chat_history: list,
+        render_context: NpcResponseRenderContext
+    ) -> list:
+        if not npc_context:
+            raise DomainError("npc_context is required for OpenAI adapter")
+
+        return build_npc_prompt(
+            npc_context=npc_context,
+            chat_history=chat_history,
+            render_context=render_context
+        )
@@ -0,0 +1,357 @@
+"""
+Resilience layer for network-backed NPC AI adapters.
+
+`ResilientNpcAIAdapter` wraps a primary adapter (e.g. OpenAI) with:
+- a cap on in-flight model calls per process,
+- bounded retries with jittered exponential backoff, inside an overall deadline,
+- a circuit breaker: after repeated provider failures, calls go straight to the
+  fallback (Dummy) adapter for a cool-down period instead of each one waiting
+  for its own timeout.
+
+Fallback text is returned as `FallbackReply`, so outer layers (the reply
+cache) can tell it apart from model replies.
+
+Per-attempt timeouts and connection pooling belong to the primary adapter's
+HTTP client; see OpenAINpcAIAdapter.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import LLM_ERRORS, LLM_FALLBACKS
+from app.services.ai_adapter import FallbackReply, NpcAIAdapter, merge_history_windows, resolve_history_window
+from app.services.ai_adapter_dummy import DummyNpcAIAdapter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed    -> calls go through; `failure_threshold` failures in a row open it.
+    open      -> calls are rejected until `reset_seconds` have passed.
+    half_open -> a single trial call is let through; success closes the
+                 breaker, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_seconds:
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            # Half-open: only one trial call at a time
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Frees the half-open trial slot when the trial ended without a verdict (e.g. cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning("LLM circuit breaker opened after %s consecutive failures.", self._failures)
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+
+class _NoSlotAvailable(Exception):
+    """Raised when no concurrency slot frees up before the call deadline."""
+
+
+class ResilientNpcAIAdapter(NpcAIAdapter):
+    """
+    Wraps `primary` with a concurrency cap, retries and a circuit breaker,
+    answering with `fallback` whenever the primary cannot produce a reply.
+    """
+
+    def __init__(
+        self,
+        primary: NpcAIAdapter,
+        fallback: Optional[NpcAIAdapter] = None,
+        max_concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        max_retries: int = settings.LLM_MAX_RETRIES,
+        backoff_seconds: float = settings.LLM_RETRY_BACKOFF_SECONDS,
+        deadline_seconds: float = settings.LLM_DEADLINE_SECONDS,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.primary = primary
+        self.fallback = fallback or DummyNpcAIAdapter()
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.deadline_seconds = deadline_seconds
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            reset_seconds=settings.LLM_BREAKER_RESET_SECONDS
+        )
+
+        self._sync_slots = threading.BoundedSemaphore(max_concurrency)
+        # asyncio primitives are bound to one event loop
+        self._async_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": uniform in [0, base * 2^attempt]
+        return random.uniform(0, self.backoff_seconds * (2 ** attempt))
+
+    @staticmethod
+    def _is_timeout(exc: BaseException) -> bool:
+        # asyncio.TimeoutError is only an alias of TimeoutError from Python 3.11
+        return isinstance(exc, (TimeoutError, asyncio.TimeoutError))
+
+    def _count_error(self, exc: BaseException) -> None:
+        if self._is_timeout(exc):
+            kind = "timeout"
+        elif self.primary.is_retryable_error(exc):
+            kind = "retryable"
+        else:
+            kind = "rejected"
+        LLM_ERRORS.inc(kind=kind)
+
+    def _record_error(self, exc: BaseException) -> None:
+        # Only provider trouble counts against the breaker; a rejected request
+        # (4xx) still proves the provider is up.
+        if self._is_timeout(exc) or self.primary.is_retryable_error(exc):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _should_retry(self, exc: BaseException, attempt: int, delay: float, deadline: float) -> bool:
+        return (
+            attempt < self.max_retries
+            and self.primary.is_retryable_error(exc)
+            and time.monotonic() + delay < deadline
+        )
+
+    @contextmanager
+    def _sync_slot(self, deadline: float):
+        if not self._sync_slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise _NoSlotAvailable()
+        try:
+            yield
+        finally:
+            self._sync_slots.release()
+
+    @asynccontextmanager
+    async def _async_slot(self, deadline: float):
+        loop = asyncio.get_running_loop()
+        slots = self._async_slots.get(loop)
+        if slots is None:
+            slots = self._async_slots[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            raise _NoSlotAvailable()
+        try:
+            yield
+        finally:
+            slots.release()
+
+    def _call_with_retries(self, call: Callable[[], T], deadline: float) -> T:
+        attempt = 0
+        try:
+            while True:
+                try:
+                    result = call()
+                except Exception as e:
+                    self._count_error(e)
+                    delay = self._backoff(attempt)
+                    if not self._should_retry(e, attempt, delay, deadline):
+                        self._record_error(e)
+                        raise
+                    logger.info("Retrying LLM call in %.2fs after error: %s", delay, e)
+                    attempt += 1
+                    time.sleep(delay)
+                    continue
+                self.breaker.record_success()
+                return result
+        except Exception:
+            raise
+        except BaseException:
+            # Interrupted before a verdict: don't leave a half-open trial stuck.
+            self.breaker.release_trial()
+            raise
+
+    async def _acall_with_retries(self, call: Callable[[], Awaitable[T]], deadline: float) -> T:
+        attempt = 0
+        try:
+            while True:
+                try:
+                    result = await asyncio.wait_for(call(), timeout=max(0.0, deadline - time.monotonic()))
+                except Exception as e:
+                    self._count_error(e)
+                    delay = self._backoff(attempt)
+                    if not self._should_retry(e, attempt, delay, deadline):
+                        self._record_error(e)
+                        raise
+                    logger.info("Retrying LLM call in %.2fs after error: %s", delay, e)
+                    attempt += 1
+                    await asyncio.sleep(delay)
+                    continue
+                self.breaker.record_success()
+                return result
+        except Exception:
+            raise
+        except BaseException:
+            # Cancelled (client disconnect) before a verdict: don't leave a
+            # half-open trial stuck, or every later call would be rejected.
+            self.breaker.release_trial()
+            raise
+
+    def _log_fallback(self, reason: str, error: Optional[BaseException] = None) -> None:
+        LLM_FALLBACKS.inc(reason=reason)
+        logger.warning("LLM unavailable (%s). Answering with fallback adapter.", error or reason)
+
+    # ------------------------------------------------------------------
+    # NpcAIAdapter
+    # ------------------------------------------------------------------
+    def generate_reply(self, *args, **kwargs) -> str:
+        deadline = time.monotonic() + self.deadline_seconds
+        try:
+            with self._sync_slot(deadline):
+                if self.breaker.allow_request():
+                    return self._call_with_retries(
+                        lambda: self.primary.generate_reply(*args, **kwargs), deadline
+                    )
+            self._log_fallback("circuit_open")
+        except _NoSlotAvailable:
+            self._log_fallback("saturated")
+        except Exception as e:
+            self._log_fallback("error", e)
+        return FallbackReply(self.fallback.generate_reply(*args, **kwargs))
+
+    async def agenerate_reply(self, *args, **kwargs) -> str:
+        deadline = time.monotonic() + self.deadline_seconds
+        try:
+            async with self._async_slot(deadline):
+                if self.breaker.allow_request():
+                    return await self._acall_with_retries(
+                        lambda: self.primary.agenerate_reply(*args, **kwargs), deadline
+                    )
+            self._log_fallback("circuit_open")
+        except _NoSlotAvailable:
+            self._log_fallback("saturated")
+        except Exception as e:
+            self._log_fallback("error", e)
+        return FallbackReply(await self.fallback.agenerate_reply(*args, **kwargs))
+
+    async def astream_reply(self, *args, **kwargs) -> AsyncIterator[str]:
+        """
+        Retries (and falls back) only until the first chunk arrives; once text
+        has been streamed to the player, a failure is raised to the caller.
+        The deadline applies to the first chunk. The fallback is streamed after
+        the concurrency slot is released.
+        """
+        deadline = time.monotonic() + self.deadline_seconds
+        fallback_reason: Optional[str] = None
+        fallback_error: Optional[BaseException] = None
+
+        try:
+            async with self._async_slot(deadline):
+                if not self.breaker.allow_request():
+                    fallback_reason = "circuit_open"
+                else:
+                    stream = None
+
+                    async def open_stream():
+                        nonlocal stream
+                        if stream is not None:
+                            await stream.aclose()
+                        stream = self.primary.astream_reply(*args, **kwargs)
+                        try:
+                            return await anext(stream)
+                        except StopAsyncIteration:
+                            return ""
+
+                    try:
+                        first = await self._acall_with_retries(open_stream, deadline)
+                    except Exception as e:
+                        fallback_reason, fallback_error = "error", e
+                        if stream is not None:
+                            await stream.aclose()
+                    else:
+                        try:
+                            if first:
+                                yield first
+                            async for chunk in stream:
+                                yield chunk
+                        except Exception as e:
+                            self._record_error(e)
+                            raise
+                        finally:
+                            await stream.aclose()
+
+        except _NoSlotAvailable:
+            fallback_reason = "saturated"
+
+        if fallback_reason is not None:
+            self._log_fallback(fallback_reason, fallback_error)
+            async for chunk in self.fallback.astream_reply(*args, **kwargs):
+                yield FallbackReply(chunk)
+
+    @property
+    def history_window(self) -> Optional[int]:
+        return merge_history_windows(
+            resolve_history_window(self.primary), resolve_history_window(self.fallback)
+        )
+
+    def is_retryable_error(self, exc: Exception) -> bool:
+        return self.primary.is_retryable_error(exc)
@@ -2,8 +2,8 @@ from pathlib import Path
 from sqlalchemy.orm import Session
 
 from app.infra.db import init_db, SessionLocal
-from app.infra.db_models import ScenarioModel
-from app.services.scenario_loader import load_scenario_from_json
+from app.services.scenario_loader import load_scenarios_from_dir
+from app.services.scenario_catalog import warm_scenario_catalog
 
 
 SCENARIOS_DIR = Path("scenarios")
@@ -15,7 +15,8 @@ def bootstrap_game():
 
     Responsibilities:
     - Initialize database tables
-    - Load scenario JSON files if no scenario exists
+    - Sync scenario JSON files (only new or edited files are written)
+    - Warm the in-process scenario catalog used by the turn path
     - Ensure idempotency (safe to run multiple times)
     """
 
@@ -24,29 +25,32 @@ def bootstrap_game():
 
     db: Session = SessionLocal()
     try:
-        # 2. Check if any scenario already exists
-        existing = db.query(ScenarioModel).first()
-        if existing:
-            print("[bootstrap] Scenario(s) already present. Skipping load.")
-            return
+        # 2. Create / update scenarios from the JSON files
+        _load_scenarios()
 
-        # 3. Load all scenario JSON files
-        if not SCENARIOS_DIR.exists():
-            print("[bootstrap] No scenarios directory found. Skipping.")
-            return
+        # 3. Cache immutable scenario data for the turn path
+        cached = warm_scenario_catalog(db)
+        print(f"[bootstrap] Scenario catalog warmed ({cached} scenario(s)).")
 
-        json_files = list(SCENARIOS_DIR.glob("*.json"))
+    finally:
+        db.close()
 
-        if not json_files:
-            print("[bootstrap] No scenario JSON files found. Skipping.")
-            return
 
-        print(f"[bootstrap] Loading {len(json_files)} scenario(s)...")
+def _load_scenarios():
+    # Every file is synced on startup: unchanged scenarios (same content hash)
+    # are skipped, edited ones are updated in place, new ones are created.
+    if not SCENARIOS_DIR.exists():
+        print("[bootstrap] No scenarios directory found. Skipping.")
+        return
 
-        for path in json_files:
-            load_scenario_from_json(str(path), db=db)
+    results = load_scenarios_from_dir(str(SCENARIOS_DIR))
 
-        print("[bootstrap] Scenario bootstrap completed.")
+    if not results:
+        print("[bootstrap] No scenario JSON files found. Skipping.")
+        return
 
-    finally:
-        db.close()
+    for result in results:
+        if "error" in result:
+            print(f"[bootstrap] Failed to sync {result['path']}: {result['error']}")
+
+    print(f"[bootstrap] Scenario sync completed ({len(results)} file(s)).")
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any, List
+from typing import AsyncIterator, Optional, Dict, Any, List
 import logging
 from sqlalchemy.orm import Session
 
@@ -7,29 +7,39 @@ logger = logging.getLogger(__name__)
 from app.infra.db import SessionLocal
 from app.infra.db_models import (
     SessionModel,
-    SuspectModel,
     NpcChatMessageModel,
-    SessionSuspectStateModel,
-    SessionEvidenceUsageModel,
-    SecretModel,
-    EvidenceModel,
-    ScenarioModel
+    SessionSuspectStateModel
 )
 from app.core.exceptions import NotFoundError, RuleViolationError
+from app.core.metrics import LLM_FALLBACKS
 
 from app.services.ai_adapter_factory import get_npc_ai_adapter
+from app.services.ai_adapter import resolve_history_window
+from app.services.ai_adapter_dummy import DummyNpcAIAdapter
 from app.services.npc_context_builder import build_npc_context
+from app.services.conversation_summary_service import refresh_conversation_summary
 from app.services.npc_response_render_context_builder import build_render_context
+from app.services.turn_snapshot import TurnSnapshot
+from app.services.compact_state import get_revealed_secret_ids
+from app.services.scenario_catalog import (
+    ScenarioCatalog,
+    CatalogSuspect,
+    get_scenario_catalog,
+    get_catalog_for_suspect
+)
 from app.api.schemas.chat import MessageAnalysisResult, StateTransitionResult
 
 ai = get_npc_ai_adapter()
+# Last-resort fallback when the adapter itself raises; stateless, so shared
+fallback_ai = DummyNpcAIAdapter()
 
 def add_player_message(
     session_id: int,
     suspect_id: int,
     text: str,
     evidence_id: Optional[int] = None,
-    db: Optional[Session] = None
+    db: Optional[Session] = None,
+    snapshot: Optional[TurnSnapshot] = None
 ) -> dict:
     """
     Registers a player message and returns a clean dictionary with message info.
@@ -42,29 +52,24 @@ def add_player_message(
 
     try:
         # Validate session
-        session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+        if snapshot is not None:
+            session = snapshot.session
+        else:
+            session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
         if not session:
             raise NotFoundError(f"Session {session_id} not found.")
 
         if session.status == "finished":
             raise RuleViolationError(f"Session {session_id} is already finished.")
 
-        # Validate suspect
-        suspect = db.query(SuspectModel).filter(
-            SuspectModel.id == suspect_id,
-            SuspectModel.scenario_id == session.scenario_id
-        ).first()
-        if not suspect:
+        # Validate suspect and evidence against the (cached) scenario catalog
+        catalog = get_scenario_catalog(session.scenario_id, db)
+
+        if not catalog.get_suspect(suspect_id):
             raise NotFoundError(f"Suspect {suspect_id} is not part of scenario {session.scenario_id}.")
 
-        # Validate evidence
         if evidence_id is not None:
-            evidence = db.query(EvidenceModel).filter(
-                EvidenceModel.id == evidence_id,
-                EvidenceModel.scenario_id == session.scenario_id
-            ).first()
-
-            if not evidence:
+            if not catalog.get_evidence(evidence_id):
                 raise NotFoundError(
                     f"Evidence {evidence_id} is not valid for scenario {session.scenario_id}."
                 )
@@ -80,7 +85,6 @@ def add_player_message(
 
         db.add(msg)
         db.flush()
-        db.refresh(msg)
 
         if close_session:
             db.commit()
@@ -102,42 +106,121 @@ def add_player_message(
         if close_session:
             db.close()
 
+def _serialize_history_message(row: NpcChatMessageModel) -> Dict[str, Any]:
+    return {
+        "sender": row.sender_type,
+        "text": row.text,
+        "evidence_id": row.evidence_id,
+        "timestamp": row.timestamp.isoformat()
+    }
+
+
+def get_last_message_id(session_id: int, suspect_id: Optional[int], db: Session) -> int:
+    """
+    Id of the newest message of an interrogation (or of the whole session when
+    suspect_id is None); 0 when there is none. One indexed seek, used as the
+    ETag of polled history endpoints.
+    """
+    query = db.query(NpcChatMessageModel.id).filter(NpcChatMessageModel.session_id == session_id)
+    if suspect_id is not None:
+        query = query.filter(NpcChatMessageModel.suspect_id == suspect_id)
+
+    row = query.order_by(NpcChatMessageModel.id.desc()).first()
+    return row[0] if row else 0
+
+
+def list_chat_messages(
+    session_id: int,
+    suspect_id: Optional[int],
+    db: Session,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Messages in id order, optionally only those after the `after_id` cursor and
+    at most `limit` of them. suspect_id None lists every suspect of the session.
+    """
+    query = db.query(NpcChatMessageModel).filter(NpcChatMessageModel.session_id == session_id)
+    if suspect_id is not None:
+        query = query.filter(NpcChatMessageModel.suspect_id == suspect_id)
+    if after_id is not None:
+        query = query.filter(NpcChatMessageModel.id > after_id)
+
+    query = query.order_by(NpcChatMessageModel.id.asc())
+    if limit is not None:
+        query = query.limit(limit)
+
+    return [
+        {
+            "id": m.id,
+            "session_id": m.session_id,
+            "suspect_id": m.suspect_id,
+            "sender_type": m.sender_type,
+            "text": m.text,
+            "evidence_id": m.evidence_id,
+            "timestamp": m.timestamp.isoformat()
+        }
+        for m in query.all()
+    ]
+
+
+def _load_pressure_points(session_id: int, suspect_id: int, db: Session) -> List[Dict[str, Any]]:
+    """Evidence-bearing messages of the whole interrogation, independent of the history window."""
+    rows = db.query(NpcChatMessageModel.evidence_id, NpcChatMessageModel.text).filter(
+        NpcChatMessageModel.session_id == session_id,
+        NpcChatMessageModel.suspect_id == suspect_id,
+        NpcChatMessageModel.evidence_id.isnot(None)
+    ).order_by(NpcChatMessageModel.id.asc()).all()
+
+    return [{"evidence_id": evidence_id, "text": text} for evidence_id, text in rows]
+
+
 def _load_turn_context_for_npc_reply(
     session_id: int, 
     suspect_id: int, 
     player_message_id: int, 
-    db: Session
+    db: Session,
+    snapshot: Optional[TurnSnapshot] = None,
+    history_window: Optional[int] = None
 ):
-    state = db.query(SessionSuspectStateModel).filter(
-        SessionSuspectStateModel.session_id == session_id,
-        SessionSuspectStateModel.suspect_id == suspect_id
-    ).first()
+    if snapshot is not None:
+        state = snapshot.state
+    else:
+        state = db.query(SessionSuspectStateModel).filter(
+            SessionSuspectStateModel.session_id == session_id,
+            SessionSuspectStateModel.suspect_id == suspect_id
+        ).first()
 
     if not state:
         raise NotFoundError(f"Suspect {suspect_id} not part of session {session_id}.")
 
-    suspect = db.query(SuspectModel).filter(
-        SuspectModel.id == suspect_id
-    ).first()
+    scenario, suspect = get_catalog_for_suspect(suspect_id, db)
 
-    history_rows = db.query(NpcChatMessageModel).filter(
+    # Only the trailing window the adapter reads (whole history when None)
+    history_query = db.query(NpcChatMessageModel).filter(
         NpcChatMessageModel.session_id == session_id,
         NpcChatMessageModel.suspect_id == suspect_id
-    ).order_by(NpcChatMessageModel.timestamp.asc()).all()
-
-    chat_history = [
-        {
-            "sender": row.sender_type,
-            "text": row.text,
-            "evidence_id": row.evidence_id,
-            "timestamp": row.timestamp.isoformat()
-        }
-        for row in history_rows
-    ]
-
-    player_msg = db.query(NpcChatMessageModel).filter(
-        NpcChatMessageModel.id == player_message_id
-    ).first()
+    )
+    if history_window is None:
+        history_rows = history_query.order_by(
+            NpcChatMessageModel.timestamp.asc(), NpcChatMessageModel.id.asc()
+        ).all()
+    elif history_window > 0:
+        history_rows = history_query.order_by(
+            NpcChatMessageModel.timestamp.desc(), NpcChatMessageModel.id.desc()
+        ).limit(history_window).all()
+        history_rows.reverse()
+    else:
+        history_rows = []
+
+    chat_history = [_serialize_history_message(row) for row in history_rows]
+
+    # Identity-map hit when the message was added in this same session
+    player_msg = next((row for row in reversed(history_rows) if row.id == player_message_id), None)
+    if player_msg is None:
+        player_msg = db.query(NpcChatMessageModel).filter(
+            NpcChatMessageModel.id == player_message_id
+        ).first()
 
     if not player_msg:
         raise NotFoundError(f"Player message {player_message_id} not found.")
@@ -147,43 +230,28 @@ def _load_turn_context_for_npc_reply(
         "evidence_id": player_msg.evidence_id
     }
 
-    session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
-    if not session:
-        raise NotFoundError(f"Session {session_id} not found")
-
-    scenario = db.query(ScenarioModel).filter(ScenarioModel.id == session.scenario_id).first()
-    if not scenario:
-        raise NotFoundError("Scenario not found for session")
-
-    return state, suspect, session, scenario, chat_history, player_message_dict
+    return state, suspect, scenario, chat_history, player_message_dict
 
 
 def _build_suspect_state_for_ai(
     state: SessionSuspectStateModel, 
-    suspect: SuspectModel, 
+    suspect: CatalogSuspect, 
     suspect_id: int, 
-    db: Session
+    catalog: ScenarioCatalog
 ):
-    revealed_secrets = []
-    if state.revealed_secret_ids:
-        secrets = db.query(SecretModel).filter(
-            SecretModel.id.in_(state.revealed_secret_ids)
-        ).all()
-        for sc in secrets:
-            revealed_secrets.append({
-                "secret_id": sc.id,
-                "content": sc.content,
-                "is_core": sc.is_core
-            })
+    revealed_list = get_revealed_secret_ids(state, suspect.secret_index)
+    revealed_ids = set(revealed_list)
 
-    hidden_secrets = db.query(SecretModel).filter(
-        SecretModel.suspect_id == suspect_id
-    ).all()
+    revealed_secrets = [
+        {"secret_id": sc.id, "content": sc.content, "is_core": sc.is_core}
+        for sc in (catalog.secrets.get(sid) for sid in revealed_list)
+        if sc is not None
+    ]
 
     hidden_list = [
         {"secret_id": sc.id, "content": sc.content, "is_core": sc.is_core}
-        for sc in hidden_secrets
-        if sc.id not in state.revealed_secret_ids
+        for sc in suspect.secrets
+        if sc.id not in revealed_ids
     ]
 
     suspect_state = {
@@ -203,39 +271,156 @@ def _build_suspect_state_for_ai(
     return suspect_state, revealed_secrets
 
 
-def _generate_npc_text_with_fallback(
-    suspect_id: int,
-    suspect_state: dict,
-    npc_context: dict,
-    chat_history: list,
-    player_message_dict: dict,
-    render_context: dict,
-    revealed_now: list
-) -> str:
+def _generate_npc_text_with_fallback(suspect_id: int, reply_request: Dict[str, Any]) -> str:
     try:
-        reply_text = ai.generate_reply(
-            suspect_state=suspect_state,
-            npc_context=npc_context,
-            chat_history=chat_history,
-            player_message=player_message_dict,
-            render_context=render_context,
-            revealed_now=revealed_now
-        )
+        reply_text = ai.generate_reply(**reply_request)
     except Exception as e:
         logger.error(f"LLM Adapter failed for suspect {suspect_id}. Falling back to Dummy adapter. Error: {e}", exc_info=True)
-        from app.services.ai_adapter_dummy import DummyNpcAIAdapter
-        dummy_adapter = DummyNpcAIAdapter()
-        reply_text = dummy_adapter.generate_reply(
-            suspect_state=suspect_state,
-            npc_context=npc_context,
-            chat_history=chat_history,
-            player_message=player_message_dict,
-            render_context=render_context,
-            revealed_now=revealed_now
-        )
+        LLM_FALLBACKS.inc(reason="adapter_error")
+        reply_text = fallback_ai.generate_reply(**reply_request)
+    return reply_text
+
+
+async def agenerate_npc_reply_text(suspect_id: int, reply_request: Dict[str, Any]) -> str:
+    """
+    Awaits the AI adapter for a request built by `prepare_npc_reply`,
+    falling back to the Dummy adapter on failure. Touches no database state,
+    so it is safe to call outside any transaction.
+    """
+    try:
+        reply_text = await ai.agenerate_reply(**reply_request)
+    except Exception as e:
+        logger.error(f"LLM Adapter failed for suspect {suspect_id}. Falling back to Dummy adapter. Error: {e}", exc_info=True)
+        LLM_FALLBACKS.inc(reason="adapter_error")
+        reply_text = fallback_ai.generate_reply(**reply_request)
     return reply_text
 
 
+async def astream_npc_reply_text(suspect_id: int, reply_request: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Streams the NPC reply for a request built by `prepare_npc_reply`.
+
+    If the adapter fails before producing any text, the Dummy adapter reply is
+    yielded instead. If it fails mid-stream, the partial reply is kept: the
+    player has already seen it.
+    """
+    streamed_any = False
+    try:
+        async for chunk in ai.astream_reply(**reply_request):
+            if chunk:
+                streamed_any = True
+                yield chunk
+    except Exception as e:
+        if streamed_any:
+            logger.error(f"LLM stream interrupted for suspect {suspect_id}. Keeping partial reply. Error: {e}", exc_info=True)
+            return
+        logger.error(f"LLM Adapter failed for suspect {suspect_id}. Falling back to Dummy adapter. Error: {e}", exc_info=True)
+        LLM_FALLBACKS.inc(reason="adapter_error")
+        yield fallback_ai.generate_reply(**reply_request)
+
+
+def prepare_npc_reply(
+    session_id: int,
+    suspect_id: int,
+    player_message_id: int,
+    msg_analysis: MessageAnalysisResult = None,
+    state_transition: StateTransitionResult = None,
+    revealed_now: List[str] = None,
+    allowed_knowledge: List[str] = None,
+    new_knowledge_this_turn: List[str] = None,
+    evidence_effect: str = "none",
+    db: Session = None,
+    snapshot: Optional[TurnSnapshot] = None
+) -> Dict[str, Any]:
+    """
+    Loads everything the AI adapter needs for the NPC reply (suspect state,
+    chat history, player message, npc and render contexts).
+    Returns the keyword arguments of `NpcAIAdapter.generate_reply`.
+    Does not call the adapter. Its only write is the rolling conversation
+    summary on the suspect state, left to the caller's transaction.
+    """
+    history_window = resolve_history_window(ai)
+
+    state, suspect, scenario, chat_history, player_message_dict = _load_turn_context_for_npc_reply(
+        session_id, suspect_id, player_message_id, db, snapshot=snapshot,
+        history_window=history_window
+    )
+
+    # Older turns reach the prompt only through the summary
+    conversation_summary = refresh_conversation_summary(state, history_window, db, catalog=scenario)
+
+    suspect_state, revealed_secrets = _build_suspect_state_for_ai(
+        state, suspect, suspect_id, scenario
+    )
+
+    # Build pressure points (MVP)
+    pressure_points = _load_pressure_points(session_id, suspect_id, db)
+
+    npc_context = build_npc_context(
+        scenario=scenario,
+        suspect=suspect,
+        suspect_state=suspect_state,
+        revealed_secrets=revealed_secrets,
+        pressure_points=pressure_points,
+        conversation_summary=conversation_summary
+    )
+
+    # Prepare Context for LLM Prompts
+    render_context = build_render_context(
+        transition=state_transition,
+        analysis=msg_analysis,
+        revealed_facts=revealed_now,
+        allowed_knowledge=allowed_knowledge,
+        new_knowledge_this_turn=new_knowledge_this_turn,
+        suspect=suspect,
+        evidence_effect=evidence_effect
+    )
+
+    return {
+        "suspect_state": suspect_state,
+        "npc_context": npc_context,
+        "chat_history": chat_history,
+        "player_message": player_message_dict,
+        "render_context": render_context,
+        "revealed_now": revealed_now
+    }
+
+
+def save_npc_reply(
+    session_id: int,
+    suspect_id: int,
+    reply_text: str,
+    db: Session,
+    snapshot: Optional[TurnSnapshot] = None
+) -> dict:
+    """
+    Saves the NPC message (with a turn snapshot, flushing the whole turn)
+    and returns it as a dictionary.
+    """
+    npc_msg = NpcChatMessageModel(
+        session_id=session_id,
+        suspect_id=suspect_id,
+        sender_type="npc",
+        text=reply_text
+    )
+
+    db.add(npc_msg)
+    if snapshot is not None:
+        snapshot.flush()
+    else:
+        db.flush()
+
+    return {
+        "id": npc_msg.id,
+        "session_id": npc_msg.session_id,
+        "suspect_id": npc_msg.suspect_id,
+        "sender_type": npc_msg.sender_type,
+        "text": npc_msg.text,
+        "evidence_id": npc_msg.evidence_id,
+        "timestamp": npc_msg.timestamp.isoformat()
+    }
+
+
 def add_npc_reply(
     session_id: int,
     suspect_id: int,
@@ -246,18 +431,17 @@ def add_npc_reply(
     allowed_knowledge: List[str] = None,
     new_knowledge_this_turn: List[str] = None,
     evidence_effect: str = "none",
-    db: Session = None
+    db: Session = None,
+    snapshot: Optional[TurnSnapshot] = None
 ) -> dict:
     """
     Generates an NPC reply after a player sends a message.
 
     Steps:
-    1. Load suspect state (revealed secrets, closed flag, personality info)
-    2. Load recent chat history
-    3. Load the player message content
-    4. Call the AI adapter to generate reply text
-    5. Save NPC message to DB
-    6. Return that DB object
+    1. Load suspect state, chat history and the player message (prepare_npc_reply)
+    2. Call the AI adapter to generate reply text
+    3. Save NPC message to DB (save_npc_reply)
+    4. Return it as a dictionary
     """
 
     close_session = False
@@ -266,79 +450,27 @@ def add_npc_reply(
         close_session = True
 
     try:
-        state, suspect, session, scenario, chat_history, player_message_dict = _load_turn_context_for_npc_reply(
-            session_id, suspect_id, player_message_id, db
-        )
-
-        suspect_state, revealed_secrets = _build_suspect_state_for_ai(
-            state, suspect, suspect_id, db
-        )
-
-        # Build pressure points (MVP)
-        pressure_points = [
-            {
-                "evidence_id": msg["evidence_id"],
-                "text": msg["text"]
-            }
-            for msg in chat_history
-            if msg.get("evidence_id") is not None
-        ]
-
-        # Call AI adapter
-        npc_context = build_npc_context(
-            scenario=scenario,
-            suspect=suspect,
-            suspect_state=suspect_state,
-            revealed_secrets=revealed_secrets,
-            pressure_points=pressure_points,
-        )
-
-        # Prepare Context for LLM Prompts
-        render_context = build_render_context(
-            transition=state_transition,
-            analysis=msg_analysis,
-            revealed_facts=revealed_now,
+        reply_request = prepare_npc_reply(
+            session_id, suspect_id, player_message_id,
+            msg_analysis=msg_analysis,
+            state_transition=state_transition,
+            revealed_now=revealed_now,
             allowed_knowledge=allowed_knowledge,
             new_knowledge_this_turn=new_knowledge_this_turn,
-            suspect=suspect,
-            evidence_effect=evidence_effect
-        )
-
-        reply_text = _generate_npc_text_with_fallback(
-            suspect_id,
-            suspect_state,
-            npc_context,
-            chat_history,
-            player_message_dict,
-            render_context,
-            revealed_now
+            evidence_effect=evidence_effect,
+            db=db,
+            snapshot=snapshot
         )
 
-        # Save NPC message
-        npc_msg = NpcChatMessageModel(
-            session_id=session_id,
-            suspect_id=suspect_id,
-            sender_type="npc",
-            text=reply_text
-        )
+        reply_text = _generate_npc_text_with_fallback(suspect_id, reply_request)
 
-        db.add(npc_msg)
-        db.flush()
-        db.refresh(npc_msg)
+        npc_msg = save_npc_reply(session_id, suspect_id, reply_text, db, snapshot=snapshot)
 
         if close_session:
             db.commit()
 
-        return {
-            "id": npc_msg.id,
-            "session_id": npc_msg.session_id,
-            "suspect_id": npc_msg.suspect_id,
-            "sender_type": npc_msg.sender_type,
-            "text": npc_msg.text,
-            "evidence_id": npc_msg.evidence_id,
-            "timestamp": npc_msg.timestamp.isoformat()
-        }
+        return npc_msg
 
     finally:
         if close_session:
-            db.close()
\ No newline at end of file
+            db.close()
@@ -0,0 +1,141 @@
+"""
+Compact encoding of per-suspect session state.
+
+Secrets get a dense `bit_index` per suspect and evidences one per scenario,
+assigned at scenario load and kept stable across reloads. A compact suspect
+state stores, as little-endian integer bytes over those indexes:
+
+- `revealed_secrets_mask` instead of the `revealed_secret_ids` JSON list;
+- `used_evidence_mask` / `effective_evidence_mask` instead of one
+  `session_evidence_usages` row per evidence used.
+
+Sessions are created compact when COMPACT_SESSION_STATE is on; each state is
+read according to its own encoding (masks set or NULL), so both kinds coexist.
+Evidences without a `bit_index` (rows not created by the scenario loader) are
+recorded in `session_evidence_usages` even for compact states.
+The helpers below keep the list/row based API shapes for callers.
+"""
+
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.infra.db_models import SessionEvidenceUsageModel, SessionSuspectStateModel
+from app.services.scenario_catalog import SecretIndex
+
+
+def encode_mask(mask: int) -> bytes:
+    return mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+
+
+def decode_mask(value: Optional[bytes]) -> int:
+    return int.from_bytes(bytes(value), "little") if value else 0
+
+
+def is_compact(state: SessionSuspectStateModel) -> bool:
+    """True when the state uses the bitmask columns (bytes, empty when nothing is set)."""
+    return isinstance(state.revealed_secrets_mask, (bytes, bytearray, memoryview))
+
+
+def compact_state_columns() -> dict:
+    """Initial column values of a new compact suspect state."""
+    return {"revealed_secrets_mask": b"", "used_evidence_mask": b"", "effective_evidence_mask": b""}
+
+
+# ---------------------------------------
+# Revealed secrets
+# ---------------------------------------
+def get_revealed_mask(state: SessionSuspectStateModel, index: SecretIndex) -> int:
+    if is_compact(state):
+        return decode_mask(state.revealed_secrets_mask)
+    return index.mask_of(state.revealed_secret_ids or [])
+
+
+def get_revealed_secret_ids(state: SessionSuspectStateModel, index: SecretIndex) -> List[int]:
+    """Revealed secret ids, in reveal order for list states and id order for compact ones."""
+    if is_compact(state):
+        return [s.id for s in index.secrets_in(decode_mask(state.revealed_secrets_mask))]
+    return list(state.revealed_secret_ids or [])
+
+
+def add_revealed_secrets(state: SessionSuspectStateModel, index: SecretIndex, mask: int) -> None:
+    if is_compact(state):
+        state.revealed_secrets_mask = encode_mask(decode_mask(state.revealed_secrets_mask) | mask)
+        return
+    state.revealed_secret_ids.extend(s.id for s in index.secrets_in(mask))
+
+
+# ---------------------------------------
+# Evidence usage
+# ---------------------------------------
+def record_evidence_use(
+    state: SessionSuspectStateModel,
+    evidence_id: int,
+    evidence_bit: Optional[int],
+    is_effective: bool,
+    db: Session
+) -> bool:
+    """
+    Records that an evidence was shown to the suspect (and whether it revealed
+    anything). Returns True if it had already been used before.
+    """
+    if is_compact(state) and evidence_bit is not None:
+        bit = 1 << evidence_bit
+        used = decode_mask(state.used_evidence_mask)
+        was_previously_used = bool(used & bit)
+        state.used_evidence_mask = encode_mask(used | bit)
+        if is_effective:
+            state.effective_evidence_mask = encode_mask(decode_mask(state.effective_evidence_mask) | bit)
+        return was_previously_used
+
+    usage = db.get(SessionEvidenceUsageModel, (state.session_id, state.suspect_id, evidence_id))
+    if not usage:
+        db.add(SessionEvidenceUsageModel(
+            session_id=state.session_id,
+            suspect_id=state.suspect_id,
+            evidence_id=evidence_id,
+            was_effective=is_effective
+        ))
+        return False
+
+    if is_effective and not usage.was_effective:
+        usage.was_effective = True
+    return True
+
+
+def used_evidence_ids_from_mask(state: SessionSuspectStateModel, evidences: Iterable) -> Set[int]:
+    """Ids of the given evidences (rows with id and bit_index) set in a compact state."""
+    used = decode_mask(state.used_evidence_mask)
+    return {e.id for e in evidences if e.bit_index is not None and used >> e.bit_index & 1}
+
+
+def get_used_evidence_ids(
+    session_id: int,
+    suspect_id: int,
+    evidences: Iterable,
+    db: Session
+) -> Set[int]:
+    """Which of the given evidences (rows with id and bit_index) were used against the suspect."""
+    evidences = list(evidences)
+    if not evidences:
+        return set()
+
+    state = db.query(SessionSuspectStateModel).filter(
+        SessionSuspectStateModel.session_id == session_id,
+        SessionSuspectStateModel.suspect_id == suspect_id
+    ).first()
+
+    used = set()
+    if state is not None and is_compact(state):
+        used = used_evidence_ids_from_mask(state, evidences)
+        # Evidences without a bit are recorded as usage rows
+        evidences = [e for e in evidences if e.bit_index is None]
+        if not evidences:
+            return used
+
+    rows = db.query(SessionEvidenceUsageModel.evidence_id).filter(
+        SessionEvidenceUsageModel.session_id == session_id,
+        SessionEvidenceUsageModel.suspect_id == suspect_id,
+        SessionEvidenceUsageModel.evidence_id.in_([e.id for e in evidences])
+    ).all()
+    return used | {row[0] for row in rows}
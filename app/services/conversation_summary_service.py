@@ -0,0 +1,95 @@
+"""
+Rolling conversation summary for long interrogations.
+
+The NPC prompt only carries the last `history_window` messages. Every message
+that slides out of that window is folded, on the turn it leaves, into a
+compact extractive summary stored on the suspect state, so the prompt stays
+bounded no matter how long the interrogation gets and no message is ever in
+neither the history nor the summary.
+
+The summary is built from the messages themselves (no model call): one short
+line per message, oldest lines dropped once CONVERSATION_SUMMARY_MAX_CHARS is
+reached. Revealed secrets are not repeated here; the turn directives already
+list them.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.infra.db_models import NpcChatMessageModel, SessionSuspectStateModel
+from app.services.scenario_catalog import ScenarioCatalog
+
+_LINE_MAX_CHARS = 160
+_TRIMMED_MARKER = "(...)"
+
+
+def _shorten(text: str, limit: int = _LINE_MAX_CHARS) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def summarize_message(message: NpcChatMessageModel, catalog: Optional[ScenarioCatalog] = None) -> str:
+    if message.sender_type == "npc":
+        return f'- Você: "{_shorten(message.text)}"'
+
+    line = f'- Detetive: "{_shorten(message.text)}"'
+    if message.evidence_id is not None:
+        evidence = catalog.get_evidence(message.evidence_id) if catalog else None
+        line += f" [mostrou a evidência: {evidence.name if evidence else message.evidence_id}]"
+    return line
+
+
+def _trim_lines(lines: List[str], max_chars: int) -> List[str]:
+    """Drops the oldest lines until the summary fits in max_chars."""
+    if lines and lines[0] == _TRIMMED_MARKER:
+        lines = lines[1:]
+
+    trimmed = False
+    while lines and len("\n".join([_TRIMMED_MARKER] + lines)) > max_chars:
+        lines = lines[1:]
+        trimmed = True
+
+    return [_TRIMMED_MARKER] + lines if trimmed else lines
+
+
+def refresh_conversation_summary(
+    state: SessionSuspectStateModel,
+    history_window: Optional[int],
+    db: Session,
+    catalog: Optional[ScenarioCatalog] = None,
+    max_chars: int = settings.CONVERSATION_SUMMARY_MAX_CHARS
+) -> Optional[str]:
+    """
+    Folds every message that left the prompt window into `state.conversation_summary`.
+
+    Reads only the not-yet-summarized messages, so its cost is bounded by the
+    window plus the turn's new messages. Adapters that read the whole history (window None) or
+    no history at all (window 0) get no summary.
+
+    Returns the current summary (possibly unchanged).
+    """
+    if not history_window:
+        return state.conversation_summary
+
+    query = db.query(NpcChatMessageModel).filter(
+        NpcChatMessageModel.session_id == state.session_id,
+        NpcChatMessageModel.suspect_id == state.suspect_id
+    )
+    if state.summary_through_message_id is not None:
+        query = query.filter(NpcChatMessageModel.id > state.summary_through_message_id)
+
+    pending = query.order_by(NpcChatMessageModel.id.asc()).all()
+    outside_window = pending[:-history_window]
+
+    if not outside_window:
+        return state.conversation_summary
+
+    lines = state.conversation_summary.split("\n") if state.conversation_summary else []
+    lines += [summarize_message(m, catalog) for m in outside_window]
+
+    state.conversation_summary = "\n".join(_trim_lines(lines, max_chars))
+    state.summary_through_message_id = outside_window[-1].id
+
+    return state.conversation_summary
@@ -0,0 +1,144 @@
+"""
+Session event bus.
+
+Committed session changes (turn results, suspect state deltas, verdicts) are
+published on a per-session channel and pushed to `WS /sessions/{id}/live`
+subscribers, so clients do not have to poll the session endpoints.
+
+`EventBus` is the extension point: `InProcessEventBus` only reaches sockets
+served by the same process, a broker-backed implementation (selected with
+EVENT_BUS_BACKEND) is needed to fan out across worker processes.
+
+Publishing is fire-and-forget and thread-safe: services publish from worker
+threads (sync routes, `asyncio.to_thread` phases) and events are handed to
+each subscriber's event loop. A subscriber that falls behind loses its oldest
+events instead of growing its queue without bound.
+"""
+
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, Optional, Set
+
+from app.core.config import settings
+
+EVENT_TURN = "turn"
+EVENT_SUSPECT_STATE = "suspect_state"
+EVENT_VERDICT = "verdict"
+
+
+def session_channel(session_id: int) -> str:
+    return f"session:{session_id}"
+
+
+class Subscription(ABC):
+    @abstractmethod
+    async def get(self) -> Dict[str, Any]:
+        """Waits for the next event of the channel."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Stops receiving events."""
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class EventBus(ABC):
+    @abstractmethod
+    def publish(self, channel: str, event: Dict[str, Any]) -> None:
+        """Delivers an event to the channel's current subscribers. Never blocks."""
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> Subscription:
+        """Subscribes the calling event loop to a channel."""
+
+
+class _QueueSubscription(Subscription):
+    def __init__(self, bus: "InProcessEventBus", channel: str, max_queued: int):
+        self._bus = bus
+        self.channel = channel
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+
+    def _put(self, event: Dict[str, Any]) -> None:
+        # Runs on the subscriber's loop
+        if self._queue.full():
+            self._queue.get_nowait()  # slow consumer: drop the oldest event
+        self._queue.put_nowait(event)
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self._loop:
+            self._put(event)
+            return
+
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # Subscriber's loop already closed
+            self.close()
+
+    async def get(self) -> Dict[str, Any]:
+        return await self._queue.get()
+
+    def close(self) -> None:
+        self._bus._unsubscribe(self)
+
+
+class InProcessEventBus(EventBus):
+    def __init__(self, max_queued: int = settings.EVENT_BUS_MAX_QUEUED):
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[_QueueSubscription]] = {}
+
+    def publish(self, channel: str, event: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = _QueueSubscription(self, channel, self.max_queued)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+    def _unsubscribe(self, subscription: _QueueSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.channel]
+
+
+@lru_cache(maxsize=None)
+def get_event_bus() -> EventBus:
+    """Returns the process-wide bus selected by EVENT_BUS_BACKEND."""
+    backend = settings.EVENT_BUS_BACKEND.lower()
+    if backend != "inprocess":
+        raise ValueError(f"Unknown EVENT_BUS_BACKEND '{settings.EVENT_BUS_BACKEND}'.")
+    return InProcessEventBus()
+
+
+def publish_session_event(session_id: int, event_type: str, data: Dict[str, Any],
+                          suspect_id: Optional[int] = None) -> None:
+    get_event_bus().publish(
+        session_channel(session_id),
+        {"type": event_type, "session_id": session_id, "suspect_id": suspect_id, "data": data}
+    )
@@ -1,7 +1,19 @@
-from typing import Optional, Dict, Any
+import asyncio
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Optional, Dict, Any, List, Tuple
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.services.chat_service import add_player_message, add_npc_reply
+from app.services.chat_service import (
+    add_player_message,
+    add_npc_reply,
+    prepare_npc_reply,
+    agenerate_npc_reply_text,
+    astream_npc_reply_text,
+    save_npc_reply
+)
 from app.services.secret_service import apply_evidence_to_suspect
 from app.services.session_service import get_suspect_state, update_suspect_state_from_deltas
 from app.services.topic_state_service import update_topic_hit, get_topic_state
@@ -9,14 +21,89 @@ from app.services.reveal_policy_service import get_allowed_knowledge_facts
 from app.services.message_analysis_service import analyze_message
 from app.services.turn_resolution_service import resolve_turn_state
 from app.services.turn_feedback_service import build_turn_feedback
-from app.infra.db_models import SessionEvidenceUsageModel, SessionModel, ScenarioModel, NpcChatMessageModel
+from app.services.scenario_catalog import get_catalog_for_suspect
+from app.services.turn_snapshot import TurnSnapshot
+from app.services.session_overview_service import apply_turn_to_overview
+from app.services.compact_state import record_evidence_use
+from app.infra.db_models import NpcChatMessageModel, InterrogationTurnModel
+from app.services.event_bus import EVENT_SUSPECT_STATE, EVENT_TURN, publish_session_event
 from app.api.schemas.chat import (
     MessageAnalysisResult,
+    PlayerTurnResponse,
     StateTransitionResult,
     TopicSignal,
     TurnDebugTrace
 )
 from app.core.config import settings
+from app.core.tracing import current_trace, span, start_turn_trace
+
+TURN_STATUS_RESOLVED = "resolved"
+TURN_STATUS_COMPLETED = "completed"
+
+
+@dataclass
+class _ResolvedTurn:
+    """Everything the mechanical part of a turn produced before the NPC reply."""
+    session_id: int
+    suspect_id: int
+    evidence_id: Optional[int]
+    snapshot: TurnSnapshot
+    player_msg: Dict[str, Any]
+    msg_analysis: MessageAnalysisResult
+    state_transition: StateTransitionResult
+    primary_topic_state: Optional[Dict[str, Any]]
+    revealed_secrets: List[Any]
+    evidence_effect: str
+    was_previously_used: bool
+    allowed_knowledge: List[str]
+    new_knowledge: List[str]
+
+    def npc_reply_kwargs(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "suspect_id": self.suspect_id,
+            "player_message_id": self.player_msg["id"],
+            "msg_analysis": self.msg_analysis,
+            "state_transition": self.state_transition,
+            "revealed_now": self.revealed_secrets,
+            "allowed_knowledge": self.allowed_knowledge,
+            "new_knowledge_this_turn": self.new_knowledge,
+            "evidence_effect": self.evidence_effect,
+            "snapshot": self.snapshot
+        }
+
+    def to_payload(self) -> Dict[str, Any]:
+        """JSON form stored on the turn record, enough to resume the turn."""
+        return {
+            "evidence_id": self.evidence_id,
+            "player_msg": self.player_msg,
+            "msg_analysis": self.msg_analysis.model_dump(mode="json"),
+            "state_transition": self.state_transition.model_dump(mode="json"),
+            "primary_topic_state": self.primary_topic_state,
+            "revealed_secrets": self.revealed_secrets,
+            "evidence_effect": self.evidence_effect,
+            "was_previously_used": self.was_previously_used,
+            "allowed_knowledge": self.allowed_knowledge,
+            "new_knowledge": self.new_knowledge
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any], snapshot: TurnSnapshot) -> "_ResolvedTurn":
+        return cls(
+            session_id=snapshot.session_id,
+            suspect_id=payload["player_msg"]["suspect_id"],
+            evidence_id=payload["evidence_id"],
+            snapshot=snapshot,
+            player_msg=payload["player_msg"],
+            msg_analysis=MessageAnalysisResult.model_validate(payload["msg_analysis"]),
+            state_transition=StateTransitionResult.model_validate(payload["state_transition"]),
+            primary_topic_state=payload["primary_topic_state"],
+            revealed_secrets=payload["revealed_secrets"],
+            evidence_effect=payload["evidence_effect"],
+            was_previously_used=payload["was_previously_used"],
+            allowed_knowledge=payload["allowed_knowledge"],
+            new_knowledge=payload["new_knowledge"]
+        )
 
 
 def run_interrogation_turn(
@@ -29,161 +116,475 @@ def run_interrogation_turn(
     """
     Orchestrates a full interrogation turn in a transactional manner.
     Expects an active database session and does not commit it.
+
+    All mutable state of the turn is loaded once into a TurnSnapshot and
+    shared by every service; mutations are flushed together with the NPC reply.
     """
+    with start_turn_trace("interrogation_turn", session_id=session_id, suspect_id=suspect_id):
+        turn = _resolve_turn(session_id, suspect_id, text, evidence_id, db)
 
-    # 1. Player message
-    player_msg = add_player_message(
-        session_id=session_id,
-        suspect_id=suspect_id,
-        text=text,
-        evidence_id=evidence_id,
-        db=db
+        # 3. NPC reply
+        with span("npc_reply"):
+            npc_msg = add_npc_reply(**turn.npc_reply_kwargs(), db=db)
+
+        return _build_turn_result(turn, npc_msg, db)
+
+
+async def arun_interrogation_turn(
+    session_id: int,
+    suspect_id: int,
+    text: str,
+    evidence_id: Optional[int],
+    db: Session,
+    turn_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Runs an interrogation turn in phases, committing between them so no
+    write transaction is open while the NPC reply is generated:
+
+    1. Mechanical phase: resolves and commits the player message, state deltas,
+       reveals and knowledge depth, together with a "resolved" turn record.
+    2. Rendering phase: awaits the AI adapter outside any transaction.
+    3. Completion phase: a short transaction saves the NPC message and marks
+       the turn "completed".
+
+    `turn_id` is an idempotency key. Retrying a "resolved" turn (e.g. after a
+    crash during rendering) resumes it at phase 2; retrying a "completed" one
+    replays its result. When omitted, a new turn_id is generated.
+    Unlike `run_interrogation_turn`, this commits the given session itself.
+    """
+    with start_turn_trace("interrogation_turn", session_id=session_id, suspect_id=suspect_id):
+        pending = await asyncio.to_thread(
+            _run_mechanical_phase, session_id, suspect_id, text, evidence_id, db, turn_id
+        )
+        _publish_state_change(pending)
+
+        npc_msg = pending.npc_msg
+        if npc_msg is None:
+            with span("llm"):
+                reply_text = await agenerate_npc_reply_text(suspect_id, pending.reply_request)
+            with span("npc_reply_save"):
+                npc_msg = await asyncio.to_thread(_run_completion_phase, pending, reply_text, db)
+
+        result = await asyncio.to_thread(_build_replayable_result, pending, npc_msg, db)
+        _publish_turn_result(pending, result)
+        return result
+
+
+async def astream_interrogation_turn(
+    session_id: int,
+    suspect_id: int,
+    text: str,
+    evidence_id: Optional[int],
+    db: Session,
+    turn_id: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Streaming variant of `arun_interrogation_turn`, with the same phases and
+    turn_id semantics. Yields (event, data) pairs:
+
+    - ("turn", mechanics): the turn response without the NPC message, as soon
+      as the mechanical phase is committed;
+    - ("token", {"text": ...}): NPC reply chunks, as the model produces them;
+    - ("done", {"npc_message": ...}): the saved NPC message.
+
+    If the consumer stops early, the turn stays "resolved" and can be resumed
+    by retrying the same turn_id.
+    """
+    with start_turn_trace("interrogation_turn", session_id=session_id, suspect_id=suspect_id):
+        pending = await asyncio.to_thread(
+            _run_mechanical_phase, session_id, suspect_id, text, evidence_id, db, turn_id
+        )
+        _publish_state_change(pending)
+
+        mechanics = await asyncio.to_thread(_build_replayable_result, pending, None, db)
+        yield "turn", mechanics
+
+        npc_msg = pending.npc_msg
+        if npc_msg is None:
+            chunks = []
+            # Includes the time the consumer takes to send each chunk
+            with span("llm"):
+                async for chunk in astream_npc_reply_text(suspect_id, pending.reply_request):
+                    chunks.append(chunk)
+                    yield "token", {"text": chunk}
+
+            with span("npc_reply_save"):
+                npc_msg = await asyncio.to_thread(
+                    _run_completion_phase, pending, "".join(chunks).strip(), db
+                )
+        else:
+            # Replay of a completed turn: the reply arrives as a single chunk
+            yield "token", {"text": npc_msg["text"]}
+
+        _publish_turn_result(pending, {**mechanics, "npc_message": npc_msg})
+        yield "done", {"npc_message": npc_msg}
+
+
+@dataclass
+class _PendingTurn:
+    """A turn whose mechanical phase is committed, as seen by the later phases."""
+    record_id: int
+    turn_id: str
+    turn: _ResolvedTurn
+    reply_request: Optional[Dict[str, Any]] = None
+    npc_msg: Optional[Dict[str, Any]] = None
+    # Set when this attempt committed the turn's state (not on resume/replay)
+    committed_state: Optional[Dict[str, Any]] = None
+
+
+def _publish_state_change(pending: _PendingTurn) -> None:
+    """Pushes the suspect state committed by the mechanical phase to live subscribers."""
+    if pending.committed_state is None:
+        return
+    publish_session_event(
+        pending.turn.session_id, EVENT_SUSPECT_STATE,
+        {"suspect_id": pending.turn.suspect_id, **pending.committed_state},
+        suspect_id=pending.turn.suspect_id
     )
 
-    # 1.1 Fetch current suspect conversational state
-    initial_suspect_state = get_suspect_state(
-        session_id=session_id,
-        suspect_id=suspect_id,
-        db=db
+
+def _publish_turn_result(pending: _PendingTurn, result: Dict[str, Any]) -> None:
+    """Pushes the completed turn to live subscribers; replayed turns were already sent."""
+    if pending.npc_msg is not None:
+        return
+    publish_session_event(
+        pending.turn.session_id, EVENT_TURN,
+        PlayerTurnResponse.model_validate(result).model_dump(mode="json"),
+        suspect_id=pending.turn.suspect_id
     )
 
-    # Fetch scenario topics to pass into message analysis
-    session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
-    scenario = db.query(ScenarioModel).filter(ScenarioModel.id == session.scenario_id).first()
-    available_topics = scenario.topics if scenario and scenario.topics else []
-
-    # Fetch recent player messages for novelty check
-    recent_player_msgs = [
-        row[0] for row in db.query(NpcChatMessageModel.text).filter(
-            NpcChatMessageModel.session_id == session_id,
-            NpcChatMessageModel.suspect_id == suspect_id,
-            NpcChatMessageModel.sender_type == "player",
-            NpcChatMessageModel.id < player_msg["id"]
-        ).order_by(NpcChatMessageModel.id.desc()).limit(3).all()
-    ]
-
-    # 1.2 Analyze player message against known topics
-    msg_analysis = analyze_message(text, available_topics=available_topics, player_history=recent_player_msgs)
-
-    # 1.3 Resolve turn mechanics (State Transition)
-    primary_topic_state = None
-    if msg_analysis.primary_topic_id:
-        try:
-            primary_topic_state = get_topic_state(
+
+def _find_turn_record(
+    session_id: int, suspect_id: int, turn_id: str, db: Session
+) -> Optional[InterrogationTurnModel]:
+    return db.query(InterrogationTurnModel).filter(
+        InterrogationTurnModel.session_id == session_id,
+        InterrogationTurnModel.suspect_id == suspect_id,
+        InterrogationTurnModel.turn_id == turn_id
+    ).first()
+
+
+def _serialize_message(msg: NpcChatMessageModel) -> Dict[str, Any]:
+    return {
+        "id": msg.id,
+        "session_id": msg.session_id,
+        "suspect_id": msg.suspect_id,
+        "sender_type": msg.sender_type,
+        "text": msg.text,
+        "evidence_id": msg.evidence_id,
+        "timestamp": msg.timestamp.isoformat()
+    }
+
+
+def _run_mechanical_phase(
+    session_id: int,
+    suspect_id: int,
+    text: str,
+    evidence_id: Optional[int],
+    db: Session,
+    turn_id: Optional[str]
+) -> _PendingTurn:
+    """
+    Phase 1. Resolves a new turn (or reloads the one recorded under turn_id),
+    prepares the NPC reply request and commits.
+    """
+    try:
+        record = _find_turn_record(session_id, suspect_id, turn_id, db) if turn_id else None
+
+        committed_state = None
+        if record is None:
+            turn = _resolve_turn(session_id, suspect_id, text, evidence_id, db)
+            committed_state = get_suspect_state(session_id, suspect_id, snapshot=turn.snapshot)
+            record = InterrogationTurnModel(
                 session_id=session_id,
                 suspect_id=suspect_id,
-                topic_id=msg_analysis.primary_topic_id,
-                db=db
+                turn_id=turn_id or uuid.uuid4().hex,
+                status=TURN_STATUS_RESOLVED,
+                player_message_id=turn.player_msg["id"],
+                payload=turn.to_payload()
             )
-        except Exception:
-            pass # Ignora se não achar estado anterior
-            
-    state_transition = resolve_turn_state(
-        analysis=msg_analysis,
-        current_state=initial_suspect_state,
-        topic_state=primary_topic_state
-    )
+            db.add(record)
+            db.flush()
+        else:
+            turn = _ResolvedTurn.from_payload(record.payload, TurnSnapshot.load(session_id, suspect_id, db))
 
-    # 1.4 Apply state deltas to DB
-    if state_transition.state_deltas:
-        update_suspect_state_from_deltas(
-            session_id=session_id,
-            suspect_id=suspect_id,
-            deltas=state_transition.state_deltas,
-            db=db
+        pending = _PendingTurn(
+            record_id=record.id, turn_id=record.turn_id, turn=turn, committed_state=committed_state
         )
+        if record.status == TURN_STATUS_COMPLETED:
+            pending.npc_msg = _serialize_message(db.get(NpcChatMessageModel, record.npc_message_id))
+        else:
+            with span("prepare_npc_reply"):
+                pending.reply_request = prepare_npc_reply(**turn.npc_reply_kwargs(), db=db)
 
-    # 1.5 Update topic hits
-    for topic_id in msg_analysis.detected_topic_ids:
-        # Verifica se o tópico ESPECÍFICO detectado é sensível 
-        is_sens_hit = topic_id in msg_analysis.sensitive_topic_ids
-        heat_delta = 15.0 if is_sens_hit else 0.0
+        with span("commit"):
+            db.commit()
+        return pending
 
-        update_topic_hit(
-            session_id=session_id,
-            suspect_id=suspect_id,
-            topic_id=topic_id,
-            heat_delta=heat_delta,
-            db=db
+    except IntegrityError:
+        # Same turn_id submitted concurrently: the other request owns the turn
+        db.rollback()
+        if turn_id and _find_turn_record(session_id, suspect_id, turn_id, db):
+            return _run_mechanical_phase(session_id, suspect_id, text, evidence_id, db, turn_id)
+        raise
+
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _run_completion_phase(pending: _PendingTurn, reply_text: str, db: Session) -> Dict[str, Any]:
+    """
+    Phase 3. Saves the NPC message and completes the turn in one short
+    transaction. If another attempt completed the turn first, its message
+    wins and this reply is discarded.
+    """
+    turn = pending.turn
+    try:
+        npc_msg = save_npc_reply(turn.session_id, turn.suspect_id, reply_text, db)
+
+        claimed = db.query(InterrogationTurnModel).filter(
+            InterrogationTurnModel.id == pending.record_id,
+            InterrogationTurnModel.status == TURN_STATUS_RESOLVED
+        ).update(
+            {
+                InterrogationTurnModel.status: TURN_STATUS_COMPLETED,
+                InterrogationTurnModel.npc_message_id: npc_msg["id"],
+                InterrogationTurnModel.completed_at: datetime.now()
+            },
+            synchronize_session=False
         )
 
-    # 2. Evidence logic (may reveal secrets)
-    revealed_secrets = []
-    evidence_effect = "none"
-    was_previously_used = False
-    
-    if evidence_id is not None:
-        revealed_secrets, evidence_effect = apply_evidence_to_suspect(
+        if not claimed:
+            db.rollback()
+            record = db.get(InterrogationTurnModel, pending.record_id)
+            npc_msg = _serialize_message(db.get(NpcChatMessageModel, record.npc_message_id))
+            db.rollback()
+            return npc_msg
+
+        db.commit()
+        return npc_msg
+
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _build_replayable_result(
+    pending: _PendingTurn, npc_msg: Optional[Dict[str, Any]], db: Session
+) -> Dict[str, Any]:
+    """Turn response tagged with its turn_id; mechanics only when npc_msg is None."""
+    try:
+        if npc_msg is None:
+            result = _build_turn_mechanics(pending.turn, db)
+        else:
+            result = _build_turn_result(pending.turn, npc_msg, db)
+        result["turn_id"] = pending.turn_id
+        return result
+    finally:
+        # Read-only; just end the implicit transaction
+        db.rollback()
+
+
+def _resolve_turn(
+    session_id: int,
+    suspect_id: int,
+    text: str,
+    evidence_id: Optional[int],
+    db: Session
+) -> _ResolvedTurn:
+    """
+    Runs the mechanical part of a turn (steps 0 to 2.5): player message,
+    message analysis, state transition, evidence and knowledge reveal.
+    """
+
+    # 0. Load session, suspect state, topic and knowledge states in one go
+    with span("snapshot_load"):
+        snapshot = TurnSnapshot.load(session_id, suspect_id, db)
+
+    # 1. Player message
+    with span("player_message"):
+        player_msg = add_player_message(
             session_id=session_id,
             suspect_id=suspect_id,
+            text=text,
             evidence_id=evidence_id,
-            detected_topics=msg_analysis.detected_topic_ids,
-            db=db
+            db=db,
+            snapshot=snapshot
         )
-        
-        # Penalize for out_of_context
-        if evidence_effect == "out_of_context":
+
+    # 1.1 Fetch current suspect conversational state
+    initial_suspect_state = get_suspect_state(
+        session_id=session_id,
+        suspect_id=suspect_id,
+        db=db,
+        snapshot=snapshot
+    )
+
+    # Scenario topics (from the cached catalog) to pass into message analysis
+    catalog, _ = get_catalog_for_suspect(suspect_id, db)
+    available_topics = catalog.topics
+
+    with span("message_analysis"):
+        # Fetch recent player messages for novelty check
+        recent_player_msgs = [
+            row[0] for row in db.query(NpcChatMessageModel.text).filter(
+                NpcChatMessageModel.session_id == session_id,
+                NpcChatMessageModel.suspect_id == suspect_id,
+                NpcChatMessageModel.sender_type == "player",
+                NpcChatMessageModel.id < player_msg["id"]
+            ).order_by(NpcChatMessageModel.id.desc()).limit(3).all()
+        ]
+
+        # 1.2 Analyze player message against known topics
+        msg_analysis = analyze_message(
+            text,
+            available_topics=available_topics,
+            player_history=recent_player_msgs,
+            topic_matcher=catalog.topic_matcher
+        )
+
+    with span("turn_resolution"):
+        # 1.3 Resolve turn mechanics (State Transition)
+        primary_topic_state = None
+        if msg_analysis.primary_topic_id:
+            try:
+                primary_topic_state = get_topic_state(
+                    session_id=session_id,
+                    suspect_id=suspect_id,
+                    topic_id=msg_analysis.primary_topic_id,
+                    db=db,
+                    snapshot=snapshot
+                )
+            except Exception:
+                pass # Ignora se não achar estado anterior
+
+        state_transition = resolve_turn_state(
+            analysis=msg_analysis,
+            current_state=initial_suspect_state,
+            topic_state=primary_topic_state
+        )
+
+        # 1.4 Apply state deltas to DB
+        if state_transition.state_deltas:
             update_suspect_state_from_deltas(
                 session_id=session_id,
                 suspect_id=suspect_id,
-                deltas={"patience": -10.0},
-                db=db
+                deltas=state_transition.state_deltas,
+                db=db,
+                snapshot=snapshot
             )
 
-        # Log evidence usage and update was_effective if applicable
-        usage = db.query(SessionEvidenceUsageModel).filter(
-            SessionEvidenceUsageModel.session_id == session_id,
-            SessionEvidenceUsageModel.suspect_id == suspect_id,
-            SessionEvidenceUsageModel.evidence_id == evidence_id
-        ).first()
+        # 1.5 Update topic hits
+        for topic_id in msg_analysis.detected_topic_ids:
+            # Verifica se o tópico ESPECÍFICO detectado é sensível 
+            is_sens_hit = topic_id in msg_analysis.sensitive_topic_ids
+            heat_delta = 15.0 if is_sens_hit else 0.0
 
-        is_effective = len(revealed_secrets) > 0
+            update_topic_hit(
+                session_id=session_id,
+                suspect_id=suspect_id,
+                topic_id=topic_id,
+                heat_delta=heat_delta,
+                db=db,
+                snapshot=snapshot
+            )
 
-        if not usage:
-            was_previously_used = False
-            usage = SessionEvidenceUsageModel(
+    # 2. Evidence logic (may reveal secrets)
+    revealed_secrets = []
+    evidence_effect = "none"
+    was_previously_used = False
+    
+    if evidence_id is not None:
+        with span("evidence"):
+            revealed_secrets, evidence_effect = apply_evidence_to_suspect(
                 session_id=session_id,
                 suspect_id=suspect_id,
                 evidence_id=evidence_id,
-                was_effective=is_effective
+                detected_topics=msg_analysis.detected_topic_ids,
+                db=db,
+                snapshot=snapshot
+            )
+
+            # Penalize for out_of_context
+            if evidence_effect == "out_of_context":
+                update_suspect_state_from_deltas(
+                    session_id=session_id,
+                    suspect_id=suspect_id,
+                    deltas={"patience": -10.0},
+                    db=db,
+                    snapshot=snapshot
+                )
+
+            # Log evidence usage and update was_effective if applicable
+            evidence = catalog.get_evidence(evidence_id)
+            was_previously_used = record_evidence_use(
+                state=snapshot.state,
+                evidence_id=evidence_id,
+                evidence_bit=evidence.bit_index if evidence else None,
+                is_effective=len(revealed_secrets) > 0,
+                db=db
             )
-            db.add(usage)
-        else:
-            was_previously_used = True
-            if is_effective and not usage.was_effective:
-                usage.was_effective = True
-        
-        db.flush()
 
     # 2.5 Extract Allowed Knowledge Layers based on Topics Touched
-    knowledge_facts = get_allowed_knowledge_facts(
-        session_id=session_id,
-        suspect_id=suspect_id,
-        detected_topics=msg_analysis.detected_topic_ids,
-        db=db
-    )
+    with span("reveal_policy"):
+        knowledge_facts = get_allowed_knowledge_facts(
+            session_id=session_id,
+            suspect_id=suspect_id,
+            detected_topics=msg_analysis.detected_topic_ids,
+            db=db,
+            snapshot=snapshot
+        )
     allowed_knowledge = knowledge_facts.get("known_knowledge", [])
     new_knowledge = knowledge_facts.get("new_knowledge_this_turn", [])
 
-    # 3. NPC reply
-    npc_msg = add_npc_reply(
+    # 2.6 Keep the session overview read model in step, same transaction
+    with span("overview"):
+        apply_turn_to_overview(snapshot, suspect_id, evidence_id)
+
+    return _ResolvedTurn(
         session_id=session_id,
         suspect_id=suspect_id,
-        player_message_id=player_msg["id"],
+        evidence_id=evidence_id,
+        snapshot=snapshot,
+        player_msg=player_msg,
         msg_analysis=msg_analysis,
         state_transition=state_transition,
-        revealed_now=revealed_secrets,
-        allowed_knowledge=allowed_knowledge,
-        new_knowledge_this_turn=new_knowledge,
+        primary_topic_state=primary_topic_state,
+        revealed_secrets=revealed_secrets,
         evidence_effect=evidence_effect,
-        db=db
+        was_previously_used=was_previously_used,
+        allowed_knowledge=allowed_knowledge,
+        new_knowledge=new_knowledge
     )
 
+
+def _build_turn_result(turn: _ResolvedTurn, npc_msg: Dict[str, Any], db: Session) -> Dict[str, Any]:
+    """Builds the turn response (steps 4+) once the NPC reply has been saved."""
+    result = _build_turn_mechanics(turn, db)
+    result["npc_message"] = npc_msg
+    return result
+
+
+def _build_turn_mechanics(turn: _ResolvedTurn, db: Session) -> Dict[str, Any]:
+    """
+    Builds everything in the turn response except the NPC message. None of it
+    depends on the reply text, so it can be sent before the reply is generated.
+    """
+    session_id = turn.session_id
+    suspect_id = turn.suspect_id
+    evidence_id = turn.evidence_id
+    msg_analysis = turn.msg_analysis
+    state_transition = turn.state_transition
+    evidence_effect = turn.evidence_effect
+
     # 4. Fetch updated suspect state (snapshot for UX)
     suspect_state = get_suspect_state(
         session_id=session_id,
         suspect_id=suspect_id,
-        db=db
+        db=db,
+        snapshot=turn.snapshot
     )
 
     # Calculate evidence effect for UI feedback
@@ -191,7 +592,7 @@ def run_interrogation_turn(
         if evidence_effect not in ("out_of_context", "revealed_secret"):
             # Se a evidência não foi reveladora agora, e não bateu na trave do contexto,
             # mas ela já existia no histórico de uso (usage table) ANTES deste turno, então é duplicate.
-            if was_previously_used:
+            if turn.was_previously_used:
                 evidence_effect = "duplicate"
                 
     # Feedback Sistêmico (Epic G) via service extraído
@@ -199,22 +600,23 @@ def run_interrogation_turn(
         analysis=msg_analysis,
         transition=state_transition,
         evidence_effect=evidence_effect,
-        topic_state=primary_topic_state
+        topic_state=turn.primary_topic_state
     )
 
     debug_trace = None
     if settings.DEBUG_TURN_TRACE:
+        trace = current_trace()
         debug_trace = TurnDebugTrace(
             message_analysis=msg_analysis,
             state_transition=state_transition,
-            allowed_knowledge=allowed_knowledge,
-            new_knowledge_this_turn=new_knowledge
+            allowed_knowledge=turn.allowed_knowledge,
+            new_knowledge_this_turn=turn.new_knowledge,
+            timings=trace.to_dict() if trace is not None else None
         )
 
     return {
-        "player_message": player_msg,
-        "npc_message": npc_msg,
-        "revealed_secrets": revealed_secrets,
+        "player_message": turn.player_msg,
+        "revealed_secrets": turn.revealed_secrets,
         "evidence_effect": evidence_effect,
         "suspect_state": suspect_state,
         "message_analysis": msg_analysis if settings.DEBUG_TURN_TRACE else None,
@@ -2,6 +2,7 @@ from typing import List, Optional
 
 from app.api.schemas.chat import MessageAnalysisResult
 from app.services.message_classifier import MessageClassifier, HeuristicMessageClassifier
+from app.services.topic_matcher import TopicMatcher
 
 class MessageAnalysisService:
     """
@@ -16,17 +17,17 @@ class MessageAnalysisService:
         else:
             self.classifier = classifier
 
-    def analyze_message(self, text: str, available_topics: Optional[List[dict]] = None, player_history: Optional[List[str]] = None) -> MessageAnalysisResult:
+    def analyze_message(self, text: str, available_topics: Optional[List[dict]] = None, player_history: Optional[List[str]] = None, topic_matcher: Optional[TopicMatcher] = None) -> MessageAnalysisResult:
         """
         Delega a análise da mensagem de texto do jogador e cruzamento de tópicos
         para o classificador embutido (heurístico no MVP).
         """
-        return self.classifier.classify(text, available_topics=available_topics, player_history=player_history)
+        return self.classifier.classify(text, available_topics=available_topics, player_history=player_history, topic_matcher=topic_matcher)
 
 
 # Instância padrão do serviço para uso nos turnos da API 
 default_message_analyzer = MessageAnalysisService()
 
-def analyze_message(text: str, available_topics: Optional[List[dict]] = None, player_history: Optional[List[str]] = None) -> MessageAnalysisResult:
+def analyze_message(text: str, available_topics: Optional[List[dict]] = None, player_history: Optional[List[str]] = None, topic_matcher: Optional[TopicMatcher] = None) -> MessageAnalysisResult:
     """Wrapper prático para o serviço de análise padrão."""
-    return default_message_analyzer.analyze_message(text, available_topics, player_history)
+    return default_message_analyzer.analyze_message(text, available_topics, player_history, topic_matcher)
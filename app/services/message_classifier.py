@@ -1,4 +1,5 @@
 import re
+import string
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
@@ -9,6 +10,15 @@ from app.api.schemas.chat import (
     NoveltyLevel,
     SpecificityLevel
 )
+from app.services.topic_matcher import TopicMatcher
+
+# Tabela de pontuação criada uma única vez (antes era recriada a cada mensagem do histórico)
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+
+def _normalize(s: str) -> str:
+    return s.lower().translate(_PUNCTUATION_TABLE).strip()
+
 
 class MessageClassifier(ABC):
     """
@@ -17,10 +27,12 @@ class MessageClassifier(ABC):
     """
     
     @abstractmethod
-    def classify(self, text: str, available_topics: Optional[List[dict]] = None, player_history: Optional[List[str]] = None, **kwargs) -> MessageAnalysisResult:
+    def classify(self, text: str, available_topics: Optional[List[dict]] = None, player_history: Optional[List[str]] = None, topic_matcher: Optional[TopicMatcher] = None, **kwargs) -> MessageAnalysisResult:
         """
         Recebe o texto do jogador e tópicos para extrair a intenção e os hits.
         O player_history opcional é uma lista das ultimas mensagens para calculo de novelty.
+        O topic_matcher opcional é o índice de aliases pré-compilado do cenário;
+        sem ele, um índice é montado a partir de available_topics.
         """
         pass
 
@@ -39,7 +51,7 @@ class HeuristicMessageClassifier(MessageClassifier):
             MessageIntent.ask: re.compile(r'\b(onde|quem|quando|por que|porque|como|o que|qual)\b', re.IGNORECASE)
         }
 
-    def classify(self, text: str, available_topics: Optional[List[dict]] = None, player_history: Optional[List[str]] = None, **kwargs) -> MessageAnalysisResult:
+    def classify(self, text: str, available_topics: Optional[List[dict]] = None, player_history: Optional[List[str]] = None, topic_matcher: Optional[TopicMatcher] = None, **kwargs) -> MessageAnalysisResult:
         text_lower = text.lower().strip()
         
         # 1. Classificação de Intenção (Heurística simples)
@@ -72,23 +84,16 @@ class HeuristicMessageClassifier(MessageClassifier):
         primary_topic_id = None
         sensitivity_hit = SensitivityLevel.none
 
-        if available_topics:
-            for topic in available_topics:
-                aliases = topic.get("aliases", [])
-                
-                # Create a simple \b word \b matcher for all aliases
-                if aliases:
-                    # Escape aliases to be safe, join with |
-                    pattern_str = r'\b(' + '|'.join(re.escape(a.strip()) for a in aliases) + r')\b'
-                    matcher = re.compile(pattern_str, re.IGNORECASE)
-                    
-                    if matcher.search(text_lower):
-                        detected_topic_ids.append(topic["id"])
-                        
-                        if topic.get("is_sensitive"):
-                            sensitive_topic_ids.append(topic["id"])
-                            sensitivity_hit = SensitivityLevel.high
-                            
+        if topic_matcher is None and available_topics:
+            topic_matcher = TopicMatcher(available_topics)
+
+        if topic_matcher:
+            detected_topic_ids = topic_matcher.match(text)
+            sensitive_topic_ids = [t for t in detected_topic_ids if topic_matcher.is_sensitive(t)]
+
+            if sensitive_topic_ids:
+                sensitivity_hit = SensitivityLevel.high
+
             if detected_topic_ids:
                 # Naive primary assignment for MVP
                 primary_topic_id = detected_topic_ids[0]
@@ -96,15 +101,11 @@ class HeuristicMessageClassifier(MessageClassifier):
         # 4. Novelty análise com histórico
         novelty = NoveltyLevel.new
         if player_history:
-            import string
-            def normalize(s: str) -> str:
-                return s.lower().translate(str.maketrans('', '', string.punctuation)).strip()
-            
-            norm_text = normalize(text)
+            norm_text = _normalize(text)
             current_words = set(norm_text.split())
             
             for past_msg in player_history:
-                norm_past = normalize(past_msg)
+                norm_past = _normalize(past_msg)
                 if not norm_past:
                     continue
                     
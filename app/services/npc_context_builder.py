@@ -1,12 +1,19 @@
+from typing import Optional
+
+
 def build_npc_context(
     scenario,
     suspect,
     suspect_state: dict,
     revealed_secrets: list,
-    pressure_points: list
+    pressure_points: list,
+    conversation_summary: Optional[str] = None
 ) -> dict:
     return {
         "case": {
+            "id": scenario.id,
+            # Catalog version: changes when the scenario is reloaded (prompt prefix cache key)
+            "version": scenario.version,
             "title": scenario.title,
             "description": scenario.description,
             "summary": scenario.case_summary
@@ -22,6 +29,8 @@ def build_npc_context(
         # 🔴 CONTROLE DO BACKEND
         "revealed_secrets": revealed_secrets,
         "pressure_points": pressure_points,
+        # Turns older than the prompt history window, summarized
+        "conversation_summary": conversation_summary,
         "rules": {
             "can_only_use_revealed_secrets": True,
             "never_invent_facts": True,
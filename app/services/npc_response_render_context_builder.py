@@ -1,7 +1,7 @@
 from app.api.schemas.chat import StateTransitionResult, NpcShift, MessageAnalysisResult
 from app.api.schemas.render_context import NpcResponseRenderContext, ResponseMode
 from typing import Optional, List
-from app.infra.db_models import SuspectModel
+from app.services.scenario_catalog import CatalogSuspect
 
 def build_render_context(
     transition: StateTransitionResult,
@@ -9,7 +9,7 @@ def build_render_context(
     revealed_facts: Optional[List[str]] = None,
     allowed_knowledge: Optional[List[str]] = None,
     new_knowledge_this_turn: Optional[List[str]] = None,
-    suspect: Optional[SuspectModel] = None,
+    suspect: Optional[CatalogSuspect] = None,
     evidence_effect: str = "none"
 ) -> NpcResponseRenderContext:
     """
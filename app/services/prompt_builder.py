@@ -1,15 +1,92 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
 from app.api.schemas.render_context import NpcResponseRenderContext
 
-def build_npc_prompt(
-    npc_context,
-    chat_history,
-    render_context: NpcResponseRenderContext
-):
-    
+# The prompt is split in two so providers can cache the prompt prefix:
+# - a static system prefix (persona, case, absolute rules), identical on every
+#   turn with the same suspect, sent as the FIRST message;
+# - when the interrogation outgrew the history window, a system message with
+#   the rolling summary of the older turns, right before the chat history;
+# - a small volatile system suffix (stance, response mode, allowed facts and
+#   knowledge), sent as the LAST message, after the chat history.
+# Nothing that changes per turn may go into the static prefix.
+
+# Trailing chat messages included in the prompt
+PROMPT_HISTORY_WINDOW = 10
+
+_PREFIX_CACHE_MAX_ENTRIES = 1024
+_prefix_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+_prefix_lock = threading.Lock()
+
+
+def _static_prefix_cache_key(npc_context) -> Optional[Tuple]:
+    """(scenario id, scenario catalog version, suspect id), or None if unknown."""
+    case = npc_context.get("case", {})
+    key = (case.get("id"), case.get("version"), npc_context["suspect"].get("id"))
+    return None if None in key else key
+
+
+def _render_static_prefix(npc_context) -> str:
+    return f"""
+Você é um personagem em um jogo investigativo sendo interrogado.
+
+== SEU PERSONAGEM ==
+Nome: {npc_context["suspect"]["name"]}
+Personalidade: {npc_context["suspect"]["personality"]}
+
+=== CONTEXTO DO CASO (SUA VISÃO) ===
+História Pública:
+{npc_context["case"]["description"]}
+
+=== REGRAS ABSOLUTAS ===
+- NUNCA invente fatos novos.
+- NUNCA revele fatos que não estão listados em "O QUE VOCÊ PODE FALAR".
+- Se o detetive perguntar de algo não listado, seja evasivo ou negue.
+- Se o Modo de Resposta for "final_phrase", retorne apenas a sua frase final e encerre.
+- As diretrizes do turno atual (postura, modo de resposta e o que você pode falar) vêm na última mensagem de sistema e valem apenas para a sua próxima resposta.
+""".strip()
+
+
+def get_static_prompt_prefix(npc_context) -> str:
+    """
+    Returns the static system prefix for a suspect, rendered once per
+    (scenario, scenario version, suspect) and then served from a local cache.
+    Contexts without ids (e.g. built by hand) are rendered without caching.
+    """
+    key = _static_prefix_cache_key(npc_context)
+    if key is None:
+        return _render_static_prefix(npc_context)
+
+    with _prefix_lock:
+        prefix = _prefix_cache.get(key)
+        if prefix is not None:
+            _prefix_cache.move_to_end(key)
+            return prefix
+
+    prefix = _render_static_prefix(npc_context)
+
+    with _prefix_lock:
+        _prefix_cache[key] = prefix
+        while len(_prefix_cache) > _PREFIX_CACHE_MAX_ENTRIES:
+            _prefix_cache.popitem(last=False)
+
+    return prefix
+
+
+def clear_prompt_prefix_cache() -> None:
+    with _prefix_lock:
+        _prefix_cache.clear()
+
+
+def build_turn_directives(render_context: NpcResponseRenderContext) -> str:
+    """Volatile per-turn part of the prompt."""
+
     # 1. Format Allowed Facts and Knowledge
     allowed_facts_str = "\n".join(f"- {fact}" for fact in render_context.allowed_facts) \
         if render_context.allowed_facts else "Nenhum segredo revelado até agora."
-        
+
     allowed_knowledge_str = "\n".join(f"- {k}" for k in render_context.allowed_knowledge) \
         if render_context.allowed_knowledge else "Nenhum cenário já discutido."
 
@@ -25,22 +102,12 @@ def build_npc_prompt(
         "deny": "Negue veementemente a acusação ou suposição feita pelo detetive.",
         "final_phrase": "O interrogatório está ENCERRADO. Responda APENAS E EXATAMENTE a sua Frase Final."
     }
-    
-    mode_rule = mode_instructions.get(render_context.response_mode.value, mode_instructions["neutral_answer"])
-
-    system_prompt = f"""
-Você é um personagem em um jogo investigativo sendo interrogado.
 
-== SEU PERSONAGEM == 
-Nome: {npc_context["suspect"]["name"]}
-Personalidade: {npc_context["suspect"]["personality"]}
-Postura Atual com o Detetive: {render_context.npc_stance.upper()}
-
-=== CONTEXTO DO CASO (SUA VISÃO) ===
-História Pública:
-{npc_context["case"]["description"]}
+    mode_rule = mode_instructions.get(render_context.response_mode.value, mode_instructions["neutral_answer"])
 
+    return f"""
 === DIRETRIZES DE ESTADO DO JOGO (OBRIGATÓRIO) ===
+Postura Atual com o Detetive: {render_context.npc_stance.upper()}
 Modo de Resposta: {mode_rule}
 
 === O QUE VOCÊ PODE FALAR (FATOS PERMITIDOS) ===
@@ -54,19 +121,27 @@ Conhecimento do Cenário (Já Revelado Anteriormente):
 
 Novo Conhecimento a Revelar NESTE TURNO (PRIORIDADE ALTA PARA MENCIONAR AGORA, SÓ FALE SE RELACIONADO À PERGUNTA):
 {new_knowledge_str}
-
-=== REGRAS ABSOLUTAS ===
-- NUNCA invente fatos novos.
-- NUNCA revele fatos que não estão listados em "O QUE VOCÊ PODE FALAR".
-- Se o detetive perguntar de algo não listado, seja evasivo ou negue.
-- Se o Modo de Resposta for "final_phrase", retorne apenas a sua frase final e encerre.
 """.strip()
 
-    messages = [{"role": "system", "content": system_prompt}]
 
-    for msg in chat_history[-10:]:
+def build_npc_prompt(
+    npc_context,
+    chat_history,
+    render_context: NpcResponseRenderContext
+):
+    messages = [{"role": "system", "content": get_static_prompt_prefix(npc_context)}]
+
+    summary = npc_context.get("conversation_summary")
+    if summary:
+        messages.append({
+            "role": "system",
+            "content": f"=== RESUMO DA CONVERSA ATÉ AQUI (turnos anteriores) ===\n{summary}"
+        })
+
+    for msg in chat_history[-PROMPT_HISTORY_WINDOW:]:
         role = "assistant" if msg["sender"] == "npc" else "user"
         messages.append({"role": role, "content": msg["text"]})
 
-    return messages
+    messages.append({"role": "system", "content": build_turn_directives(render_context)})
 
+    return messages
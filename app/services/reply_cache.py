@@ -0,0 +1,166 @@
+"""
+NPC reply cache.
+
+Many turns render to exactly the same prompt inputs (same suspect, same
+render context, same recent history), so their model replies can be reused.
+Replies are stored under a canonical hash of those inputs with LRU + TTL
+eviction, in memory or in a local SQLite file (shared by worker processes).
+
+Enabled with REPLY_CACHE_BACKEND ("memory" or "sqlite"); see CachedNpcAIAdapter.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.api.schemas.render_context import NpcResponseRenderContext
+
+
+def build_reply_cache_key(
+    suspect_state: Dict[str, Any],
+    chat_history: List[Dict[str, Any]],
+    player_message: Dict[str, Any],
+    render_context: NpcResponseRenderContext,
+    npc_context: Optional[Dict[str, Any]] = None,
+    history_turns: Optional[int] = None
+) -> str:
+    """
+    Canonical hash of everything that shapes a reply: scenario (and catalog
+    version), suspect, render context, the player message, the rolling
+    conversation summary and the last `history_turns` history messages
+    (None = all of them; timestamps excluded).
+
+    `history_turns` must cover the window the prompt reads, or two different
+    prompts would share a key.
+    """
+    context = npc_context or {}
+    case = context.get("case", {})
+    if history_turns is None:
+        recent = chat_history
+    else:
+        recent = chat_history[-history_turns:] if history_turns > 0 else []
+
+    material = {
+        "scenario": [case.get("id"), case.get("version")],
+        "suspect": suspect_state.get("suspect_id"),
+        "render_context": render_context.model_dump(mode="json"),
+        "player_message": [player_message.get("text"), player_message.get("evidence_id")],
+        "summary": context.get("conversation_summary"),
+        "history": [[m.get("sender"), m.get("text"), m.get("evidence_id")] for m in recent]
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ReplyCacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached reply, or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, reply: str) -> None:
+        """Stores a reply, evicting expired / least recently used entries."""
+
+
+class InMemoryReplyCache(ReplyCacheBackend):
+    def __init__(
+        self,
+        max_entries: int = settings.REPLY_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = settings.REPLY_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            reply, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return reply
+
+    def set(self, key: str, reply: str) -> None:
+        with self._lock:
+            self._entries[key] = (reply, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SqliteReplyCache(ReplyCacheBackend):
+    """SQLite-file backend; survives restarts and is shared across processes."""
+
+    def __init__(
+        self,
+        path: str = settings.REPLY_CACHE_SQLITE_PATH,
+        max_entries: int = settings.REPLY_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = settings.REPLY_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.time
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS npc_reply_cache ("
+            " key TEXT PRIMARY KEY,"
+            " reply TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_npc_reply_cache_last_used ON npc_reply_cache (last_used)"
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT reply, expires_at FROM npc_reply_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM npc_reply_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE npc_reply_cache SET last_used = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key: str, reply: str) -> None:
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO npc_reply_cache (key, reply, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, reply, now + self.ttl_seconds, now)
+            )
+            self._conn.execute("DELETE FROM npc_reply_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM npc_reply_cache WHERE key IN ("
+                " SELECT key FROM npc_reply_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+
+def get_reply_cache() -> Optional[ReplyCacheBackend]:
+    """Builds the backend selected by REPLY_CACHE_BACKEND (None when disabled)."""
+    backend = settings.REPLY_CACHE_BACKEND.lower()
+    if backend == "memory":
+        return InMemoryReplyCache()
+    if backend == "sqlite":
+        return SqliteReplyCache()
+    return None
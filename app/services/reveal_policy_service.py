@@ -1,8 +1,11 @@
 from typing import List, Dict, Any, Optional
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from app.services.session_service import get_suspect_state
-from app.services.topic_state_service import get_topic_state
-from app.infra.db_models import SessionModel, SuspectModel, SessionSuspectKnowledgeStateModel
+from app.services.topic_state_service import default_topic_state, get_topic_state, serialize_topic_state
+from app.services.scenario_catalog import get_catalog_for_suspect
+from app.services.turn_snapshot import TurnSnapshot
+from app.infra.db_models import SessionSuspectKnowledgeStateModel, SessionSuspectTopicStateModel
 from app.infra.db import SessionLocal
 
 
@@ -64,20 +67,123 @@ def evaluate_reveal_layer(
     return min(allowed_layer, max_layers)
 
 
+def _load_topic_states(
+    session_id: int,
+    suspect_id: int,
+    topic_ids: List[str],
+    db: Session,
+    snapshot: Optional[TurnSnapshot]
+) -> Dict[str, Dict[str, Any]]:
+    """States of the given topics, in one query (or from the turn snapshot)."""
+    if snapshot is not None:
+        return {t: get_topic_state(session_id, suspect_id, t, snapshot=snapshot) for t in topic_ids}
+
+    rows = db.query(SessionSuspectTopicStateModel).filter(
+        SessionSuspectTopicStateModel.session_id == session_id,
+        SessionSuspectTopicStateModel.suspect_id == suspect_id,
+        SessionSuspectTopicStateModel.topic_id.in_(topic_ids)
+    ).all()
+    states = {row.topic_id: serialize_topic_state(row) for row in rows}
+    return {t: states.get(t) or default_topic_state(t) for t in topic_ids}
+
+
+def _load_knowledge_depths(
+    session_id: int,
+    suspect_id: int,
+    knowledge_ids: List[str],
+    db: Session,
+    snapshot: Optional[TurnSnapshot]
+) -> Dict[str, int]:
+    """Revealed depth of the given knowledge items, in one query (or from the snapshot)."""
+    if snapshot is not None:
+        states = [snapshot.get_knowledge_state(k) for k in knowledge_ids]
+        return {k.knowledge_id: k.max_revealed_depth for k in states if k is not None}
+
+    if not knowledge_ids:
+        return {}
+
+    rows = db.query(
+        SessionSuspectKnowledgeStateModel.knowledge_id,
+        SessionSuspectKnowledgeStateModel.max_revealed_depth
+    ).filter(
+        SessionSuspectKnowledgeStateModel.session_id == session_id,
+        SessionSuspectKnowledgeStateModel.suspect_id == suspect_id,
+        SessionSuspectKnowledgeStateModel.knowledge_id.in_(knowledge_ids)
+    ).all()
+    return {knowledge_id: depth or 0 for knowledge_id, depth in rows}
+
+
+def _save_knowledge_depths(
+    session_id: int,
+    suspect_id: int,
+    new_depths: Dict[str, int],
+    db: Session,
+    snapshot: Optional[TurnSnapshot]
+) -> None:
+    """
+    Persists the new revealed depths. With a snapshot the loaded rows are
+    updated in memory (written by its flush); otherwise all of them go in
+    one batched upsert.
+    """
+    if not new_depths:
+        return
+
+    if snapshot is not None:
+        for knowledge_id, depth in new_depths.items():
+            k_state = snapshot.get_knowledge_state(knowledge_id)
+            if k_state is None:
+                snapshot.add_knowledge_state(SessionSuspectKnowledgeStateModel(
+                    session_id=session_id,
+                    suspect_id=suspect_id,
+                    knowledge_id=knowledge_id,
+                    max_revealed_depth=depth
+                ))
+            else:
+                k_state.max_revealed_depth = depth
+        return
+
+    rows = [
+        {"session_id": session_id, "suspect_id": suspect_id, "knowledge_id": k, "max_revealed_depth": depth}
+        for k, depth in new_depths.items()
+    ]
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(SessionSuspectKnowledgeStateModel)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["session_id", "suspect_id", "knowledge_id"],
+                set_={"max_revealed_depth": stmt.excluded.max_revealed_depth}
+            ),
+            rows
+        )
+    else:
+        for row in rows:
+            db.merge(SessionSuspectKnowledgeStateModel(**row))
+        db.flush()
+
+
 def get_allowed_knowledge_facts(
     session_id: int, 
     suspect_id: int, 
     detected_topics: List[str], 
-    db: Optional[Session] = None
+    db: Optional[Session] = None,
+    snapshot: Optional[TurnSnapshot] = None
 ) -> Dict[str, List[str]]:
     """
-    Iterates through all knowledge items of the suspect matching detected topics,
-    evaluates their allowed layer, and categorizes facts as known or new.
+    Evaluates the allowed layer of every knowledge item of the suspect on the
+    detected topics, and categorizes facts as known or new.
+
+    Items are looked up in the catalog's per-topic index; topic states and
+    knowledge states are fetched with one query each and new depths are
+    written back in one batched upsert. With a turn snapshot, states are read
+    from it and new depths are left for its flush.
     """
     close_session = False
     if db is None:
-        db = SessionLocal()
-        close_session = True
+        db = snapshot.db if snapshot is not None else SessionLocal()
+        close_session = snapshot is None
         
     result = {
         "known_knowledge": [],
@@ -85,65 +191,43 @@ def get_allowed_knowledge_facts(
     }
 
     try:
-        suspect = db.query(SuspectModel).filter(SuspectModel.id == suspect_id).first()
-        if not suspect or not suspect.knowledge_items:
+        _, suspect = get_catalog_for_suspect(suspect_id, db)
+
+        # We only evaluate facts for topics the player is currently asking about
+        topic_ids = [t for t in dict.fromkeys(detected_topics) if t in suspect.knowledge_by_topic]
+        if not topic_ids:
             return result
 
-        suspect_state = get_suspect_state(session_id, suspect_id, db)
-        
-        for k_item in suspect.knowledge_items:
-            # We only evaluate facts for topics the player is currently asking about
-            if k_item.get("topic_id") in detected_topics:
-                # Get the state of this specifically demanded topic
-                knowledge_id = k_item.get("id")
-                try:
-                    topic_state = get_topic_state(session_id, suspect_id, k_item["topic_id"], db)
-                except Exception:
-                    # If topic state isn't found for some edge case, assume untouched defaults
-                    topic_state = {"status": "untouched", "times_touched": 0, "sensitive_heat": 0.0}
-
-                allowed_depth = evaluate_reveal_layer(k_item, suspect_state, topic_state)
-                
-                if allowed_depth > 0:
-                    layers = k_item.get("content_layers", [])
-                    max_available = len(layers)
-                    
-                    # Fetch persistence of knowledge state
-                    k_state = None
-                    if knowledge_id:
-                        k_state = db.query(SessionSuspectKnowledgeStateModel).filter(
-                            SessionSuspectKnowledgeStateModel.session_id == session_id,
-                            SessionSuspectKnowledgeStateModel.suspect_id == suspect_id,
-                            SessionSuspectKnowledgeStateModel.knowledge_id == str(knowledge_id)
-                        ).first()
-                        
-                    current_depth = k_state.max_revealed_depth if k_state else 0
-                    
-                    allowed_clamped = min(allowed_depth, max_available)
-                    
-                    # Known knowledge (already revealed up to current_depth)
-                    for i in range(min(current_depth, allowed_clamped)):
-                        result["known_knowledge"].append(layers[i])
-                        
-                    # New knowledge
-                    if allowed_clamped > current_depth:
-                        for i in range(current_depth, allowed_clamped):
-                            result["new_knowledge_this_turn"].append(layers[i])
-                            
-                        # Persist new depth
-                        if knowledge_id:
-                            if not k_state:
-                                k_state = SessionSuspectKnowledgeStateModel(
-                                    session_id=session_id,
-                                    suspect_id=suspect_id,
-                                    knowledge_id=str(knowledge_id),
-                                    max_revealed_depth=allowed_clamped
-                                )
-                                db.add(k_state)
-                            else:
-                                k_state.max_revealed_depth = allowed_clamped
-                            # flush is fine, but overall transaction commits at turn level
-                            db.flush()
+        items = [k_item for t in topic_ids for k_item in suspect.knowledge_by_topic[t]]
+
+        suspect_state = get_suspect_state(session_id, suspect_id, db, snapshot=snapshot)
+        topic_states = _load_topic_states(session_id, suspect_id, topic_ids, db, snapshot)
+        knowledge_ids = [str(k["id"]) for k in items if k.get("id")]
+        depths = _load_knowledge_depths(session_id, suspect_id, knowledge_ids, db, snapshot)
+
+        new_depths: Dict[str, int] = {}
+
+        for k_item in items:
+            allowed_depth = evaluate_reveal_layer(k_item, suspect_state, topic_states[k_item["topic_id"]])
+            if allowed_depth <= 0:
+                continue
+
+            layers = k_item.get("content_layers", [])
+            knowledge_id = str(k_item["id"]) if k_item.get("id") else None
+            current_depth = depths.get(knowledge_id, 0) if knowledge_id else 0
+
+            allowed_clamped = min(allowed_depth, len(layers))
+
+            # Known knowledge (already revealed up to current_depth)
+            result["known_knowledge"].extend(layers[:min(current_depth, allowed_clamped)])
+
+            # New knowledge
+            if allowed_clamped > current_depth:
+                result["new_knowledge_this_turn"].extend(layers[current_depth:allowed_clamped])
+                if knowledge_id:
+                    new_depths[knowledge_id] = allowed_clamped
+
+        _save_knowledge_depths(session_id, suspect_id, new_depths, db, snapshot)
 
         return result
     finally:
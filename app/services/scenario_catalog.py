@@ -0,0 +1,336 @@
+"""
+Immutable in-process cache of scenario data.
+
+Scenarios, suspects, evidences and secrets never change after
+`load_scenario_from_json`, so the interrogation turn path reads them from a
+frozen `ScenarioCatalog` instead of querying the database on every turn.
+Only mutable session state (sessions, suspect/topic/knowledge states, chat
+messages) still goes to the database.
+
+Catalogs are built lazily on first access (or eagerly by `warm_scenario_catalog`
+at bootstrap) and are dropped by `invalidate_scenario_catalog` whenever a
+scenario is (re)loaded.
+"""
+
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.infra.db_models import ScenarioModel, SuspectModel, EvidenceModel, SecretModel
+from app.core.exceptions import NotFoundError
+from app.core.metrics import record_cache_lookup
+from app.services.topic_matcher import TopicMatcher
+
+
+@dataclass(frozen=True)
+class CatalogSecret:
+    id: int
+    suspect_id: int
+    evidence_id: int
+    content: str
+    is_core: bool
+    bit_index: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class CatalogEvidence:
+    id: int
+    scenario_id: int
+    name: str
+    description: Optional[str]
+    related_topic_id: Optional[str]
+    bit_index: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class SecretIndex:
+    """
+    Bitset view of a suspect's secrets: each secret is one bit (its stored
+    `bit_index`, or its position in id order), so reveal checks and progress
+    are integer mask operations instead of scans over every secret.
+
+    Progress counts core secrets, or every secret when the suspect has no
+    core ones; a suspect without secrets is always at 1.0.
+    """
+    by_bit: Mapping[int, Any]          # bit position -> secret
+    bits: Mapping[int, int]            # secret id -> bit position
+    evidence_masks: Mapping[int, int]  # evidence id -> secrets it reveals
+    progress_mask: int
+
+    @classmethod
+    def build(cls, secrets: Iterable[Any], bits: Optional[Mapping[int, int]] = None) -> "SecretIndex":
+        secrets = tuple(secrets)
+        if bits is None:
+            bits = {secret.id: position for position, secret in enumerate(secrets)}
+
+        evidence_masks: Dict[int, int] = {}
+        core_mask = 0
+        all_mask = 0
+        for secret in secrets:
+            bit = 1 << bits[secret.id]
+            evidence_masks[secret.evidence_id] = evidence_masks.get(secret.evidence_id, 0) | bit
+            all_mask |= bit
+            if secret.is_core:
+                core_mask |= bit
+
+        return cls(
+            by_bit=MappingProxyType({bits[secret.id]: secret for secret in secrets}),
+            bits=MappingProxyType(dict(bits)),
+            evidence_masks=MappingProxyType(evidence_masks),
+            progress_mask=core_mask or all_mask
+        )
+
+    def mask_of(self, secret_ids: Iterable[int]) -> int:
+        """Mask of the given secret ids; ids of other suspects are ignored."""
+        mask = 0
+        for secret_id in secret_ids:
+            bit = self.bits.get(secret_id)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def secrets_in(self, mask: int) -> List[Any]:
+        """Secrets of a mask, in bit order; bits of removed secrets are skipped."""
+        found = []
+        while mask:
+            lowest = mask & -mask
+            secret = self.by_bit.get(lowest.bit_length() - 1)
+            if secret is not None:
+                found.append(secret)
+            mask ^= lowest
+        return found
+
+    def progress(self, revealed_mask: int) -> float:
+        if not self.progress_mask:
+            return 1.0
+        return (revealed_mask & self.progress_mask).bit_count() / self.progress_mask.bit_count()
+
+
+@dataclass(frozen=True)
+class CatalogSuspect:
+    id: int
+    scenario_id: int
+    name: str
+    backstory: Optional[str]
+    personality: Optional[str]
+    initial_statement: Optional[str]
+    final_phrase: Optional[str]
+    knowledge_items: Tuple[Mapping[str, Any], ...]
+    knowledge_by_topic: Mapping[str, Tuple[Mapping[str, Any], ...]]
+    secrets: Tuple[CatalogSecret, ...]
+    secrets_by_evidence: Mapping[int, Tuple[CatalogSecret, ...]]
+    secret_index: SecretIndex
+
+
+@dataclass(frozen=True)
+class ScenarioCatalog:
+    """
+    Read-only snapshot of a scenario and everything that hangs off it,
+    indexed by id. `version` changes every time the cache is invalidated.
+    """
+    id: int
+    title: str
+    description: Optional[str]
+    case_summary: Optional[str]
+    culprit_id: Optional[int]
+    required_evidence_ids: Tuple[int, ...]
+    topics: Tuple[Mapping[str, Any], ...]
+    suspects: Mapping[int, CatalogSuspect]
+    evidences: Mapping[int, CatalogEvidence]
+    secrets: Mapping[int, CatalogSecret]
+    topic_matcher: TopicMatcher
+    version: int
+
+    def get_suspect(self, suspect_id: int) -> Optional[CatalogSuspect]:
+        return self.suspects.get(suspect_id)
+
+    def get_evidence(self, evidence_id: int) -> Optional[CatalogEvidence]:
+        return self.evidences.get(evidence_id)
+
+
+_lock = threading.Lock()
+_catalogs: Dict[int, ScenarioCatalog] = {}
+_suspect_scenarios: Dict[int, int] = {}
+_version = 0
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively converts JSON values (dict/list) into read-only equivalents."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _secret_bits(secrets: Tuple[CatalogSecret, ...]) -> Optional[Dict[int, int]]:
+    """Stored bit indexes, or None (positional bits) for rows loaded before they existed."""
+    if any(sc.bit_index is None for sc in secrets):
+        return None
+    return {sc.id: sc.bit_index for sc in secrets}
+
+
+def _build_catalog(scenario_id: int, version: int, db: Session) -> ScenarioCatalog:
+    scenario = db.query(ScenarioModel).filter(ScenarioModel.id == scenario_id).first()
+    if not scenario:
+        raise NotFoundError(f"Scenario with id {scenario_id} does not exist.")
+
+    suspect_rows = db.query(SuspectModel).filter(SuspectModel.scenario_id == scenario_id).all()
+    evidence_rows = db.query(EvidenceModel).filter(EvidenceModel.scenario_id == scenario_id).all()
+
+    suspect_ids = [s.id for s in suspect_rows]
+    secret_rows = (
+        db.query(SecretModel)
+        .filter(SecretModel.suspect_id.in_(suspect_ids))
+        .order_by(SecretModel.id.asc())
+        .all()
+        if suspect_ids else []
+    )
+
+    secrets = {
+        sc.id: CatalogSecret(
+            id=sc.id,
+            suspect_id=sc.suspect_id,
+            evidence_id=sc.evidence_id,
+            content=sc.content,
+            is_core=bool(sc.is_core),
+            bit_index=sc.bit_index
+        )
+        for sc in secret_rows
+    }
+
+    secrets_by_suspect: Dict[int, list] = {}
+    for sc in secrets.values():
+        secrets_by_suspect.setdefault(sc.suspect_id, []).append(sc)
+
+    suspects = {}
+    for s in suspect_rows:
+        own_secrets = tuple(secrets_by_suspect.get(s.id, []))
+        by_evidence: Dict[int, list] = {}
+        for sc in own_secrets:
+            by_evidence.setdefault(sc.evidence_id, []).append(sc)
+
+        knowledge_items = _freeze(s.knowledge_items or [])
+        by_topic: Dict[str, list] = {}
+        for item in knowledge_items:
+            by_topic.setdefault(item.get("topic_id"), []).append(item)
+
+        suspects[s.id] = CatalogSuspect(
+            id=s.id,
+            scenario_id=s.scenario_id,
+            name=s.name,
+            backstory=s.backstory,
+            personality=s.personality,
+            initial_statement=s.initial_statement,
+            final_phrase=s.final_phrase,
+            knowledge_items=knowledge_items,
+            knowledge_by_topic=MappingProxyType({k: tuple(v) for k, v in by_topic.items()}),
+            secrets=own_secrets,
+            secrets_by_evidence=MappingProxyType({k: tuple(v) for k, v in by_evidence.items()}),
+            secret_index=SecretIndex.build(own_secrets, _secret_bits(own_secrets))
+        )
+
+    evidences = {
+        e.id: CatalogEvidence(
+            id=e.id,
+            scenario_id=e.scenario_id,
+            name=e.name,
+            description=e.description,
+            related_topic_id=e.related_topic_id,
+            bit_index=e.bit_index
+        )
+        for e in evidence_rows
+    }
+
+    topics = _freeze(scenario.topics or [])
+
+    return ScenarioCatalog(
+        id=scenario.id,
+        title=scenario.title,
+        description=scenario.description,
+        case_summary=scenario.case_summary,
+        culprit_id=scenario.culprit_id,
+        required_evidence_ids=tuple(scenario.required_evidence_ids or []),
+        topics=topics,
+        suspects=MappingProxyType(suspects),
+        evidences=MappingProxyType(evidences),
+        secrets=MappingProxyType(secrets),
+        topic_matcher=TopicMatcher(topics),
+        version=version
+    )
+
+
+def get_scenario_catalog(scenario_id: int, db: Session) -> ScenarioCatalog:
+    """
+    Returns the cached catalog for a scenario, building it from the database
+    on first access. Raises NotFoundError if the scenario does not exist.
+    """
+    catalog = _catalogs.get(scenario_id)
+    record_cache_lookup("scenario_catalog", catalog is not None)
+    if catalog is not None:
+        return catalog
+
+    version = _version
+    catalog = _build_catalog(scenario_id, version, db)
+
+    with _lock:
+        # A reload may have happened while we were reading; never cache stale data.
+        if version != _version:
+            return catalog
+        cached = _catalogs.setdefault(scenario_id, catalog)
+        for suspect_id in cached.suspects:
+            _suspect_scenarios[suspect_id] = scenario_id
+
+    return cached
+
+
+def get_catalog_for_suspect(suspect_id: int, db: Session) -> Tuple[ScenarioCatalog, CatalogSuspect]:
+    """
+    Resolves the scenario catalog a suspect belongs to, together with the
+    suspect's catalog entry. Costs at most one query on a cold cache.
+    """
+    scenario_id = _suspect_scenarios.get(suspect_id)
+    if scenario_id is None:
+        row = db.query(SuspectModel.scenario_id).filter(SuspectModel.id == suspect_id).first()
+        if not row:
+            raise NotFoundError(f"Suspect {suspect_id} not found.")
+        scenario_id = row[0]
+
+    catalog = get_scenario_catalog(scenario_id, db)
+    suspect = catalog.get_suspect(suspect_id)
+    if suspect is None:
+        raise NotFoundError(f"Suspect {suspect_id} not found.")
+
+    return catalog, suspect
+
+
+def invalidate_scenario_catalog(scenario_id: Optional[int] = None) -> None:
+    """
+    Drops cached catalogs (one scenario, or all of them when scenario_id is None)
+    and bumps the catalog version. Must be called after a scenario is (re)loaded.
+    """
+    global _version
+    with _lock:
+        _version += 1
+        if scenario_id is None:
+            _catalogs.clear()
+            _suspect_scenarios.clear()
+            return
+
+        _catalogs.pop(scenario_id, None)
+        for suspect_id in [k for k, v in _suspect_scenarios.items() if v == scenario_id]:
+            del _suspect_scenarios[suspect_id]
+
+
+def warm_scenario_catalog(db: Session) -> int:
+    """
+    Eagerly builds the catalog of every scenario in the database.
+    Returns the number of cached scenarios.
+    """
+    scenario_ids = [row[0] for row in db.query(ScenarioModel.id).all()]
+    for scenario_id in scenario_ids:
+        get_scenario_catalog(scenario_id, db)
+    return len(scenario_ids)
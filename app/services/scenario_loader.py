@@ -1,16 +1,409 @@
+import hashlib
 import json
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.domain.schema_scenario import ScenarioConfig
+from app.infra import db as db_module
 from app.infra.db import SessionLocal
 from app.infra.db_models import (
     ScenarioModel,
+    SessionModel,
     SuspectModel,
     EvidenceModel,
-    SecretModel
+    SecretModel,
+    SessionSuspectStateModel,
+    SessionEvidenceUsageModel,
+    NpcChatMessageModel
 )
 from app.core.exceptions import DomainError
+from app.services.scenario_catalog import invalidate_scenario_catalog
+from app.services.session_overview_service import invalidate_scenario_overviews
+from app.services.scenario_catalog import SecretIndex
+from app.services.compact_state import decode_mask, get_revealed_mask, is_compact, used_evidence_ids_from_mask
+from app.services.session_service import initial_suspect_state
+
+# Bump when the way a scenario file maps to rows changes, so every stored
+# scenario is re-synced on the next startup / reload.
+SCENARIO_SCHEMA_VERSION = 1
+
+SYNC_CREATED = "created"
+SYNC_UPDATED = "updated"
+SYNC_UNCHANGED = "unchanged"
+
+
+def compute_scenario_hash(data: dict) -> str:
+    """sha256 of the scenario JSON in canonical form (key order and whitespace ignored)."""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _read_scenario_file(path: str) -> Tuple[dict, ScenarioConfig]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data, ScenarioConfig(**data)
+
+
+def _validate_references(config: ScenarioConfig) -> None:
+    suspect_names = {s.name for s in config.suspects}
+    evidence_names = {e.name for e in config.evidences}
+
+    if config.culprit not in suspect_names:
+        raise DomainError(
+            f"Culprit '{config.culprit}' not found among suspects."
+        )
+
+    for sec in config.secrets:
+        if sec.suspect not in suspect_names:
+            raise DomainError(
+                f"Secret references unknown suspect '{sec.suspect}'"
+            )
+
+        if sec.evidence not in evidence_names:
+            raise DomainError(
+                f"Secret references unknown evidence '{sec.evidence}'"
+            )
+
+
+def _suspect_fields(s) -> dict:
+    return {
+        "name": s.name,
+        "backstory": s.backstory,
+        "personality": s.personality,
+        "initial_statement": s.initial_statement,
+        "final_phrase": s.final_phrase,
+        "true_timeline": s.true_timeline,
+        "lies": [lie.model_dump() for lie in s.lies] if s.lies else None,
+        "knowledge_items": [k.model_dump() for k in s.knowledge] if s.knowledge else []
+    }
+
+
+def _evidence_fields(e) -> dict:
+    return {
+        "name": e.name,
+        "description": e.description,
+        "related_topic_id": e.related_topic_id
+    }
+
+
+def _scenario_fields(config: ScenarioConfig) -> dict:
+    return {
+        "description": config.description,
+        "case_summary": config.case_summary,
+        "topics": [t.model_dump() for t in config.topics] if config.topics else []
+    }
+
+
+def _bulk_insert_returning_ids(db: Session, model, rows: List[dict]) -> Dict[str, int]:
+    """
+    Inserts all rows of a table in one batched INSERT ... RETURNING and
+    returns a name -> id map (later duplicates win, as with per-row inserts).
+
+    Rows are matched back by the returned name, so RETURNING order does not
+    matter (asking for it makes SQLite fall back to one INSERT per row).
+    """
+    if not rows:
+        return {}
+
+    result = db.execute(insert(model).returning(model.id, model.name), rows)
+    return {name: row_id for row_id, name in sorted(result.all())}
+
+
+def _create_scenario(config: ScenarioConfig, content_hash: str, db: Session) -> ScenarioModel:
+    # -------------------------
+    # 1. Create Scenario
+    # -------------------------
+    scenario = ScenarioModel(
+        title=config.title,
+        content_hash=content_hash,
+        schema_version=SCENARIO_SCHEMA_VERSION,
+        **_scenario_fields(config)
+    )
+    db.add(scenario)
+    db.flush()
+
+    # -------------------------
+    # 2. Insert Suspects and Evidence (one batched INSERT ... RETURNING each)
+    # -------------------------
+    suspect_map = _bulk_insert_returning_ids(db, SuspectModel, [
+        {"scenario_id": scenario.id, **_suspect_fields(s)} for s in config.suspects
+    ])
+
+    evidence_map = _bulk_insert_returning_ids(db, EvidenceModel, [
+        {"scenario_id": scenario.id, "bit_index": bit, **_evidence_fields(e)}
+        for bit, e in enumerate(config.evidences)
+    ])
+
+    # -------------------------
+    # 3. Verdict rules (T24.5) and culprit
+    # -------------------------
+    scenario.required_evidence_ids = [
+        evidence_map[e.name] for e in config.evidences if e.is_mandatory
+    ]
+    scenario.culprit_id = suspect_map[config.culprit]
+
+    # -------------------------
+    # 4. Insert Secrets (ids resolved from the in-memory maps)
+    # -------------------------
+    # Dense bit index per suspect, in file order (compact session state)
+    next_bit: Dict[int, int] = {}
+    secret_rows = []
+    for sec in config.secrets:
+        suspect_id = suspect_map[sec.suspect]
+        bit = next_bit.get(suspect_id, 0)
+        next_bit[suspect_id] = bit + 1
+        secret_rows.append({
+            "suspect_id": suspect_id,
+            "evidence_id": evidence_map[sec.evidence],
+            "content": sec.content,
+            "is_core": sec.is_core,
+            "bit_index": bit
+        })
+
+    if secret_rows:
+        db.execute(insert(SecretModel), secret_rows)
+
+    return scenario
+
+
+def _names_by_id(rows) -> Dict[int, str]:
+    return {row.id: row.name for row in rows}
+
+
+def _assign_fields(obj, fields: dict) -> None:
+    """Sets only the attributes whose value changed, so untouched rows are not UPDATEd."""
+    for key, value in fields.items():
+        if getattr(obj, key) != value:
+            setattr(obj, key, value)
+
+
+def _next_bit_index(rows) -> int:
+    return max((r.bit_index for r in rows if r.bit_index is not None), default=-1) + 1
+
+
+def _apply_scenario_diff(scenario: ScenarioModel, config: ScenarioConfig, content_hash: str, db: Session) -> None:
+    """
+    Brings an existing scenario in line with `config` touching only what changed.
+
+    Suspects and evidences are matched by name and secrets by
+    (suspect, evidence, position), so surviving rows keep their ids and
+    in-flight sessions (suspect states, revealed secrets, evidence usages,
+    chat history) stay valid. Removing a suspect, evidence or secret that a
+    session already references is refused with a DomainError. Existing
+    sessions are then brought in line too (see `_sync_session_states`).
+    """
+    # -------------------------
+    # 1. Suspects
+    # -------------------------
+    suspects = {s.name: s for s in db.query(SuspectModel).filter(SuspectModel.scenario_id == scenario.id)}
+    wanted_suspects = {s.name: s for s in config.suspects}
+
+    removed_suspects = [s for name, s in suspects.items() if name not in wanted_suspects]
+    if removed_suspects:
+        removed_ids = [s.id for s in removed_suspects]
+        in_use = (
+            db.query(SessionSuspectStateModel.suspect_id)
+            .filter(SessionSuspectStateModel.suspect_id.in_(removed_ids))
+            .first()
+        )
+        if in_use:
+            raise DomainError(
+                f"Cannot remove suspect '{_names_by_id(removed_suspects)[in_use[0]]}': it is used by existing sessions."
+            )
+
+    for name, s in wanted_suspects.items():
+        if name in suspects:
+            _assign_fields(suspects[name], _suspect_fields(s))
+        else:
+            suspects[name] = SuspectModel(scenario_id=scenario.id, **_suspect_fields(s))
+            db.add(suspects[name])
+
+    # -------------------------
+    # 2. Evidences
+    # -------------------------
+    evidences = {e.name: e for e in db.query(EvidenceModel).filter(EvidenceModel.scenario_id == scenario.id)}
+    wanted_evidences = {e.name: e for e in config.evidences}
+
+    removed_evidences = [e for name, e in evidences.items() if name not in wanted_evidences]
+    if removed_evidences:
+        removed_ids = [e.id for e in removed_evidences]
+        in_use = (
+            db.query(SessionEvidenceUsageModel.evidence_id)
+            .filter(SessionEvidenceUsageModel.evidence_id.in_(removed_ids))
+            .first()
+            or db.query(NpcChatMessageModel.evidence_id)
+            .filter(NpcChatMessageModel.evidence_id.in_(removed_ids))
+            .first()
+        )
+        if not in_use:
+            # Compact states record usage in a bitmask instead of rows
+            compact_states = (
+                db.query(SessionSuspectStateModel)
+                .filter(
+                    SessionSuspectStateModel.suspect_id.in_([s.id for s in suspects.values() if s.id]),
+                    SessionSuspectStateModel.used_evidence_mask.isnot(None)
+                )
+                .all()
+            )
+            used = {ev_id for state in compact_states for ev_id in used_evidence_ids_from_mask(state, removed_evidences)}
+            in_use = (min(used),) if used else None
+        if in_use:
+            raise DomainError(
+                f"Cannot remove evidence '{_names_by_id(removed_evidences)[in_use[0]]}': it is used by existing sessions."
+            )
+
+    next_evidence_bit = _next_bit_index(evidences.values())
+    for name, e in wanted_evidences.items():
+        if name in evidences:
+            _assign_fields(evidences[name], _evidence_fields(e))
+        else:
+            evidences[name] = EvidenceModel(scenario_id=scenario.id, bit_index=next_evidence_bit, **_evidence_fields(e))
+            next_evidence_bit += 1
+            db.add(evidences[name])
+
+    db.flush()
+
+    # -------------------------
+    # 3. Secrets
+    # -------------------------
+    suspect_ids = [s.id for s in suspects.values()]
+    existing_secrets: Dict[Tuple[int, int], List[SecretModel]] = {}
+    for sc in (
+        db.query(SecretModel)
+        .filter(SecretModel.suspect_id.in_(suspect_ids))
+        .order_by(SecretModel.id.asc())
+    ):
+        existing_secrets.setdefault((sc.suspect_id, sc.evidence_id), []).append(sc)
+
+    # Bit indexes of kept secrets never move; new secrets take the next free one
+    next_secret_bit: Dict[int, int] = {}
+    for bucket in existing_secrets.values():
+        for sc in bucket:
+            if sc.bit_index is not None:
+                next_secret_bit[sc.suspect_id] = max(next_secret_bit.get(sc.suspect_id, 0), sc.bit_index + 1)
+
+    for sec in config.secrets:
+        key = (suspects[sec.suspect].id, evidences[sec.evidence].id)
+        bucket = existing_secrets.get(key)
+        if bucket:
+            secret = bucket.pop(0)
+            _assign_fields(secret, {"content": sec.content, "is_core": sec.is_core})
+        else:
+            bit = next_secret_bit.get(key[0], 0)
+            next_secret_bit[key[0]] = bit + 1
+            secret = SecretModel(
+                suspect_id=key[0], evidence_id=key[1], content=sec.content, is_core=sec.is_core, bit_index=bit
+            )
+            db.add(secret)
+
+    removed_secrets = [sc for bucket in existing_secrets.values() for sc in bucket]
+    if removed_secrets:
+        removed_ids = {sc.id for sc in removed_secrets}
+        removed_masks: Dict[int, int] = {}
+        for sc in removed_secrets:
+            if sc.bit_index is not None:
+                removed_masks[sc.suspect_id] = removed_masks.get(sc.suspect_id, 0) | (1 << sc.bit_index)
+
+        states = (
+            db.query(
+                SessionSuspectStateModel.suspect_id,
+                SessionSuspectStateModel.revealed_secret_ids,
+                SessionSuspectStateModel.revealed_secrets_mask
+            )
+            .filter(SessionSuspectStateModel.suspect_id.in_({sc.suspect_id for sc in removed_secrets}))
+            .all()
+        )
+        if any(
+            removed_ids.intersection(revealed_ids or [])
+            or decode_mask(revealed_mask) & removed_masks.get(suspect_id, 0)
+            for suspect_id, revealed_ids, revealed_mask in states
+        ):
+            raise DomainError("Cannot remove secrets already revealed in existing sessions.")
+        for sc in removed_secrets:
+            db.delete(sc)
+
+    for s in removed_suspects:
+        db.delete(s)
+    for e in removed_evidences:
+        db.delete(e)
+
+    db.flush()
+    _sync_session_states(scenario.id, [s.id for s in suspects.values() if s.name in wanted_suspects], db)
+
+    # -------------------------
+    # 4. Scenario fields, verdict rules and culprit
+    # -------------------------
+    _assign_fields(scenario, {
+        **_scenario_fields(config),
+        "required_evidence_ids": [evidences[e.name].id for e in config.evidences if e.is_mandatory],
+        "culprit_id": suspects[config.culprit].id,
+        "content_hash": content_hash,
+        "schema_version": SCENARIO_SCHEMA_VERSION
+    })
+
+
+def _sync_session_states(scenario_id: int, suspect_ids: List[int], db: Session) -> None:
+    """
+    Keeps the scenario's existing sessions consistent with its new content:
+    - suspects added by the reload get a fresh state in every session, in
+      the encoding (compact or not) the session's other states use;
+    - stored progress is recomputed from the new secret set, since added,
+      removed or re-flagged core secrets change it. A state that reaches 1.0
+      is closed, as on a reveal; closed suspects are never reopened.
+    """
+    secrets: Dict[int, List[SecretModel]] = {suspect_id: [] for suspect_id in suspect_ids}
+    for sc in (
+        db.query(SecretModel)
+        .filter(SecretModel.suspect_id.in_(suspect_ids))
+        .order_by(SecretModel.id.asc())
+    ):
+        secrets[sc.suspect_id].append(sc)
+
+    indexes = {}
+    for suspect_id, rows in secrets.items():
+        # Same bit assignment as the scenario catalog
+        bits = None if any(sc.bit_index is None for sc in rows) else {sc.id: sc.bit_index for sc in rows}
+        indexes[suspect_id] = SecretIndex.build(rows, bits)
+
+    states = (
+        db.query(SessionSuspectStateModel)
+        .join(SessionModel, SessionModel.id == SessionSuspectStateModel.session_id)
+        .filter(SessionModel.scenario_id == scenario_id)
+        .all()
+    )
+
+    compact_sessions = set()
+    suspects_by_session: Dict[int, set] = {}
+    for state in states:
+        suspects_by_session.setdefault(state.session_id, set()).add(state.suspect_id)
+        if is_compact(state):
+            compact_sessions.add(state.session_id)
+
+        index = indexes.get(state.suspect_id)
+        if index is None:
+            continue
+        progress = index.progress(get_revealed_mask(state, index))
+        if progress != state.progress:
+            state.progress = progress
+        if progress >= 1.0 and not state.is_closed:
+            state.is_closed = True
+
+    new_states = [
+        initial_suspect_state(
+            session_id,
+            suspect_id,
+            has_secrets=bool(secrets[suspect_id]),
+            compact=session_id in compact_sessions
+        )
+        for session_id, present in suspects_by_session.items()
+        for suspect_id in suspect_ids
+        if suspect_id not in present
+    ]
+    if new_states:
+        db.execute(insert(SessionSuspectStateModel), new_states)
 
 
 def load_scenario_from_json(path: str, db: Optional[Session] = None) -> ScenarioModel:
@@ -18,11 +411,13 @@ def load_scenario_from_json(path: str, db: Optional[Session] = None) -> Scenario
     Loads a scenario from a JSON file, validates it via Pydantic,
     and populates the SQLAlchemy database models.
     Prevents duplication by checking scenario title.
-    
+    Suspects, evidences and secrets are written with one batched INSERT per
+    table, in a single transaction.
+
     Args:
         path (str): Path to the scenario JSON file.
         db (Session, optional): Existing DB session (useful for tests).
-    
+
     Returns:
         ScenarioModel: The scenario model saved in the database.
     """
@@ -34,20 +429,8 @@ def load_scenario_from_json(path: str, db: Optional[Session] = None) -> Scenario
 
     data = {}
     try:
-        # -------------------------
-        # 1. Load JSON
-        # -------------------------
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # -------------------------
-        # 2. Validate with Pydantic
-        # -------------------------
-        config = ScenarioConfig(**data)
-
-        # -------------------------
-        # 3. Check for duplicates
-        # -------------------------
+        data, config = _read_scenario_file(path)
+
         existing = (
             db.query(ScenarioModel)
             .filter(ScenarioModel.title == config.title)
@@ -58,118 +441,127 @@ def load_scenario_from_json(path: str, db: Optional[Session] = None) -> Scenario
             print(f"[loader] Scenario '{config.title}' already exists. Skipping insert.")
             return existing
 
-        # -------------------------
-        # 4. Create Scenario
-        # -------------------------
-        scenario = ScenarioModel(
-            title=config.title,
-            description=config.description,
-            case_summary=config.case_summary,
-            topics=[t.model_dump() for t in config.topics] if config.topics else []
-        )
-        db.add(scenario)
-        db.flush()
-        db.refresh(scenario)
-
-        # Maps for later linking secrets
-        suspect_map = {}
-        evidence_map = {}
-
-        # -------------------------
-        # 5. Insert Suspects
-        # -------------------------
-        for s in config.suspects:
-            suspect = SuspectModel(
-                scenario_id=scenario.id,
-                name=s.name,
-                backstory=s.backstory,
-                personality=s.personality,
-                initial_statement=s.initial_statement,
-                final_phrase=s.final_phrase,
-                true_timeline=s.true_timeline,
-                lies=[lie.dict() for lie in s.lies] if s.lies else None,
-                knowledge_items=[k.model_dump() for k in s.knowledge] if s.knowledge else []
-            )
-            db.add(suspect)
-            db.flush()
-            db.refresh(suspect)
-
-            suspect_map[s.name] = suspect.id
-
-        # -------------------------
-        # 6. Insert Evidence
-        # -------------------------
-        mandatory_evidence_ids = []
-
-        for e in config.evidences:
-            evidence = EvidenceModel(
-                scenario_id=scenario.id,
-                name=e.name,
-                description=e.description,
-                related_topic_id=e.related_topic_id
-            )
-            db.add(evidence)
-            db.flush()
-            db.refresh(evidence)
+        _validate_references(config)
+        scenario = _create_scenario(config, compute_scenario_hash(data), db)
 
-            evidence_map[e.name] = evidence.id
+        db.commit()
+        invalidate_scenario_catalog(scenario.id)
 
-            if e.is_mandatory:
-                mandatory_evidence_ids.append(evidence.id)
+        print(f"[loader] Scenario '{scenario.title}' loaded successfully.")
+        return scenario
+    except Exception as e:
+        db.rollback()
+        print(f"[loader] Transaction failed! Rolling back scenario '{data.get('title', 'Unknown')}'. Reason: {e}")
+        raise
 
-        # -------------------------
-        # 6.5 Persist verdict rules (T24.5)
-        # -------------------------
-        scenario.required_evidence_ids = mandatory_evidence_ids
-        db.flush()
-        db.refresh(scenario)
+    finally:
+        if close_session:
+            db.close()
 
-        # store mandatory evidence IDs inside scenario? (future)
-        # for now we keep culprit only
 
-        # -------------------------
-        # 7. Set culprit
-        # -------------------------
-        if config.culprit not in suspect_map:
-            raise DomainError(
-                f"Culprit '{config.culprit}' not found among suspects."
-            )
+def sync_scenario_from_json(path: str, db: Optional[Session] = None) -> dict:
+    """
+    Creates or incrementally updates the scenario stored for a JSON file.
 
-        scenario.culprit_id = suspect_map[config.culprit]
-        db.flush()
-        db.refresh(scenario)
-
-        # -------------------------
-        # 8. Insert Secrets
-        # -------------------------
-        for sec in config.secrets:
-            if sec.suspect not in suspect_map:
-                raise DomainError(
-                    f"Secret references unknown suspect '{sec.suspect}'"
-                )
+    Scenarios are identified by title. When the stored content hash and
+    schema version match the file nothing is written; otherwise only the
+    changed rows are updated (see `_apply_scenario_diff`) and the scenario
+    catalog is invalidated.
 
-            if sec.evidence not in evidence_map:
-                raise DomainError(
-                    f"Secret references unknown evidence '{sec.evidence}'"
-                )
+    Returns:
+        dict: scenario_id, title and status ("created", "updated" or "unchanged").
+    """
+    close_session = False
 
-            secret = SecretModel(
-                suspect_id=suspect_map[sec.suspect],
-                evidence_id=evidence_map[sec.evidence],
-                content=sec.content,
-                is_core=sec.is_core
-            )
-            db.add(secret)
+    if db is None:
+        db = SessionLocal()
+        close_session = True
+
+    data = {}
+    try:
+        data, config = _read_scenario_file(path)
+        content_hash = compute_scenario_hash(data)
+
+        scenario = (
+            db.query(ScenarioModel)
+            .filter(ScenarioModel.title == config.title)
+            .first()
+        )
+
+        if scenario and scenario.content_hash == content_hash \
+                and scenario.schema_version == SCENARIO_SCHEMA_VERSION:
+            return {"scenario_id": scenario.id, "title": scenario.title, "status": SYNC_UNCHANGED}
+
+        _validate_references(config)
+
+        if scenario is None:
+            scenario = _create_scenario(config, content_hash, db)
+            status = SYNC_CREATED
+        else:
+            _apply_scenario_diff(scenario, config, content_hash, db)
+            invalidate_scenario_overviews(scenario.id, db)
+            status = SYNC_UPDATED
 
         db.commit()
+        invalidate_scenario_catalog(scenario.id)
 
-        print(f"[loader] Scenario '{scenario.title}' loaded successfully.")
-        return scenario
+        print(f"[loader] Scenario '{scenario.title}' {status}.")
+        return {"scenario_id": scenario.id, "title": scenario.title, "status": status}
     except Exception as e:
         db.rollback()
-        print(f"[loader] Transaction failed! Rolling back scenario '{data.get('title', 'Unknown')}'. Reason: {e}")
+        print(f"[loader] Sync failed! Rolling back scenario '{data.get('title', 'Unknown')}'. Reason: {e}")
         raise
 
     finally:
         if close_session:
             db.close()
+
+
+def _init_loader_worker():
+    # Connections inherited from the parent process must not be reused
+    db_module.engine.dispose(close=False)
+
+
+def _load_scenario_file(path: str) -> dict:
+    return {"path": path, **sync_scenario_from_json(path)}
+
+
+def load_scenarios_from_dir(directory: str, workers: int = 1) -> List[dict]:
+    """
+    Syncs every *.json scenario in `directory` (see `sync_scenario_from_json`),
+    one transaction per file.
+
+    With workers > 1 files are loaded by a pool of processes, each with its
+    own DB session; a failing file is rolled back alone and reported with its
+    error instead of aborting the other files. The workers' catalog
+    invalidations only reach their own processes, so the calling process
+    invalidates every returned scenario afterwards.
+
+    Returns:
+        List[dict]: one entry per file, sorted by path, with either
+        "scenario_id"/"title"/"status" or "error".
+    """
+    paths = sorted(str(p) for p in Path(directory).glob("*.json"))
+    results = []
+
+    if workers <= 1:
+        for path in paths:
+            try:
+                results.append(_load_scenario_file(path))
+            except Exception as e:
+                results.append({"path": path, "error": str(e)})
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_loader_worker) as pool:
+        futures = {path: pool.submit(_load_scenario_file, path) for path in paths}
+        for path, future in futures.items():
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({"path": path, "error": str(e)})
+
+    for result in results:
+        if "scenario_id" in result:
+            invalidate_scenario_catalog(result["scenario_id"])
+
+    return results
@@ -2,13 +2,11 @@ from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 
 from app.infra.db import SessionLocal
-from app.infra.db_models import (
-    SecretModel,
-    SessionSuspectStateModel,
-    SuspectModel,
-    EvidenceModel
-)
+from app.infra.db_models import SessionSuspectStateModel
 from app.core.exceptions import NotFoundError
+from app.services.scenario_catalog import get_catalog_for_suspect
+from app.services.turn_snapshot import TurnSnapshot
+from app.services.compact_state import add_revealed_secrets, get_revealed_mask
 
 
 def apply_evidence_to_suspect(
@@ -16,7 +14,8 @@ def apply_evidence_to_suspect(
     suspect_id: int,
     evidence_id: int,
     detected_topics: Optional[List[str]] = None,
-    db: Optional[Session] = None
+    db: Optional[Session] = None,
+    snapshot: Optional[TurnSnapshot] = None
 ) -> Tuple[List[Dict[str, Any]], str]:
     """
     Applies evidence to a suspect:
@@ -24,30 +23,36 @@ def apply_evidence_to_suspect(
       - Reveals secrets associated with that evidence
       - Updates progress
       - If all core secrets are revealed, marks suspect as 'closed'
+    With a turn snapshot, state changes are left for the snapshot flush.
     Returns: (revealed_now_list, evidence_effect_string)
     """
 
     close_session = False
     if db is None:
-        db = SessionLocal()
-        close_session = True
+        db = snapshot.db if snapshot is not None else SessionLocal()
+        close_session = snapshot is None
 
     try:
         # ---------------------------------------
         # 1. Fetch state of suspect in this session
         # ---------------------------------------
-        state = db.query(SessionSuspectStateModel).filter(
-            SessionSuspectStateModel.session_id == session_id,
-            SessionSuspectStateModel.suspect_id == suspect_id
-        ).first()
+        if snapshot is not None:
+            state = snapshot.state
+        else:
+            state = db.query(SessionSuspectStateModel).filter(
+                SessionSuspectStateModel.session_id == session_id,
+                SessionSuspectStateModel.suspect_id == suspect_id
+            ).first()
 
         if not state:
             raise NotFoundError(f"Suspect {suspect_id} not part of session {session_id}.")
 
+        catalog, suspect = get_catalog_for_suspect(suspect_id, db)
+
         # ---------------------------------------
         # Context validation for E1
         # ---------------------------------------
-        evidence = db.query(EvidenceModel).filter(EvidenceModel.id == evidence_id).first()
+        evidence = catalog.get_evidence(evidence_id)
         is_context_valid = True
         
         if evidence and evidence.related_topic_id:
@@ -64,72 +69,40 @@ def apply_evidence_to_suspect(
         # ---------------------------------------
         # 2. Find secrets revealed by this evidence
         # ---------------------------------------
-        secrets = db.query(SecretModel).filter(
-            SecretModel.suspect_id == suspect_id,
-            SecretModel.evidence_id == evidence_id
-        ).all()
+        index = suspect.secret_index
+        evidence_mask = index.evidence_masks.get(evidence_id, 0)
 
-        if not secrets:
+        if not evidence_mask:
             return [], "none"
 
-        revealed_now = []
-
         # ---------------------------------------
         # 3. Reveal secrets (append only new ones)
         # ---------------------------------------
-        for secret in secrets:
-            if secret.id not in state.revealed_secret_ids:
-                state.revealed_secret_ids.append(secret.id)
-                revealed_now.append({
-                    "secret_id": secret.id,
-                    "content": secret.content,
-                    "is_core": secret.is_core
-                })
+        revealed_mask = get_revealed_mask(state, index)
+        new_mask = evidence_mask & ~revealed_mask
+
+        revealed_now = [
+            {
+                "secret_id": secret.id,
+                "content": secret.content,
+                "is_core": secret.is_core
+            }
+            for secret in index.secrets_in(new_mask)
+        ]
+        add_revealed_secrets(state, index, new_mask)
 
         # ---------------------------------------
-        # 4. Recalculate progress (core secrets only)
+        # 4. Recalculate progress (core secrets, or all of them without cores)
         # ---------------------------------------
-        all_core = db.query(SecretModel).filter(
-            SecretModel.suspect_id == suspect_id,
-            SecretModel.is_core == True
-        ).all()
-
-        total_core = len(all_core)
-
-        if total_core > 0:
-            revealed_core = sum(
-                1 for s in all_core if s.id in state.revealed_secret_ids
-            )
-            state.progress = revealed_core / total_core
-            
-            if state.progress >= 1.0:
-                state.is_closed = True
-        else:
-            # ---------------------------------------
-            # Fallback for Suspects without Core Secrets
-            # ---------------------------------------
-            all_regular = db.query(SecretModel).filter(
-                SecretModel.suspect_id == suspect_id,
-            ).all()
-            
-            total_regular = len(all_regular)
-            
-            if total_regular > 0:
-                revealed_regular = sum(
-                    1 for s in all_regular if s.id in state.revealed_secret_ids
-                )
-                state.progress = revealed_regular / total_regular
-                
-                # Suspect without core secrets closes when all minor secrets are found
-                if state.progress >= 1.0:
-                    state.is_closed = True
-            else:
-                # No secrets at all = purely narrative NPC
-                state.progress = 1.0
-                state.is_closed = True
-
-        db.flush()
-        db.refresh(state)
+        state.progress = index.progress(revealed_mask | new_mask)
+
+        # Closes once every counted secret is found (purely narrative NPCs: always)
+        if state.progress >= 1.0:
+            state.is_closed = True
+
+        if snapshot is None:
+            db.flush()
+            db.refresh(state)
 
         if close_session:
             db.commit()
@@ -4,7 +4,10 @@ from sqlalchemy.orm import Session
 from app.infra.db import SessionLocal
 from app.infra.db_models import SessionModel
 from app.services.verdict_service import evaluate_verdict
+from app.services.session_overview_service import set_overview_status
+from app.services.event_bus import EVENT_VERDICT, publish_session_event
 from app.core.exceptions import NotFoundError, RuleViolationError
+from app.core.metrics import SESSIONS_FINISHED
 
 
 def finalize_session(
@@ -59,9 +62,13 @@ def finalize_session(
         session.chosen_evidence_ids = evidence_ids or []
         session.result_type = verdict["result_type"]
         session.status = "finished"
+        set_overview_status(session, db)
 
         db.commit()
         db.refresh(session)
+        SESSIONS_FINISHED.inc(result_type=session.result_type)
+
+        publish_session_event(session.id, EVENT_VERDICT, {"status": session.status, **verdict})
 
         # ----------------------------------------
         # 4. Return minimal useful data
@@ -0,0 +1,285 @@
+"""
+Denormalized per-session read model.
+
+The overview endpoints (GET /sessions/{id}, GET /sessions/{id}/suspects) are
+called after every turn. Instead of joining suspects, suspect states, evidence
+usage and topic states on each call, the whole overview is kept as one JSON
+row in `session_overviews` and served by a primary-key lookup.
+
+The row is written in the same transaction as the state it mirrors:
+- `create_sessions` inserts the initial overviews;
+- every interrogation turn rewrites the entry of its suspect
+  (`apply_turn_to_overview`), from the already loaded turn snapshot;
+- finalizing a session updates its status.
+
+Rows that are missing (sessions created before the read model existed, or
+overviews dropped by a scenario reload) are rebuilt from the normalized
+tables on the next read.
+
+Turns on different suspects of one session may run concurrently, so updates
+are optimistic: the row's `version` is compared and bumped on write, and a
+lost race re-reads the row and re-applies the change (see `_update_overview`).
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import NotFoundError
+from app.infra.db import SessionLocal
+from app.infra.db_models import (
+    ScenarioModel,
+    SessionModel,
+    SessionOverviewModel,
+    SessionSuspectStateModel,
+    SessionSuspectTopicStateModel,
+    SessionEvidenceUsageModel,
+    SuspectModel,
+    EvidenceModel
+)
+from app.services.turn_snapshot import TurnSnapshot
+from app.services.compact_state import is_compact, used_evidence_ids_from_mask
+
+OVERVIEW_OBJECTIVE = "find_culprit"  # placeholder objective for MVP
+
+_MAX_OVERVIEW_UPDATE_ATTEMPTS = 5
+
+
+def build_session_summary(session_id: int, scenario_id: int, status: str, created_at) -> Dict[str, Any]:
+    return {
+        "id": session_id,
+        "scenario_id": scenario_id,
+        "status": status,
+        "created_at": created_at.isoformat()
+    }
+
+
+def build_scenario_summary(scenario: ScenarioModel) -> Dict[str, Any]:
+    return {
+        "title": scenario.title,
+        "description": scenario.description,
+        "objective": OVERVIEW_OBJECTIVE
+    }
+
+
+def build_suspect_entry(
+    suspect: SuspectModel,
+    progress: float = 0.0,
+    is_closed: bool = False,
+    stance: str = "neutral",
+    evidence_used: Iterable[int] = (),
+    topic_heat: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    return {
+        "suspect_id": suspect.id,
+        "name": suspect.name,
+        "backstory": suspect.backstory,
+        "initial_statement": suspect.initial_statement,
+        "progress": progress,
+        "is_closed": is_closed,
+        "stance": stance,
+        "evidence_used": sorted(evidence_used),
+        "topic_heat": topic_heat or {}
+    }
+
+
+def build_session_overview(session: SessionModel, db: Session) -> Dict[str, Any]:
+    """Builds the overview of a session from the normalized tables."""
+    scenario = db.query(ScenarioModel).filter(ScenarioModel.id == session.scenario_id).first()
+
+    suspects = (
+        db.query(SuspectModel)
+        .filter(SuspectModel.scenario_id == session.scenario_id)
+        .order_by(SuspectModel.id)
+        .all()
+    )
+
+    state_map = {
+        s.suspect_id: s
+        for s in db.query(SessionSuspectStateModel).filter(SessionSuspectStateModel.session_id == session.id)
+    }
+
+    evidence_used: Dict[int, List[int]] = {}
+    for suspect_id, evidence_id in db.query(
+        SessionEvidenceUsageModel.suspect_id, SessionEvidenceUsageModel.evidence_id
+    ).filter(SessionEvidenceUsageModel.session_id == session.id):
+        evidence_used.setdefault(suspect_id, []).append(evidence_id)
+
+    compact_states = [s for s in state_map.values() if is_compact(s)]
+    if compact_states:
+        evidences = db.query(EvidenceModel.id, EvidenceModel.bit_index).filter(
+            EvidenceModel.scenario_id == session.scenario_id
+        ).all()
+        for state in compact_states:
+            # Plus usage rows of evidences without a bit_index
+            evidence_used[state.suspect_id] = sorted(
+                set(evidence_used.get(state.suspect_id, ())) | used_evidence_ids_from_mask(state, evidences)
+            )
+
+    topic_heat: Dict[int, Dict[str, float]] = {}
+    for suspect_id, topic_id, heat in db.query(
+        SessionSuspectTopicStateModel.suspect_id,
+        SessionSuspectTopicStateModel.topic_id,
+        SessionSuspectTopicStateModel.sensitive_heat
+    ).filter(SessionSuspectTopicStateModel.session_id == session.id):
+        topic_heat.setdefault(suspect_id, {})[topic_id] = heat
+
+    entries = []
+    for suspect in suspects:
+        state = state_map.get(suspect.id)
+        entries.append(build_suspect_entry(
+            suspect,
+            progress=state.progress if state else 0.0,
+            is_closed=state.is_closed if state else False,
+            stance=state.stance if state else "neutral",
+            evidence_used=evidence_used.get(suspect.id, ()),
+            topic_heat=topic_heat.get(suspect.id)
+        ))
+
+    return {
+        "session": build_session_summary(session.id, session.scenario_id, session.status, session.created_at),
+        "scenario": build_scenario_summary(scenario),
+        "suspects": entries
+    }
+
+
+def _store_overview(session_id: int, payload: Dict[str, Any], db: Session) -> None:
+    """Inserts or replaces the overview row (concurrent first reads may race)."""
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(SessionOverviewModel).values(session_id=session_id, payload=payload)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[SessionOverviewModel.session_id],
+            set_={"payload": stmt.excluded.payload, "version": SessionOverviewModel.version + 1}
+        ))
+    else:
+        db.merge(SessionOverviewModel(session_id=session_id, payload=payload))
+        db.flush()
+
+
+def get_session_overview_payload(session_id: int, db: Optional[Session] = None) -> Dict[str, Any]:
+    """
+    Returns the stored overview of a session: one primary-key lookup, plus a
+    rebuild the first time a session without a stored overview is read.
+    """
+    close_session = False
+    if db is None:
+        db = SessionLocal()
+        close_session = True
+
+    try:
+        overview = db.get(SessionOverviewModel, session_id)
+        if overview is not None:
+            return overview.payload
+
+        session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+        if not session:
+            raise NotFoundError(f"Session with id {session_id} not found.")
+
+        payload = build_session_overview(session, db)
+        _store_overview(session_id, payload, db)
+        db.commit()
+        return payload
+
+    except Exception:
+        db.rollback()
+        raise
+
+    finally:
+        if close_session:
+            db.close()
+
+
+def _update_overview(
+    session_id: int,
+    change: Callable[[Dict[str, Any]], Dict[str, Any]],
+    db: Session
+) -> None:
+    """
+    Writes `change(payload)` with a version-guarded UPDATE, in the caller's
+    transaction. When another transaction wrote the row in between, the row
+    is re-read and the change re-applied; if that keeps failing the row is
+    dropped, to be rebuilt on the next read. Missing rows are left alone.
+    """
+    for _ in range(_MAX_OVERVIEW_UPDATE_ATTEMPTS):
+        # Column query: bypasses the identity map, so a retry sees the new row
+        row = db.query(SessionOverviewModel.payload, SessionOverviewModel.version).filter(
+            SessionOverviewModel.session_id == session_id
+        ).first()
+        if row is None:
+            return
+
+        updated = db.execute(
+            update(SessionOverviewModel)
+            .where(
+                SessionOverviewModel.session_id == session_id,
+                SessionOverviewModel.version == row.version
+            )
+            .values(payload=change(row.payload), version=row.version + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if updated:
+            return
+
+    db.query(SessionOverviewModel).filter(
+        SessionOverviewModel.session_id == session_id
+    ).delete(synchronize_session=False)
+
+
+def apply_turn_to_overview(snapshot: TurnSnapshot, suspect_id: int, evidence_id: Optional[int]) -> None:
+    """
+    Rewrites the interrogated suspect's entry from the turn snapshot, in the
+    turn's transaction. Only that entry changes, so a concurrent turn on
+    another suspect of the session keeps its own entry. Sessions without a
+    stored overview are left to the lazy rebuild on read.
+    """
+    state = snapshot.state
+    if state is None:
+        return
+    topic_heat = {t.topic_id: t.sensitive_heat for t in snapshot.topic_states.values()}
+
+    def change(payload: Dict[str, Any]) -> Dict[str, Any]:
+        entries = []
+        for entry in payload["suspects"]:
+            if entry["suspect_id"] == suspect_id:
+                evidence_used = set(entry["evidence_used"])
+                if evidence_id is not None:
+                    evidence_used.add(evidence_id)
+
+                entry = {
+                    **entry,
+                    "progress": state.progress,
+                    "is_closed": state.is_closed,
+                    "stance": state.stance,
+                    "evidence_used": sorted(evidence_used),
+                    "topic_heat": topic_heat
+                }
+            entries.append(entry)
+        return {**payload, "suspects": entries}
+
+    _update_overview(snapshot.session_id, change, snapshot.db)
+
+
+def set_overview_status(session: SessionModel, db: Session) -> None:
+    """Mirrors a session status change into its overview, in the caller's transaction."""
+    status = session.status
+
+    def change(payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {**payload, "session": {**payload["session"], "status": status}}
+
+    _update_overview(session.id, change, db)
+
+
+def invalidate_scenario_overviews(scenario_id: int, db: Session) -> int:
+    """
+    Drops the overviews of every session of a scenario (e.g. after its suspects
+    changed on reload); they are rebuilt on the next read.
+    """
+    session_ids = db.query(SessionModel.id).filter(SessionModel.scenario_id == scenario_id)
+    return db.query(SessionOverviewModel).filter(
+        SessionOverviewModel.session_id.in_(session_ids.scalar_subquery())
+    ).delete(synchronize_session=False)
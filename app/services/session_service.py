@@ -1,4 +1,5 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from sqlalchemy import case, func, insert
 from sqlalchemy.orm import Session
 
 from app.infra.db import SessionLocal
@@ -6,11 +7,40 @@ from app.infra.db_models import (
     ScenarioModel,
     SessionModel,
     SessionSuspectStateModel,
-    SessionSuspectTopicStateModel,
     SuspectModel,
-    SecretModel
+    SecretModel,
+    SessionOverviewModel
 )
-from app.core.exceptions import NotFoundError
+from app.core.exceptions import DomainError, NotFoundError
+from app.services.turn_snapshot import TurnSnapshot
+from app.services.scenario_catalog import get_catalog_for_suspect
+from app.services.compact_state import compact_state_columns, get_revealed_mask
+from app.core.config import settings
+from app.services.chat_service import list_chat_messages
+from app.services.session_overview_service import (
+    build_scenario_summary,
+    build_session_summary,
+    build_suspect_entry,
+    get_session_overview_payload
+)
+
+
+def initial_suspect_state(session_id: int, suspect_id: int, has_secrets: bool, compact: bool) -> Dict[str, Any]:
+    """Column values of a new suspect state; suspects without any secret start closed."""
+    return {
+        "session_id": session_id,
+        "suspect_id": suspect_id,
+        "revealed_secret_ids": [],
+        "is_closed": not has_secrets,
+        "progress": 0.0 if has_secrets else 1.0,
+        "stance": "neutral",
+        "patience": 50.0,
+        "pressure": 0.0,
+        "rapport": 0.0,
+        "repetition_score": 0.0,
+        "last_topic_id": None,
+        **(compact_state_columns() if compact else {})
+    }
 
 
 def create_session(scenario_id: int, db: Optional[Session] = None) -> SessionModel:
@@ -25,6 +55,31 @@ def create_session(scenario_id: int, db: Optional[Session] = None) -> SessionMod
     Returns:
         SessionModel: The newly created session with suspect states.
     """
+    return create_sessions(scenario_id, 1, db=db)[0]
+
+
+def create_sessions(scenario_id: int, count: int, db: Optional[Session] = None) -> List[Dict[str, Any]]:
+    """
+    Creates `count` sessions for a scenario in a single transaction.
+
+    Secret counts per suspect come from one grouped query, and sessions,
+    suspect states and session overviews are written with one batched INSERT
+    per table.
+
+    Args:
+        scenario_id (int): ID of the scenario.
+        count (int): Number of sessions to create (at least 1).
+        db (Session, optional): Existing SQLAlchemy session.
+
+    Returns:
+        List[Dict]: id, scenario_id, status and created_at of each session.
+
+    Raises:
+        DomainError: If count is lower than 1.
+    """
+    if count < 1:
+        raise DomainError(f"Session count must be at least 1 (got {count}).")
+
     close_session = False
 
     if db is None:
@@ -41,179 +96,127 @@ def create_session(scenario_id: int, db: Optional[Session] = None) -> SessionMod
             raise NotFoundError(f"Scenario with id {scenario_id} does not exist.")
 
         # -------------------------
-        # 2. Create session
+        # 2. Secret counts per suspect (one grouped query)
         # -------------------------
-        session = SessionModel(
-            scenario_id=scenario_id,
-            status="in_progress"
+        suspects = (
+            db.query(
+                SuspectModel,
+                func.count(SecretModel.id),
+                func.count(case((SecretModel.is_core == True, SecretModel.id)))
+            )
+            .outerjoin(SecretModel, SecretModel.suspect_id == SuspectModel.id)
+            .filter(SuspectModel.scenario_id == scenario_id)
+            .group_by(SuspectModel.id)
+            .order_by(SuspectModel.id)
+            .all()
         )
 
-        db.add(session)
-        db.commit()
-        db.refresh(session)
+        # -------------------------
+        # 3. Create sessions
+        # -------------------------
+        sessions = db.execute(
+            insert(SessionModel).returning(SessionModel.id, SessionModel.status, SessionModel.created_at),
+            [{"scenario_id": scenario_id, "status": "in_progress"} for _ in range(count)]
+        ).all()
+        sessions.sort()
 
         # -------------------------
-        # 3. Create initial suspect states
+        # 4. Create initial suspect states
         # -------------------------
-        suspects = db.query(SuspectModel).filter(SuspectModel.scenario_id == scenario_id).all()
-
-        for suspect in suspects:
-            core_secrets = db.query(SecretModel).filter(
-                SecretModel.suspect_id == suspect.id,
-                SecretModel.is_core == True
-            ).count()
-
-            regular_secrets = db.query(SecretModel).filter(
-                SecretModel.suspect_id == suspect.id,
-            ).count()
-
-            initial_progress = 0.0
-            initial_closed = False
-
-            if core_secrets == 0:
-                if regular_secrets == 0:
-                    initial_progress = 1.0
-                    initial_closed = True
-                else:
-                    initial_progress = 0.0
-
-            state = SessionSuspectStateModel(
-                session_id=session.id,
-                suspect_id=suspect.id,
-                revealed_secret_ids=[],
-                is_closed=initial_closed,
-                progress=initial_progress,
-                stance="neutral",
-                patience=50.0,
-                pressure=0.0,
-                rapport=0.0,
-                repetition_score=0.0,
-                last_topic_id=None
-            )
-            db.add(state)
-
-            # --- Epic C: Initialize Topic States ---
-            if scenario.topics:
-                for topic in scenario.topics:
-                    topic_state = SessionSuspectTopicStateModel(
-                        session_id=session.id,
-                        suspect_id=suspect.id,
-                        topic_id=topic["id"],
-                        status="untouched",
-                        times_touched=0,
-                        sensitive_heat=0.0
-                    )
-                    db.add(topic_state)
+        # Topic states are not pre-created: they are upserted on the first
+        # hit (see topic_state_service), so this stays O(suspects).
+        state_rows = []
+        overview_rows = []
+        scenario_summary = build_scenario_summary(scenario)
+
+        for session_id, status, created_at in sessions:
+            suspect_entries = []
+
+            for suspect, regular_secrets, core_secrets in suspects:
+                state = initial_suspect_state(
+                    session_id,
+                    suspect.id,
+                    has_secrets=core_secrets > 0 or regular_secrets > 0,
+                    compact=settings.COMPACT_SESSION_STATE
+                )
+                state_rows.append(state)
+                suspect_entries.append(build_suspect_entry(
+                    suspect,
+                    progress=state["progress"],
+                    is_closed=state["is_closed"]
+                ))
+
+            overview_rows.append({
+                "session_id": session_id,
+                "payload": {
+                    "session": build_session_summary(session_id, scenario_id, status, created_at),
+                    "scenario": scenario_summary,
+                    "suspects": suspect_entries
+                }
+            })
+
+        if state_rows:
+            db.execute(insert(SessionSuspectStateModel), state_rows)
+
+        # -------------------------
+        # 5. Initial overviews (read model)
+        # -------------------------
+        db.execute(insert(SessionOverviewModel), overview_rows)
 
         db.commit()
 
-        # Refresh session to load states
-        db.refresh(session)
+        results = [
+            {
+                "id": session_id,
+                "scenario_id": scenario_id,
+                "status": status,
+                "created_at": created_at.isoformat()
+            }
+            for session_id, status, created_at in sessions
+        ]
 
-        result = {
-            "id": session.id,
-            "scenario_id": session.scenario_id,
-            "status": session.status,
-            "created_at": session.created_at.isoformat()
-        }
+        print(f"[session] {len(results)} session(s) created for scenario {scenario_id}")
+        return results
 
-        print(f"[session] Session {session.id} created for scenario {scenario_id}")
-        return result
+    except Exception:
+        db.rollback()
+        raise
 
     finally:
         if close_session:
             db.close()
 
+
 def get_session_overview(session_id: int, db: Optional[Session] = None) -> Dict[str, Any]:
     """
     Returns a structured overview of the session:
       - session info
       - scenario summary
-      - list of suspects with progress (placeholder logic)
+      - list of suspects with progress, closed flag, stance, evidence used
+        and topic heat
+
+    Served from the denormalized read model (one primary-key lookup), see
+    session_overview_service.
     """
+    return get_session_overview_payload(session_id, db=db)
+
 
+def count_sessions_by_status(db: Optional[Session] = None) -> Dict[str, int]:
+    """Number of sessions per status (one grouped query), e.g. for the metrics gauges."""
     close_session = False
     if db is None:
         db = SessionLocal()
         close_session = True
 
     try:
-        # -------------------------
-        # 1. Load session
-        # -------------------------
-        session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
-
-        if not session:
-            raise NotFoundError(f"Session with id {session_id} not found.")
-
-        # -------------------------
-        # 2. Load scenario
-        # -------------------------
-        scenario = db.query(ScenarioModel).filter(
-            ScenarioModel.id == session.scenario_id
-        ).first()
-
-        # -------------------------
-        # 3. Load suspects + their session state
-        # -------------------------
-        suspects = (
-            db.query(SuspectModel)
-            .filter(SuspectModel.scenario_id == scenario.id)
-            .all()
-        )
-
-        suspect_states = (
-            db.query(SessionSuspectStateModel)
-            .filter(SessionSuspectStateModel.session_id == session.id)
-            .all()
-        )
-
-        # Map suspect_id → state
-        state_map = {s.suspect_id: s for s in suspect_states}
-
-        # -------------------------
-        # 4. Assemble suspect summaries
-        # -------------------------
-        suspects_summary = []
-        for s in suspects:
-            s_state = state_map.get(s.id)
-
-            progress = s_state.progress if s_state else 0.0
-
-            # Pegar o status de 'fechado' (is_closed)
-            is_closed = s_state.is_closed if s_state else False
-
-            suspects_summary.append({
-                "suspect_id": s.id,
-                "name": s.name,
-                "progress": progress,
-                "is_closed": is_closed
-            })
-
-        # -------------------------
-        # 5. Assemble final overview
-        # -------------------------
-        overview = {
-            "session": {
-                "id": session.id,
-                "scenario_id": session.scenario_id,
-                "status": session.status,
-                "created_at": session.created_at.isoformat()
-            },
-            "scenario": {
-                "title": scenario.title,
-                "description": scenario.description,
-                "objective": "find_culprit"  # placeholder objective for MVP
-            },
-            "suspects": suspects_summary
-        }
-
-        return overview
+        rows = db.query(SessionModel.status, func.count(SessionModel.id)).group_by(SessionModel.status).all()
+        return {status: count for status, count in rows}
 
     finally:
         if close_session:
             db.close()
 
+
 def calculate_suspect_progress(
     session_id: int,
     suspect_id: int,
@@ -241,36 +244,41 @@ def calculate_suspect_progress(
                 f"Suspect {suspect_id} does not belong to session {session_id}."
             )
 
-        all_secrets = db.query(SecretModel).filter(
-            SecretModel.suspect_id == suspect_id
-        ).all()
-
-        cores = [s for s in all_secrets if s.is_core]
-        regulars = [s for s in all_secrets if not s.is_core]
-
-        total_core = len(cores)
-        total_regular = len(regulars)
-
-        if total_core > 0:
-            revealed_core = sum(1 for s in cores if s.id in state.revealed_secret_ids)
-            return revealed_core / total_core
-            
-        elif total_regular > 0:
-            revealed_regular = sum(1 for s in regulars if s.id in state.revealed_secret_ids)
-            return revealed_regular / total_regular
-            
-        else:
-            return 1.0
+        # Same index and progress rule as apply_evidence_to_suspect
+        index = get_catalog_for_suspect(suspect_id, db)[1].secret_index
+        return index.progress(get_revealed_mask(state, index))
 
     finally:
         if close_session:
             db.close()
 
 
-def get_suspect_state(session_id: int, suspect_id: int, db: Optional[Session] = None) -> Dict[str, Any]:
+def _serialize_suspect_state(state: SessionSuspectStateModel) -> Dict[str, Any]:
+    return {
+        "progress": state.progress,
+        "is_closed": state.is_closed,
+        "stance": state.stance,
+        "patience": state.patience,
+        "pressure": state.pressure,
+        "rapport": state.rapport
+    }
+
+
+def get_suspect_state(
+    session_id: int,
+    suspect_id: int,
+    db: Optional[Session] = None,
+    snapshot: Optional[TurnSnapshot] = None
+) -> Dict[str, Any]:
     """
     Fetches the progress and closed status of a suspect in a given session.
+    When a turn snapshot is given, reads the already loaded state instead.
     """
+    if snapshot is not None:
+        if not snapshot.state:
+            raise NotFoundError(f"Suspect {suspect_id} not part of session {session_id}.")
+        return _serialize_suspect_state(snapshot.state)
+
     close_session = False
     if db is None:
         db = SessionLocal()
@@ -286,13 +294,60 @@ def get_suspect_state(session_id: int, suspect_id: int, db: Optional[Session] =
         if not state:
             raise NotFoundError(f"Suspect {suspect_id} not part of session {session_id}.")
 
+        return _serialize_suspect_state(state)
+    finally:
+        if close_session:
+            db.close()
+
+
+def get_session_changes(
+    session_id: int,
+    since: int = 0,
+    limit: int = 100,
+    db: Optional[Session] = None
+) -> Dict[str, Any]:
+    """
+    Polling feed: what changed in the session after message id `since`.
+
+    Returns the session status, the id to poll from next (`last_message_id`),
+    the new messages of every suspect (at most `limit`, `has_more` tells the
+    client to poll again right away) and the current state of the suspects
+    those messages belong to. Suspect state only changes within a turn, so a
+    suspect without new messages has nothing new to report.
+    """
+    close_session = False
+    if db is None:
+        db = SessionLocal()
+        close_session = True
+
+    try:
+        session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+        if not session:
+            raise NotFoundError(f"Session with id {session_id} not found.")
+
+        # One extra row tells whether another page is waiting
+        messages = list_chat_messages(session_id, None, db, after_id=since, limit=limit + 1)
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+
+        changed_suspect_ids = sorted({m["suspect_id"] for m in messages})
+        states = []
+        if changed_suspect_ids:
+            states = db.query(SessionSuspectStateModel).filter(
+                SessionSuspectStateModel.session_id == session_id,
+                SessionSuspectStateModel.suspect_id.in_(changed_suspect_ids)
+            ).order_by(SessionSuspectStateModel.suspect_id).all()
+
         return {
-            "progress": state.progress,
-            "is_closed": state.is_closed,
-            "stance": state.stance,
-            "patience": state.patience,
-            "pressure": state.pressure,
-            "rapport": state.rapport
+            "session_id": session.id,
+            "status": session.status,
+            "last_message_id": messages[-1]["id"] if messages else max(since, 0),
+            "has_more": has_more,
+            "messages": messages,
+            "suspects": [
+                {"suspect_id": state.suspect_id, **_serialize_suspect_state(state)}
+                for state in states
+            ]
         }
     finally:
         if close_session:
@@ -303,16 +358,21 @@ def update_suspect_state_from_deltas(
     session_id: int, 
     suspect_id: int, 
     deltas: Dict[str, Any], 
-    db: Session
+    db: Session,
+    snapshot: Optional[TurnSnapshot] = None
 ) -> Dict[str, Any]:
     """
     Applies calculated systemic deltas (pressure, patience, rapport) to the
     suspect state in the database, clamping values appropriately.
+    With a turn snapshot the change stays in memory until the snapshot is flushed.
     """
-    state = db.query(SessionSuspectStateModel).filter(
-        SessionSuspectStateModel.session_id == session_id,
-        SessionSuspectStateModel.suspect_id == suspect_id
-    ).first()
+    if snapshot is not None:
+        state = snapshot.state
+    else:
+        state = db.query(SessionSuspectStateModel).filter(
+            SessionSuspectStateModel.session_id == session_id,
+            SessionSuspectStateModel.suspect_id == suspect_id
+        ).first()
 
     if not state:
         raise NotFoundError(f"State not found for session {session_id}, suspect {suspect_id}")
@@ -330,14 +390,7 @@ def update_suspect_state_from_deltas(
     if "stance" in deltas:
         state.stance = deltas["stance"]
 
-    db.flush()
-
-    return {
-        "progress": state.progress,
-        "is_closed": state.is_closed,
-        "stance": state.stance,
-        "patience": state.patience,
-        "pressure": state.pressure,
-        "rapport": state.rapport
-    }
+    if snapshot is None:
+        db.flush()
 
+    return _serialize_suspect_state(state)
@@ -0,0 +1,73 @@
+"""
+Precompiled topic alias matcher.
+
+Topic aliases are case/accent folded and tokenized once, when the matcher is
+built (normally together with the scenario catalog), into a dictionary keyed
+by the first word of each alias. Classifying a message is then a single pass
+over its words with dictionary lookups, independent of how many topics and
+aliases the scenario declares, and without compiling any regex per turn.
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def fold_text(text: str) -> str:
+    """Case-folds and strips accents: 'Lâmina' -> 'lamina'."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> List[str]:
+    """Splits folded text into words, dropping punctuation."""
+    return _WORD_RE.findall(fold_text(text))
+
+
+class TopicMatcher:
+    """
+    Maps alias word sequences to topic ids.
+
+    `match` returns the detected topic ids in scenario order, so the first one
+    keeps acting as the primary topic, exactly like the former per-topic regex loop.
+    """
+
+    def __init__(self, topics: Iterable[Mapping[str, Any]]):
+        topic_ids: List[str] = []
+        sensitive = set()
+        index: Dict[str, List[Tuple[Tuple[str, ...], int]]] = {}
+
+        for position, topic in enumerate(topics):
+            topic_ids.append(topic["id"])
+            if topic.get("is_sensitive"):
+                sensitive.add(topic["id"])
+
+            for alias in topic.get("aliases", []) or []:
+                words = tuple(tokenize(alias))
+                if words:
+                    index.setdefault(words[0], []).append((words, position))
+
+        self.topic_ids: Tuple[str, ...] = tuple(topic_ids)
+        self.sensitive_topic_ids: FrozenSet[str] = frozenset(sensitive)
+        self._index = index
+
+    def __bool__(self) -> bool:
+        return bool(self._index)
+
+    def match(self, text: str) -> List[str]:
+        words = tokenize(text)
+        hits = set()
+
+        for i, word in enumerate(words):
+            for alias_words, position in self._index.get(word, ()):
+                if position in hits:
+                    continue
+                if tuple(words[i:i + len(alias_words)]) == alias_words:
+                    hits.add(position)
+
+        return [self.topic_ids[p] for p in sorted(hits)]
+
+    def is_sensitive(self, topic_id: str) -> bool:
+        return topic_id in self.sensitive_topic_ids
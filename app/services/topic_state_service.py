@@ -1,19 +1,84 @@
+"""
+Per (session, suspect, topic) conversational state.
+
+Topic states are materialized lazily: a row only exists once the topic was
+hit at least once (`update_topic_hit` upserts it). Reading a topic without a
+row yields the implicit "untouched" default, so session creation does not
+have to pre-create suspects x topics rows.
+"""
+
 from typing import List, Optional, Dict, Any
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from app.infra.db_models import SessionSuspectTopicStateModel
 from app.infra.db import SessionLocal
-from app.core.exceptions import NotFoundError
+from app.services.turn_snapshot import TurnSnapshot
+
+
+def default_topic_state(topic_id: str) -> Dict[str, Any]:
+    """State of a topic that was never hit (no row stored)."""
+    return {
+        "topic_id": topic_id,
+        "status": "untouched",
+        "times_touched": 0,
+        "sensitive_heat": 0.0
+    }
+
+
+def _upsert_topic_state(
+    session_id: int,
+    suspect_id: int,
+    topic_id: str,
+    db: Session
+) -> SessionSuspectTopicStateModel:
+    """
+    Inserts the default row for a topic unless it already exists (concurrent
+    turns may race on the first hit) and returns the stored row.
+    """
+    values = {"session_id": session_id, "suspect_id": suspect_id, **default_topic_state(topic_id)}
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        db.execute(insert(SessionSuspectTopicStateModel).values(**values).on_conflict_do_nothing())
+    else:
+        db.merge(SessionSuspectTopicStateModel(**values))
+        db.flush()
+
+    return db.query(SessionSuspectTopicStateModel).filter(
+        SessionSuspectTopicStateModel.session_id == session_id,
+        SessionSuspectTopicStateModel.suspect_id == suspect_id,
+        SessionSuspectTopicStateModel.topic_id == topic_id
+    ).one()
+
+
+def serialize_topic_state(topic_state: SessionSuspectTopicStateModel) -> Dict[str, Any]:
+    return {
+        "topic_id": topic_state.topic_id,
+        "status": topic_state.status,
+        "times_touched": topic_state.times_touched,
+        "sensitive_heat": topic_state.sensitive_heat
+    }
+
 
 def get_topic_state(
     session_id: int, 
     suspect_id: int, 
     topic_id: str, 
-    db: Optional[Session] = None
+    db: Optional[Session] = None,
+    snapshot: Optional[TurnSnapshot] = None
 ) -> Dict[str, Any]:
     """
     Fetches the state of a specific topic for a suspect in a session.
+    Topics never hit return the "untouched" default.
     """
+    if snapshot is not None:
+        topic_state = snapshot.get_topic_state(topic_id)
+        if not topic_state:
+            return default_topic_state(topic_id)
+        return serialize_topic_state(topic_state)
+
     close_session = False
     if db is None:
         db = SessionLocal()
@@ -27,16 +92,9 @@ def get_topic_state(
         ).first()
 
         if not topic_state:
-            raise NotFoundError(
-                f"Topic state '{topic_id}' not found for suspect {suspect_id} in session {session_id}."
-            )
-
-        return {
-            "topic_id": topic_state.topic_id,
-            "status": topic_state.status,
-            "times_touched": topic_state.times_touched,
-            "sensitive_heat": topic_state.sensitive_heat
-        }
+            return default_topic_state(topic_id)
+
+        return serialize_topic_state(topic_state)
     finally:
         if close_session:
             db.close()
@@ -48,27 +106,33 @@ def update_topic_hit(
     topic_id: str,
     heat_delta: float = 0.0,
     new_status: Optional[str] = None,
-    db: Optional[Session] = None
+    db: Optional[Session] = None,
+    snapshot: Optional[TurnSnapshot] = None
 ) -> Dict[str, Any]:
     """
-    Increments times_touched and optionally updates heat and status.
+    Increments times_touched and optionally updates heat and status, creating
+    the topic state on its first hit.
+    With a turn snapshot the change stays in memory until the snapshot is flushed.
     """
     close_session = False
-    if db is None:
+    if db is None and snapshot is None:
         db = SessionLocal()
         close_session = True
 
     try:
-        topic_state = db.query(SessionSuspectTopicStateModel).filter(
-            SessionSuspectTopicStateModel.session_id == session_id,
-            SessionSuspectTopicStateModel.suspect_id == suspect_id,
-            SessionSuspectTopicStateModel.topic_id == topic_id
-        ).first()
-
-        if not topic_state:
-            raise NotFoundError(
-                f"Topic state '{topic_id}' not found for suspect {suspect_id} in session {session_id}."
-            )
+        if snapshot is not None:
+            topic_state = snapshot.get_topic_state(topic_id)
+            if not topic_state:
+                topic_state = _upsert_topic_state(session_id, suspect_id, topic_id, snapshot.db)
+                snapshot.add_topic_state(topic_state)
+        else:
+            topic_state = db.query(SessionSuspectTopicStateModel).filter(
+                SessionSuspectTopicStateModel.session_id == session_id,
+                SessionSuspectTopicStateModel.suspect_id == suspect_id,
+                SessionSuspectTopicStateModel.topic_id == topic_id
+            ).first()
+            if not topic_state:
+                topic_state = _upsert_topic_state(session_id, suspect_id, topic_id, db)
 
         topic_state.times_touched += 1
         
@@ -83,15 +147,10 @@ def update_topic_hit(
         if close_session:
             db.commit()
             db.refresh(topic_state)
-        else:
+        elif snapshot is None:
             db.flush()
 
-        return {
-            "topic_id": topic_state.topic_id,
-            "status": topic_state.status,
-            "times_touched": topic_state.times_touched,
-            "sensitive_heat": topic_state.sensitive_heat
-        }
+        return serialize_topic_state(topic_state)
     except Exception:
         if close_session:
             db.rollback()
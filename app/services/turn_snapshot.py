@@ -0,0 +1,102 @@
+"""
+Turn snapshot: the mutable session state touched by one interrogation turn.
+
+`TurnSnapshot.load` fetches the session, the suspect state, every topic state
+and every knowledge state of a (session, suspect) pair in three batched
+queries at the start of a turn. The snapshot is then handed to each service
+of the turn, which read and mutate the loaded ORM objects in memory instead
+of re-querying them. Mutations are written by a single `flush()` at the end.
+"""
+
+from typing import Dict, Optional
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.infra.db_models import (
+    SessionModel,
+    SessionSuspectStateModel,
+    SessionSuspectTopicStateModel,
+    SessionSuspectKnowledgeStateModel
+)
+from app.core.exceptions import NotFoundError
+
+
+class TurnSnapshot:
+    def __init__(
+        self,
+        db: Session,
+        session: SessionModel,
+        state: Optional[SessionSuspectStateModel],
+        topic_states: Dict[str, SessionSuspectTopicStateModel],
+        knowledge_states: Dict[str, SessionSuspectKnowledgeStateModel]
+    ):
+        self.db = db
+        self.session = session
+        self.state = state
+        self.topic_states = topic_states
+        self.knowledge_states = knowledge_states
+
+    @property
+    def session_id(self) -> int:
+        return self.session.id
+
+    @classmethod
+    def load(cls, session_id: int, suspect_id: int, db: Session) -> "TurnSnapshot":
+        """
+        Loads the snapshot for (session, suspect).
+        Raises NotFoundError if the session does not exist; a missing suspect
+        state is left as None so callers keep their own validation order.
+        """
+        row = (
+            db.query(SessionModel, SessionSuspectStateModel)
+            .outerjoin(
+                SessionSuspectStateModel,
+                and_(
+                    SessionSuspectStateModel.session_id == SessionModel.id,
+                    SessionSuspectStateModel.suspect_id == suspect_id
+                )
+            )
+            .filter(SessionModel.id == session_id)
+            .first()
+        )
+
+        if not row:
+            raise NotFoundError(f"Session {session_id} not found.")
+
+        session, state = row
+
+        topic_rows = db.query(SessionSuspectTopicStateModel).filter(
+            SessionSuspectTopicStateModel.session_id == session_id,
+            SessionSuspectTopicStateModel.suspect_id == suspect_id
+        ).all()
+
+        knowledge_rows = db.query(SessionSuspectKnowledgeStateModel).filter(
+            SessionSuspectKnowledgeStateModel.session_id == session_id,
+            SessionSuspectKnowledgeStateModel.suspect_id == suspect_id
+        ).all()
+
+        return cls(
+            db=db,
+            session=session,
+            state=state,
+            topic_states={t.topic_id: t for t in topic_rows},
+            knowledge_states={k.knowledge_id: k for k in knowledge_rows}
+        )
+
+    def get_topic_state(self, topic_id: str) -> Optional[SessionSuspectTopicStateModel]:
+        return self.topic_states.get(topic_id)
+
+    def get_knowledge_state(self, knowledge_id: str) -> Optional[SessionSuspectKnowledgeStateModel]:
+        return self.knowledge_states.get(knowledge_id)
+
+    def add_topic_state(self, topic_state: SessionSuspectTopicStateModel) -> None:
+        self.topic_states[topic_state.topic_id] = topic_state
+
+    def add_knowledge_state(self, k_state: SessionSuspectKnowledgeStateModel) -> None:
+        self.db.add(k_state)
+        self.knowledge_states[k_state.knowledge_id] = k_state
+
+    def flush(self) -> None:
+        """Writes every pending mutation of the turn in one flush."""
+        self.db.flush()
@@ -6,10 +6,10 @@ from app.infra.db_models import (
     SessionModel,
     ScenarioModel,
     SuspectModel,
-    EvidenceModel,
-    SessionEvidenceUsageModel
+    EvidenceModel
 )
 from app.core.exceptions import NotFoundError, RuleViolationError
+from app.services.compact_state import get_used_evidence_ids
 
 
 def evaluate_verdict(
@@ -92,12 +92,7 @@ def evaluate_verdict(
             # ----------------------------------------
             # 2.6. Validate Evidence Usage (B3)
             # ----------------------------------------
-            used_evidences = db.query(SessionEvidenceUsageModel.evidence_id).filter(
-                SessionEvidenceUsageModel.session_id == session_id,
-                SessionEvidenceUsageModel.suspect_id == chosen_suspect_id,
-                SessionEvidenceUsageModel.evidence_id.in_(provided)
-            ).all()
-            used_evidence_ids = {row[0] for row in used_evidences}
+            used_evidence_ids = get_used_evidence_ids(session_id, chosen_suspect_id, valid_evidences, db)
 
             for ev_id in provided:
                 if ev_id not in used_evidence_ids:
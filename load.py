@@ -1,4 +1,32 @@
-from app.services.scenario_loader import load_scenario_from_json
+import argparse
+import os
 
-scenario = load_scenario_from_json("scenarios/piloto.json")
-print("Loaded:", scenario.id, scenario.title)
\ No newline at end of file
+from app.services.scenario_loader import load_scenario_from_json, load_scenarios_from_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load scenario JSON files into the database.")
+    parser.add_argument("path", nargs="?", default="scenarios/piloto.json", help="Scenario JSON file")
+    parser.add_argument("--dir", help="Load every *.json file in this directory instead")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Parallel loader processes for --dir (one transaction per file)")
+    args = parser.parse_args()
+
+    if not args.dir:
+        scenario = load_scenario_from_json(args.path)
+        print("Loaded:", scenario.id, scenario.title)
+        return
+
+    results = load_scenarios_from_dir(args.dir, workers=args.workers)
+    for result in results:
+        if "error" in result:
+            print("Failed:", result["path"], "-", result["error"])
+        else:
+            print("Loaded:", result["scenario_id"], result["title"], f"({result['path']})")
+
+    if any("error" in result for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
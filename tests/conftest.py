@@ -1,3 +1,8 @@
+import os
+
+# Metrics are off by default; the /metrics route is installed at import time
+os.environ.setdefault("METRICS_ENABLED", "true")
+
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -10,7 +15,10 @@ import app.services.chat_service as chat_service
 import app.services.secret_service as secret_service
 import app.services.session_service as session_service
 import app.services.session_finalize_service as session_finalize_service
+import app.services.session_overview_service as session_overview_service
 import app.services.verdict_service as verdict_service
+import app.services.scenario_loader as scenario_loader
+from app.services.scenario_catalog import invalidate_scenario_catalog
 
 engine = create_engine(
     "sqlite://",
@@ -27,7 +35,9 @@ chat_service.SessionLocal = TestingSessionLocal
 secret_service.SessionLocal = TestingSessionLocal
 session_service.SessionLocal = TestingSessionLocal
 session_finalize_service.SessionLocal = TestingSessionLocal
+session_overview_service.SessionLocal = TestingSessionLocal
 verdict_service.SessionLocal = TestingSessionLocal
+scenario_loader.SessionLocal = TestingSessionLocal
 
 @pytest.fixture(autouse=True)
 def truncate_tables():
@@ -35,4 +45,6 @@ def truncate_tables():
     # Actually, simplest is to let drop_all run, because loading pilot scenario takes <50ms.
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # Ids are reused after drop_all, so cached scenario data must go too.
+    invalidate_scenario_catalog()
     yield
@@ -0,0 +1,53 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services.ai_adapter_openai import OpenAINpcAIAdapter
+from app.api.schemas.render_context import NpcResponseRenderContext, ResponseMode
+
+
+class FakeStream:
+    def __init__(self, events):
+        self.events = events
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for event in self.events:
+            yield event
+
+
+def _adapter(stream, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    adapter = OpenAINpcAIAdapter()
+
+    async def create(**kwargs):
+        return stream
+
+    adapter.async_client = SimpleNamespace(responses=SimpleNamespace(create=create))
+    adapter._build_prompt = lambda *args: []
+    return adapter
+
+
+def test_stream_is_closed_when_the_consumer_stops_early(monkeypatch):
+    delta = SimpleNamespace(type="response.output_text.delta", delta="Eu ")
+    stream = FakeStream([delta, delta, delta])
+    adapter = _adapter(stream, monkeypatch)
+
+    async def run():
+        replies = adapter.astream_reply(
+            {}, [], {}, NpcResponseRenderContext(response_mode=ResponseMode.deny), npc_context={}
+        )
+        first = await anext(replies)
+        await replies.aclose()
+        return first
+
+    assert asyncio.run(run()) == "Eu "
+    assert stream.closed is True
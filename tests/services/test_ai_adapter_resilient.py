@@ -0,0 +1,284 @@
+import asyncio
+
+from app.core.metrics import LLM_ERRORS, LLM_FALLBACKS
+from app.services.ai_adapter import NpcAIAdapter
+from app.services.ai_adapter_resilient import CircuitBreaker, ResilientNpcAIAdapter
+
+
+class TransientError(Exception):
+    pass
+
+
+class FlakyAdapter(NpcAIAdapter):
+    """Fails `failures` times with a transient error, then answers."""
+
+    def __init__(self, failures: int = 0, error: Exception = None):
+        self.failures = failures
+        self.error = error or TransientError("503")
+        self.calls = 0
+
+    def is_retryable_error(self, exc: Exception) -> bool:
+        return isinstance(exc, TransientError)
+
+    def generate_reply(self, *args, **kwargs) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "primary"
+
+    async def agenerate_reply(self, *args, **kwargs) -> str:
+        return self.generate_reply(*args, **kwargs)
+
+
+class FallbackAdapter(NpcAIAdapter):
+    def generate_reply(self, *args, **kwargs) -> str:
+        return "fallback"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _resilient(primary, breaker=None, **kwargs):
+    kwargs.setdefault("backoff_seconds", 0.0)
+    return ResilientNpcAIAdapter(
+        primary,
+        fallback=FallbackAdapter(),
+        breaker=breaker or CircuitBreaker(failure_threshold=3, reset_seconds=30),
+        **kwargs
+    )
+
+
+def test_transient_errors_are_retried_within_budget():
+    primary = FlakyAdapter(failures=2)
+    adapter = _resilient(primary, max_retries=2)
+
+    assert adapter.generate_reply({}, [], {}, None) == "primary"
+    assert primary.calls == 3
+
+
+def test_exhausted_retries_fall_back():
+    primary = FlakyAdapter(failures=10)
+    adapter = _resilient(primary, max_retries=1)
+
+    assert adapter.generate_reply({}, [], {}, None) == "fallback"
+    assert primary.calls == 2
+
+
+def test_non_retryable_errors_are_not_retried_and_do_not_trip_breaker():
+    primary = FlakyAdapter(failures=10, error=ValueError("400 bad request"))
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    adapter = _resilient(primary, breaker=breaker, max_retries=3)
+
+    assert adapter.generate_reply({}, [], {}, None) == "fallback"
+    assert primary.calls == 1
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_open_breaker_short_circuits_to_fallback_then_half_opens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30, clock=clock)
+    primary = FlakyAdapter(failures=2)
+    adapter = _resilient(primary, breaker=breaker, max_retries=0)
+
+    assert adapter.generate_reply({}, [], {}, None) == "fallback"
+    assert adapter.generate_reply({}, [], {}, None) == "fallback"
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # Provider is not called at all while the breaker is open
+    assert adapter.generate_reply({}, [], {}, None) == "fallback"
+    assert primary.calls == 2
+
+    # After the cool-down a trial call goes through and closes the breaker
+    clock.now = 31
+    assert adapter.generate_reply({}, [], {}, None) == "primary"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_lets_a_single_trial_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 11
+
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_async_calls_are_capped_by_max_concurrency():
+    in_flight = 0
+    peak = 0
+
+    class SlowAdapter(NpcAIAdapter):
+        async def agenerate_reply(self, *args, **kwargs) -> str:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "primary"
+
+    adapter = _resilient(SlowAdapter(), max_concurrency=3)
+
+    async def run():
+        return await asyncio.gather(*(adapter.agenerate_reply({}, [], {}, None) for _ in range(10)))
+
+    assert asyncio.run(run()) == ["primary"] * 10
+    assert peak == 3
+
+
+def test_async_deadline_falls_back_instead_of_hanging():
+    class HangingAdapter(NpcAIAdapter):
+        async def agenerate_reply(self, *args, **kwargs) -> str:
+            await asyncio.sleep(10)
+            return "primary"
+
+    adapter = _resilient(HangingAdapter(), deadline_seconds=0.05)
+
+    assert asyncio.run(adapter.agenerate_reply({}, [], {}, None)) == "fallback"
+    assert adapter.breaker.state == CircuitBreaker.CLOSED  # one failure, threshold is 3
+
+
+def test_stream_retries_before_first_chunk():
+    class FlakyStream(FlakyAdapter):
+        async def astream_reply(self, *args, **kwargs):
+            self.calls += 1
+            if self.calls <= self.failures:
+                raise TransientError("503")
+            yield "a"
+            yield "b"
+
+    primary = FlakyStream(failures=1)
+    adapter = _resilient(primary, max_retries=1)
+
+    async def run():
+        return [chunk async for chunk in adapter.astream_reply({}, [], {}, None)]
+
+    assert asyncio.run(run()) == ["a", "b"]
+    assert primary.calls == 2
+
+
+def test_failed_attempts_and_fallbacks_are_counted():
+    errors_before = LLM_ERRORS.value(kind="retryable")
+    fallbacks_before = LLM_FALLBACKS.value(reason="error")
+
+    adapter = _resilient(FlakyAdapter(failures=10), max_retries=1)
+    assert adapter.generate_reply({}, [], {}, None) == "fallback"
+
+    assert LLM_ERRORS.value(kind="retryable") == errors_before + 2
+    assert LLM_FALLBACKS.value(reason="error") == fallbacks_before + 1
+
+
+def test_cancelled_half_open_trial_releases_the_trial_slot():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 11
+
+    class HangingAdapter(FlakyAdapter):
+        async def agenerate_reply(self, *args, **kwargs) -> str:
+            self.calls += 1
+            if self.calls == 1:
+                await asyncio.sleep(10)
+            return "primary"
+
+    adapter = _resilient(HangingAdapter(), breaker=breaker)
+
+    async def run():
+        trial = asyncio.create_task(adapter.agenerate_reply({}, [], {}, None))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        try:
+            await trial
+        except asyncio.CancelledError:
+            pass
+        return await adapter.agenerate_reply({}, [], {}, None)
+
+    # The next call becomes the trial instead of being rejected forever
+    assert asyncio.run(run()) == "primary"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_saturated_slots_are_reported_as_saturated():
+    fallbacks_before = LLM_FALLBACKS.value(reason="saturated")
+
+    class SlowAdapter(NpcAIAdapter):
+        async def agenerate_reply(self, *args, **kwargs) -> str:
+            await asyncio.sleep(0.2)
+            return "primary"
+
+    adapter = _resilient(SlowAdapter(), max_concurrency=1, deadline_seconds=0.05)
+
+    async def run():
+        return await asyncio.gather(*(adapter.agenerate_reply({}, [], {}, None) for _ in range(2)))
+
+    assert sorted(asyncio.run(run())) == ["fallback", "fallback"]
+    assert LLM_FALLBACKS.value(reason="saturated") == fallbacks_before + 1
+
+
+def test_stream_retry_closes_the_failed_attempt():
+    closed = []
+
+    class Attempt:
+        def __init__(self, number, fail):
+            self.number = number
+            self.fail = fail
+            self.chunks = iter(["ok"])
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            if self.fail:
+                raise TransientError("503")
+            try:
+                return next(self.chunks)
+            except StopIteration:
+                raise StopAsyncIteration
+
+        async def aclose(self):
+            closed.append(self.number)
+
+    class FlakyStream(FlakyAdapter):
+        def astream_reply(self, *args, **kwargs):
+            self.calls += 1
+            return Attempt(self.calls, fail=self.calls <= self.failures)
+
+    primary = FlakyStream(failures=1)
+    adapter = _resilient(primary, max_retries=1)
+
+    async def run():
+        return [chunk async for chunk in adapter.astream_reply({}, [], {}, None)]
+
+    assert asyncio.run(run()) == ["ok"]
+    assert closed == [1, 2]
+
+
+def test_stream_fallback_runs_after_the_slot_is_released():
+    class FailingStream(FlakyAdapter):
+        async def astream_reply(self, *args, **kwargs):
+            raise TransientError("503")
+            yield
+
+    class SlotCheckingFallback(FallbackAdapter):
+        async def astream_reply(self, *args, **kwargs):
+            yield "free" if not adapter._async_slots[asyncio.get_running_loop()].locked() else "held"
+
+    adapter = ResilientNpcAIAdapter(
+        FailingStream(),
+        fallback=SlotCheckingFallback(),
+        max_concurrency=1,
+        max_retries=0,
+        breaker=CircuitBreaker(failure_threshold=3, reset_seconds=30)
+    )
+
+    async def run():
+        return [chunk async for chunk in adapter.astream_reply({}, [], {}, None)]
+
+    assert asyncio.run(run()) == ["free"]
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+from app.infra.db_models import (
+    ScenarioModel, SuspectModel, SessionModel, SessionSuspectStateModel, NpcChatMessageModel
+)
+from app.services.ai_adapter import NpcAIAdapter
+from app.services.interrogation_turn_service import arun_interrogation_turn
+from tests.conftest import TestingSessionLocal
+
+
+class SlowAsyncNpcAIAdapter(NpcAIAdapter):
+    """Simulates a slow model that is awaited instead of blocking a thread."""
+
+    async def agenerate_reply(self, *args, **kwargs) -> str:
+        await asyncio.sleep(0.1)
+        return "Resposta lenta."
+
+
+class CrashAsyncNpcAIAdapter(NpcAIAdapter):
+    async def agenerate_reply(self, *args, **kwargs) -> str:
+        raise RuntimeError("Simulated LLM Timeout Error")
+
+
+def _setup_session(db):
+    scenario = ScenarioModel(title="Async Turn")
+    db.add(scenario)
+    db.flush()
+
+    suspect = SuspectModel(scenario_id=scenario.id, name="Marina", personality="neutro")
+    db.add(suspect)
+    db.flush()
+
+    session = SessionModel(scenario_id=scenario.id)
+    db.add(session)
+    db.flush()
+
+    db.add(SessionSuspectStateModel(session_id=session.id, suspect_id=suspect.id))
+    db.commit()
+    return session.id, suspect.id
+
+
+def test_default_agenerate_reply_runs_sync_adapter_in_worker_thread():
+    calling_threads = []
+
+    class SyncOnlyAdapter(NpcAIAdapter):
+        def generate_reply(self, *args, **kwargs) -> str:
+            calling_threads.append(threading.get_ident())
+            return "sync reply"
+
+    reply = asyncio.run(SyncOnlyAdapter().agenerate_reply({}, [], {}, None))
+
+    assert reply == "sync reply"
+    assert calling_threads and calling_threads[0] != threading.get_ident()
+
+
+def test_async_turn_does_not_block_event_loop_while_waiting_on_model():
+    db = TestingSessionLocal()
+    try:
+        session_id, suspect_id = _setup_session(db)
+
+        async def scenario():
+            ticks = 0
+            turn = asyncio.ensure_future(
+                arun_interrogation_turn(session_id, suspect_id, "onde você estava?", None, db)
+            )
+            while not turn.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            return ticks, turn.result()
+
+        with patch("app.services.chat_service.ai", SlowAsyncNpcAIAdapter()):
+            ticks, result = asyncio.run(scenario())
+        db.commit()
+
+        # The loop kept running other tasks while the model "generated"
+        assert ticks >= 5
+        assert result["npc_message"]["text"] == "Resposta lenta."
+        assert db.query(NpcChatMessageModel).filter_by(session_id=session_id).count() == 2
+    finally:
+        db.close()
+
+
+def test_async_turn_falls_back_to_dummy_on_llm_failure():
+    db = TestingSessionLocal()
+    try:
+        session_id, suspect_id = _setup_session(db)
+
+        with patch("app.services.chat_service.ai", CrashAsyncNpcAIAdapter()):
+            result = asyncio.run(
+                arun_interrogation_turn(session_id, suspect_id, "ok", None, db)
+            )
+
+        assert "Marina" in result["npc_message"]["text"]
+    finally:
+        db.close()
@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+from app.infra.db_models import ScenarioModel, SuspectModel, EvidenceModel, NpcChatMessageModel
+from app.services.ai_adapter import NpcAIAdapter
+from app.services.ai_adapter_cached import CachedNpcAIAdapter
+from app.services.ai_adapter_dummy import DummyNpcAIAdapter
+from app.services.ai_adapter_resilient import ResilientNpcAIAdapter
+from app.services.chat_service import prepare_npc_reply
+from app.services.reply_cache import InMemoryReplyCache
+from app.services.session_service import create_session
+from tests.conftest import TestingSessionLocal
+
+
+class WindowedAdapter(NpcAIAdapter):
+    history_window = 4
+
+
+def _long_interrogation(db, n_messages=30):
+    scenario = ScenarioModel(title="Long Talk")
+    db.add(scenario)
+    db.flush()
+    suspect = SuspectModel(name="Talker", scenario_id=scenario.id)
+    evidence = EvidenceModel(name="Receipt", scenario_id=scenario.id)
+    db.add_all([suspect, evidence])
+    db.commit()
+
+    session_id = create_session(scenario.id, db=db)["id"]
+    last = None
+    for i in range(n_messages):
+        last = NpcChatMessageModel(
+            session_id=session_id,
+            suspect_id=suspect.id,
+            sender_type="player" if i % 2 == 0 else "npc",
+            text=f"message {i}",
+            evidence_id=evidence.id if i in (2, 4) else None
+        )
+        db.add(last)
+    db.commit()
+    return session_id, suspect.id, evidence.id, last.id
+
+
+def test_prepare_npc_reply_loads_only_the_adapter_window():
+    db = TestingSessionLocal()
+    try:
+        session_id, suspect_id, evidence_id, last_id = _long_interrogation(db)
+
+        with patch("app.services.chat_service.ai", WindowedAdapter()), \
+                patch("app.services.chat_service.build_render_context"):
+            request = prepare_npc_reply(session_id, suspect_id, last_id, db=db)
+
+        assert [m["text"] for m in request["chat_history"]] == [f"message {i}" for i in range(26, 30)]
+        assert request["player_message"]["text"] == "message 29"
+
+        # Pressure points come from their own query, outside the window
+        assert request["npc_context"]["pressure_points"] == [
+            {"evidence_id": evidence_id, "text": "message 2"},
+            {"evidence_id": evidence_id, "text": "message 4"}
+        ]
+    finally:
+        db.close()
+
+
+def test_adapter_without_window_gets_full_history():
+    db = TestingSessionLocal()
+    try:
+        session_id, suspect_id, _, last_id = _long_interrogation(db, n_messages=12)
+
+        with patch("app.services.chat_service.ai", NpcAIAdapter()), \
+                patch("app.services.chat_service.build_render_context"):
+            request = prepare_npc_reply(session_id, suspect_id, last_id, db=db)
+
+        assert len(request["chat_history"]) == 12
+    finally:
+        db.close()
+
+
+def test_wrapped_adapters_combine_history_windows():
+    assert DummyNpcAIAdapter().history_window == 0
+    assert CachedNpcAIAdapter(WindowedAdapter()).history_window == 4
+
+    # The cache key hashes the inner adapter's window, so it adds none of its own
+    assert CachedNpcAIAdapter(DummyNpcAIAdapter(), cache=InMemoryReplyCache()).history_window == 0
+
+    assert ResilientNpcAIAdapter(WindowedAdapter(), fallback=DummyNpcAIAdapter()).history_window == 4
+    assert ResilientNpcAIAdapter(NpcAIAdapter()).history_window is None
@@ -11,6 +11,7 @@ class CrashNpcAIAdapter(NpcAIAdapter):
     def generate_reply(self, *args, **kwargs) -> str:
         raise RuntimeError("Simulated LLM Timeout Error")
 
+@patch("app.services.chat_service.get_catalog_for_suspect")
 @patch("app.services.chat_service.NpcChatMessageModel")
 @patch("app.services.chat_service.get_npc_ai_adapter")
 @patch("app.services.chat_service.build_render_context")
@@ -19,7 +20,8 @@ def test_chat_service_fallback_on_llm_failure(
     mock_build_npc_context,
     mock_build_render_context,
     mock_get_adapter,
-    mock_npc_model_class
+    mock_npc_model_class,
+    mock_get_catalog
 ):
     """
     Tests if add_npc_reply gracefully catches LLM crashes
@@ -37,6 +39,7 @@ def test_chat_service_fallback_on_llm_failure(
     mock_suspect.name = "Test Suspect"
     mock_suspect.personality = "neutro"
     mock_suspect.final_phrase = "It's over."
+    mock_suspect.secrets = ()
     
     # Mock finding the player message
     mock_player_msg = MagicMock()
@@ -44,20 +47,17 @@ def test_chat_service_fallback_on_llm_failure(
     mock_player_msg.evidence_id = None
     mock_player_msg.timestamp = datetime.utcnow()
     
-    # Mock the scenario and session
-    mock_session = MagicMock()
+    # Mock the scenario catalog (static scenario data no longer comes from db queries)
     mock_scenario = MagicMock()
+    mock_scenario.secrets = {}
+    mock_get_catalog.return_value = (mock_scenario, mock_suspect)
     
     # Setup chain of db.query().filter().first() returns
     # We will just use side_effect on the first() call to return the correct mock
     
     db_mock.query.return_value.filter.return_value.first.side_effect = [
         mock_state,      # 1. SessionSuspectStateModel
-        mock_suspect,    # 2. SuspectModel (state)
-        mock_player_msg, # 3. NpcChatMessageModel (player message)
-        mock_session,    # 4. SessionModel
-        mock_scenario,   # 5. ScenarioModel
-        mock_suspect     # 6. SuspectModel (final phrase)
+        mock_player_msg, # 2. NpcChatMessageModel (player message)
     ]
     
     # History queries and secrets should return empty to keep it simple
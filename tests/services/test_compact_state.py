@@ -0,0 +1,126 @@
+import os
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.infra.db_models import (
+    ScenarioModel, SuspectModel, EvidenceModel, SecretModel,
+    SessionSuspectStateModel, SessionEvidenceUsageModel, SessionOverviewModel
+)
+from app.services.compact_state import decode_mask, encode_mask, get_revealed_secret_ids, is_compact
+from app.services.scenario_catalog import get_catalog_for_suspect
+from app.services.scenario_loader import load_scenario_from_json
+from app.services.session_service import calculate_suspect_progress
+from tests.conftest import TestingSessionLocal
+
+client = TestClient(app)
+
+
+def test_mask_round_trip():
+    for mask in (0, 1, 0b1011, 1 << 300 | 1):
+        assert decode_mask(encode_mask(mask)) == mask
+    assert encode_mask(0) == b""
+    assert decode_mask(None) == 0
+
+
+def test_scenario_load_assigns_dense_bit_indexes():
+    db = TestingSessionLocal()
+    try:
+        load_scenario_from_json(os.path.join("scenarios", "piloto.json"), db=db)
+        scenario = db.query(ScenarioModel).first()
+
+        evidence_bits = [e.bit_index for e in db.query(EvidenceModel).filter_by(scenario_id=scenario.id)]
+        assert sorted(evidence_bits) == list(range(len(evidence_bits)))
+
+        for suspect in db.query(SuspectModel).filter_by(scenario_id=scenario.id):
+            bits = [s.bit_index for s in db.query(SecretModel).filter_by(suspect_id=suspect.id)]
+            assert sorted(bits) == list(range(len(bits)))
+    finally:
+        db.close()
+
+
+def test_compact_session_keeps_api_shapes(monkeypatch):
+    monkeypatch.setattr(settings, "COMPACT_SESSION_STATE", True)
+
+    db = TestingSessionLocal()
+    try:
+        load_scenario_from_json(os.path.join("scenarios", "piloto.json"), db=db)
+        scenario_id = db.query(ScenarioModel).first().id
+        marina = db.query(SuspectModel).filter(SuspectModel.name == "Marina Souza").one()
+        relatorio = db.query(EvidenceModel).filter(EvidenceModel.name == "Relatório Contábil Alterado").one()
+    finally:
+        db.close()
+
+    session_id = client.post("/sessions", json={"scenario_id": scenario_id}).json()["session_id"]
+    url = f"/sessions/{session_id}/suspects/{marina.id}/messages"
+
+    first = client.post(url, json={"text": "Explique este relatório.", "evidence_id": relatorio.id}).json()
+    assert first["revealed_secrets"]
+    assert first["evidence_effect"] == "revealed_secret"
+
+    again = client.post(url, json={"text": "Explique este relatório.", "evidence_id": relatorio.id}).json()
+    assert again["revealed_secrets"] == []
+    assert again["evidence_effect"] == "duplicate"
+
+    db = TestingSessionLocal()
+    try:
+        state = db.get(SessionSuspectStateModel, (session_id, marina.id))
+        assert is_compact(state)
+        assert state.revealed_secret_ids == []
+        assert db.query(SessionEvidenceUsageModel).count() == 0
+
+        _, suspect = get_catalog_for_suspect(marina.id, db)
+        revealed = get_revealed_secret_ids(state, suspect.secret_index)
+        assert sorted(revealed) == sorted(s["secret_id"] for s in first["revealed_secrets"])
+        assert calculate_suspect_progress(session_id, marina.id, db=db) == state.progress
+    finally:
+        db.close()
+
+    overview = client.get(f"/sessions/{session_id}").json()
+    marina_entry = next(s for s in overview["suspects"] if s["suspect_id"] == marina.id)
+    assert marina_entry["evidence_used"] == [relatorio.id]
+
+    res = client.post(f"/sessions/{session_id}/accuse", json={"suspect_id": marina.id, "evidence_ids": [relatorio.id]})
+    assert res.status_code == 200
+
+
+def test_compact_session_records_evidence_without_bit_as_usage_row(monkeypatch):
+    monkeypatch.setattr(settings, "COMPACT_SESSION_STATE", True)
+
+    db = TestingSessionLocal()
+    try:
+        load_scenario_from_json(os.path.join("scenarios", "piloto.json"), db=db)
+        scenario_id = db.query(ScenarioModel).first().id
+        marina = db.query(SuspectModel).filter(SuspectModel.name == "Marina Souza").one()
+        # Added by hand, outside the scenario loader: no bit_index
+        photo = EvidenceModel(name="Foto avulsa", scenario_id=scenario_id)
+        db.add(photo)
+        db.commit()
+        marina_id, photo_id = marina.id, photo.id
+    finally:
+        db.close()
+
+    session_id = client.post("/sessions", json={"scenario_id": scenario_id}).json()["session_id"]
+    url = f"/sessions/{session_id}/suspects/{marina_id}/messages"
+
+    first = client.post(url, json={"text": "Veja esta foto.", "evidence_id": photo_id})
+    again = client.post(url, json={"text": "Veja esta foto.", "evidence_id": photo_id})
+    assert first.status_code == 200
+    assert again.json()["evidence_effect"] == "duplicate"
+
+    db = TestingSessionLocal()
+    try:
+        assert db.query(SessionEvidenceUsageModel).filter_by(session_id=session_id, evidence_id=photo_id).count() == 1
+    finally:
+        db.close()
+
+    db = TestingSessionLocal()
+    try:
+        db.query(SessionOverviewModel).filter_by(session_id=session_id).delete()
+        db.commit()
+    finally:
+        db.close()
+    overview = client.get(f"/sessions/{session_id}").json()
+    marina_entry = next(s for s in overview["suspects"] if s["suspect_id"] == marina_id)
+    assert marina_entry["evidence_used"] == [photo_id]
@@ -0,0 +1,93 @@
+from app.infra.db_models import ScenarioModel, SuspectModel, EvidenceModel, NpcChatMessageModel, SessionSuspectStateModel
+from app.services.conversation_summary_service import refresh_conversation_summary
+from app.services.prompt_builder import build_npc_prompt
+from app.services.scenario_catalog import get_scenario_catalog
+from app.services.session_service import create_session
+from app.api.schemas.render_context import NpcResponseRenderContext, ResponseMode
+from tests.conftest import TestingSessionLocal
+
+
+def _state_with_messages(db, n_messages):
+    scenario = ScenarioModel(title="Summary Case")
+    db.add(scenario)
+    db.flush()
+    suspect = SuspectModel(name="Marina", scenario_id=scenario.id)
+    evidence = EvidenceModel(name="Bloody glove", scenario_id=scenario.id)
+    db.add_all([suspect, evidence])
+    db.commit()
+
+    session_id = create_session(scenario.id, db=db)["id"]
+    _add_messages(db, session_id, suspect.id, 0, n_messages, evidence_id=evidence.id)
+
+    state = db.query(SessionSuspectStateModel).filter_by(session_id=session_id, suspect_id=suspect.id).one()
+    return state, session_id, suspect.id
+
+
+def _add_messages(db, session_id, suspect_id, start, end, evidence_id=None):
+    for i in range(start, end):
+        db.add(NpcChatMessageModel(
+            session_id=session_id,
+            suspect_id=suspect_id,
+            sender_type="player" if i % 2 == 0 else "npc",
+            text=f"message {i}",
+            evidence_id=evidence_id if i == 0 else None
+        ))
+    db.commit()
+
+
+def test_summary_folds_every_message_that_left_the_window():
+    db = TestingSessionLocal()
+    try:
+        # window 4: nothing has left it yet
+        state, session_id, suspect_id = _state_with_messages(db, 4)
+        assert refresh_conversation_summary(state, history_window=4, db=db) is None
+
+        _add_messages(db, session_id, suspect_id, 4, 7)
+        catalog = get_scenario_catalog(state.session.scenario_id, db)
+        summary = refresh_conversation_summary(state, history_window=4, db=db, catalog=catalog)
+
+        # Every message outside the window is summarized right away
+        assert summary.splitlines() == [
+            '- Detetive: "message 0" [mostrou a evidência: Bloody glove]',
+            '- Você: "message 1"',
+            '- Detetive: "message 2"'
+        ]
+
+        # Already summarized messages are not folded twice
+        assert refresh_conversation_summary(state, history_window=4, db=db) == summary
+
+        _add_messages(db, session_id, suspect_id, 7, 8)
+        summary = refresh_conversation_summary(state, history_window=4, db=db, catalog=catalog)
+        assert summary.splitlines()[-1] == '- Você: "message 3"'
+        assert len(summary.splitlines()) == 4
+    finally:
+        db.close()
+
+
+def test_summary_is_bounded_and_skipped_without_window():
+    db = TestingSessionLocal()
+    try:
+        state, _, _ = _state_with_messages(db, 60)
+
+        assert refresh_conversation_summary(state, history_window=None, db=db) is None
+
+        summary = refresh_conversation_summary(state, history_window=10, db=db, max_chars=200)
+        assert len(summary) <= 200
+        assert summary.startswith("(...)")
+        assert summary.endswith('"message 49"')
+    finally:
+        db.close()
+
+
+def test_prompt_places_summary_between_prefix_and_history():
+    npc_context = {
+        "suspect": {"name": "Marina", "personality": "fria"},
+        "case": {"description": "Caso"},
+        "conversation_summary": '- Detetive: "onde você estava?"'
+    }
+    render_context = NpcResponseRenderContext(npc_stance="neutral", response_mode=ResponseMode.neutral_answer)
+
+    messages = build_npc_prompt(npc_context, [{"sender": "player", "text": "oi"}], render_context)
+
+    assert [m["role"] for m in messages] == ["system", "system", "user", "system"]
+    assert "onde você estava?" in messages[1]["content"]
@@ -13,7 +13,11 @@ def base_mocks():
          patch("app.services.interrogation_turn_service.add_npc_reply") as m_add_n, \
          patch("app.services.interrogation_turn_service.get_suspect_state") as m_state, \
          patch("app.services.interrogation_turn_service.apply_evidence_to_suspect") as m_evi, \
-         patch("app.services.interrogation_turn_service.get_allowed_knowledge_facts") as m_know:
+         patch("app.services.interrogation_turn_service.get_allowed_knowledge_facts") as m_know, \
+         patch("app.services.interrogation_turn_service.get_catalog_for_suspect") as m_catalog, \
+         patch("app.services.interrogation_turn_service.TurnSnapshot"):
+        
+        m_catalog.return_value = (MagicMock(topics=()), MagicMock())
         
         m_add_p.return_value = {"id": 1, "text": "Teste"}
         m_add_n.return_value = {"id": 2, "text": "Resposta"}
@@ -6,6 +6,7 @@ from app.api.schemas.chat import (
     NoveltyLevel
 )
 from app.services.message_analysis_service import analyze_message
+from app.services.topic_matcher import TopicMatcher
 
 def test_analyze_message_ask_intent():
     result = analyze_message("onde você estava ontem à noite?")
@@ -103,3 +104,25 @@ def test_analyze_message_novelty_new():
     res = analyze_message("qual a sua relação com a vítima?", player_history=history)
     assert res.novelty == NoveltyLevel.new
 
+
+def test_analyze_message_topic_matcher_folding_and_phrases():
+    available_topics = [
+        {"id": "blade", "aliases": ["lâmina"], "is_sensitive": False},
+        {"id": "kitchen_knife", "aliases": ["faca de cozinha"], "is_sensitive": True},
+        {"id": "knife", "aliases": ["faca"], "is_sensitive": False}
+    ]
+    matcher = TopicMatcher(available_topics)
+
+    # Accent/case folding is applied to both aliases and message
+    res = analyze_message("Onde está a LAMINA?", topic_matcher=matcher)
+    assert res.detected_topic_ids == ["blade"]
+
+    # Overlapping aliases are all detected, in scenario order
+    res = analyze_message("a faca de cozinha sumiu", topic_matcher=matcher)
+    assert res.detected_topic_ids == ["kitchen_knife", "knife"]
+    assert res.primary_topic_id == "kitchen_knife"
+    assert res.sensitive_topic_ids == ["kitchen_knife"]
+
+    # Aliases only match whole words
+    res = analyze_message("faqueiro de prata", topic_matcher=matcher)
+    assert res.detected_topic_ids == []
@@ -1,5 +1,9 @@
 import pytest
-from app.services.prompt_builder import build_npc_prompt
+from app.services.prompt_builder import (
+    build_npc_prompt,
+    get_static_prompt_prefix,
+    clear_prompt_prefix_cache
+)
 from app.api.schemas.render_context import NpcResponseRenderContext, ResponseMode
 
 def test_prompt_builder_injects_render_context_correctly():
@@ -26,21 +30,23 @@ def test_prompt_builder_injects_render_context_correctly():
         render_context=render_context
     )
     
-    system_prompt = messages[0]["content"]
+    static_prefix = messages[0]["content"]
+    turn_directives = messages[-1]["content"]
     
     # Assertions
-    assert "HOSTILE" in system_prompt
-    assert "evasiva" in system_prompt.lower()
+    assert messages[-1]["role"] == "system"
+    assert "HOSTILE" in turn_directives
+    assert "evasiva" in turn_directives.lower()
     
     # Check allowed facts
-    assert "I like cheese" in system_prompt
-    assert "I hate cats" in system_prompt
+    assert "I like cheese" in turn_directives
+    assert "I hate cats" in turn_directives
     
     # Check allowed knowledge
-    assert "The key is under the mat" in system_prompt
+    assert "The key is under the mat" in turn_directives
     
     # Rules enforcing bounds
-    assert "NUNCA invente fatos novos" in system_prompt
+    assert "NUNCA invente fatos novos" in static_prefix
 
 
 def test_prompt_builder_without_facts():
@@ -60,8 +66,54 @@ def test_prompt_builder_without_facts():
         render_context=render_context
     )
     
-    system_prompt = messages[0]["content"]
+    turn_directives = messages[-1]["content"]
     
     # Should contain fallback texts
-    assert "Nenhum segredo revelado até agora" in system_prompt
-    assert "Nenhum cenário já discutido." in system_prompt
+    assert "Nenhum segredo revelado até agora" in turn_directives
+    assert "Nenhum cenário já discutido." in turn_directives
+
+
+def test_prompt_prefix_is_stable_across_turns():
+    npc_context = {
+        "suspect": {"id": 7, "name": "Marina", "personality": "fria"},
+        "case": {"id": 1, "version": 3, "description": "D", "summary": "S"}
+    }
+    history = [{"sender": "player", "text": "Oi"}, {"sender": "npc", "text": "Olá"}]
+
+    first = build_npc_prompt(
+        npc_context, history[:1],
+        NpcResponseRenderContext(npc_stance="neutral", response_mode=ResponseMode.neutral_answer)
+    )
+    second = build_npc_prompt(
+        npc_context, history,
+        NpcResponseRenderContext(
+            npc_stance="hostile",
+            response_mode=ResponseMode.deny,
+            new_knowledge_this_turn=["A porta estava aberta"]
+        )
+    )
+
+    # Same static prefix and history; only the trailing directives differ
+    assert first[0] == second[0]
+    assert first[1] == second[1]
+    assert "NEUTRAL" in first[-1]["content"]
+    assert "HOSTILE" in second[-1]["content"]
+    assert "HOSTILE" not in second[0]["content"]
+    assert "A porta estava aberta" not in second[0]["content"]
+
+
+def test_prompt_prefix_cache_is_keyed_by_scenario_version():
+    clear_prompt_prefix_cache()
+    npc_context = {
+        "suspect": {"id": 7, "name": "Marina", "personality": "fria"},
+        "case": {"id": 1, "version": 3, "description": "Antiga", "summary": "S"}
+    }
+    assert "Antiga" in get_static_prompt_prefix(npc_context)
+
+    # Same version: cached prefix is served
+    npc_context["case"]["description"] = "Nova"
+    assert "Antiga" in get_static_prompt_prefix(npc_context)
+
+    # Scenario reloaded: new version, new prefix
+    npc_context["case"]["version"] = 4
+    assert "Nova" in get_static_prompt_prefix(npc_context)
@@ -0,0 +1,172 @@
+import asyncio
+import threading
+
+from app.services.ai_adapter import NpcAIAdapter
+from app.services.ai_adapter_cached import CachedNpcAIAdapter
+from app.services.ai_adapter_resilient import CircuitBreaker, ResilientNpcAIAdapter
+from app.services.reply_cache import InMemoryReplyCache, SqliteReplyCache, build_reply_cache_key
+from app.api.schemas.render_context import NpcResponseRenderContext, ResponseMode
+
+
+class CountingAdapter(NpcAIAdapter):
+    def __init__(self):
+        self.calls = 0
+
+    def generate_reply(self, *args, **kwargs) -> str:
+        self.calls += 1
+        return f"reply {self.calls}"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _request(text="Onde você estava?", mode=ResponseMode.deny, history=None):
+    return {
+        "suspect_state": {"suspect_id": 1, "final_phrase": "Não falo mais nada."},
+        "chat_history": history or [],
+        "player_message": {"text": text, "evidence_id": None},
+        "render_context": NpcResponseRenderContext(response_mode=mode),
+        "npc_context": {"case": {"id": 1, "version": 1}}
+    }
+
+
+def test_cache_key_ignores_timestamps_and_old_history():
+    old = [{"sender": "player", "text": f"msg {i}", "timestamp": str(i)} for i in range(10)]
+    same_tail = old[:2] + [dict(m, timestamp="later") for m in old[2:]]
+
+    assert build_reply_cache_key(**_request(history=old)) == build_reply_cache_key(**_request(history=same_tail))
+
+    other = _request(history=old)
+    other["render_context"] = NpcResponseRenderContext(response_mode=ResponseMode.evasive)
+    assert build_reply_cache_key(**_request(history=old)) != build_reply_cache_key(**other)
+
+
+def test_cache_key_covers_the_summary_and_the_prompt_history_window():
+    history = [{"sender": "player", "text": f"msg {i}"} for i in range(10)]
+    earlier_differs = [dict(history[0], text="other")] + history[1:]
+    assert build_reply_cache_key(**_request(history=history), history_turns=10) != \
+        build_reply_cache_key(**_request(history=earlier_differs), history_turns=10)
+
+    summarized = _request()
+    summarized["npc_context"] = dict(summarized["npc_context"], conversation_summary="Ela mentiu sobre o carro.")
+    assert build_reply_cache_key(**summarized) != build_reply_cache_key(**_request())
+
+
+def test_identical_render_context_is_served_from_cache():
+    inner = CountingAdapter()
+    adapter = CachedNpcAIAdapter(inner, cache=InMemoryReplyCache())
+
+    assert adapter.generate_reply(**_request()) == "reply 1"
+    assert asyncio.run(adapter.agenerate_reply(**_request())) == "reply 1"
+    assert adapter.generate_reply(**_request(text="Outra pergunta")) == "reply 2"
+    assert inner.calls == 2
+
+
+def test_final_phrase_never_calls_the_model():
+    inner = CountingAdapter()
+    adapter = CachedNpcAIAdapter(inner)  # short-circuit works even without a cache
+
+    assert adapter.generate_reply(**_request(mode=ResponseMode.final_phrase)) == "Não falo mais nada."
+    assert inner.calls == 0
+
+
+def _open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    return breaker
+
+
+def test_cache_hits_and_final_phrase_bypass_an_open_breaker():
+    inner = CountingAdapter()
+    cache = InMemoryReplyCache()
+    healthy = CachedNpcAIAdapter(ResilientNpcAIAdapter(inner), cache=cache)
+    assert healthy.generate_reply(**_request()) == "reply 1"
+
+    outage = CachedNpcAIAdapter(ResilientNpcAIAdapter(inner, breaker=_open_breaker()), cache=cache)
+    assert outage.generate_reply(**_request()) == "reply 1"
+    assert asyncio.run(outage.agenerate_reply(**_request(mode=ResponseMode.final_phrase))) == "Não falo mais nada."
+    assert inner.calls == 1
+
+
+def test_fallback_replies_are_never_cached():
+    inner = CountingAdapter()
+    cache = InMemoryReplyCache()
+    outage = CachedNpcAIAdapter(ResilientNpcAIAdapter(inner, breaker=_open_breaker()), cache=cache)
+
+    async def stream():
+        return "".join([chunk async for chunk in outage.astream_reply(**_request(text="Stream"))])
+
+    outage.generate_reply(**_request())
+    asyncio.run(outage.agenerate_reply(**_request(text="Async")))
+    asyncio.run(stream())
+    assert inner.calls == 0
+
+    for text in ("Onde você estava?", "Async", "Stream"):
+        assert cache.get(build_reply_cache_key(**_request(text=text))) is None
+
+
+def test_async_paths_do_cache_io_off_the_event_loop():
+    threads = []
+
+    class RecordingCache(InMemoryReplyCache):
+        def get(self, key):
+            threads.append(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key, reply):
+            threads.append(threading.get_ident())
+            super().set(key, reply)
+
+    adapter = CachedNpcAIAdapter(CountingAdapter(), cache=RecordingCache())
+
+    async def run():
+        loop_thread = threading.get_ident()
+        await adapter.agenerate_reply(**_request())
+        [chunk async for chunk in adapter.astream_reply(**_request(text="Stream"))]
+        return loop_thread
+
+    loop_thread = asyncio.run(run())
+    assert len(threads) == 4
+    assert loop_thread not in threads
+
+
+def test_in_memory_cache_lru_and_ttl():
+    clock = FakeClock()
+    cache = InMemoryReplyCache(max_entries=2, ttl_seconds=10, clock=clock)
+
+    cache.set("a", "A")
+    cache.set("b", "B")
+    cache.get("a")        # a is now most recently used
+    cache.set("c", "C")   # evicts b
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+
+    clock.now = 11
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_lru_and_ttl(tmp_path):
+    clock = FakeClock()
+    cache = SqliteReplyCache(str(tmp_path / "cache.db"), max_entries=2, ttl_seconds=10, clock=clock)
+
+    cache.set("a", "A")
+    clock.now = 1
+    cache.set("b", "B")
+    clock.now = 2
+    cache.get("a")
+    clock.now = 3
+    cache.set("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+
+    # Persisted: a new handle on the same file sees the entries
+    reopened = SqliteReplyCache(str(tmp_path / "cache.db"), ttl_seconds=10, clock=clock)
+    assert reopened.get("c") == "C"
+
+    clock.now = 20
+    assert reopened.get("c") is None
@@ -1,5 +1,13 @@
 import pytest
-from app.services.reveal_policy_service import evaluate_reveal_layer
+from sqlalchemy import event
+
+from app.infra.db_models import (
+    ScenarioModel, SuspectModel, SessionModel, SessionSuspectStateModel,
+    SessionSuspectTopicStateModel, SessionSuspectKnowledgeStateModel
+)
+from app.services.reveal_policy_service import evaluate_reveal_layer, get_allowed_knowledge_facts
+from app.services.scenario_catalog import get_catalog_for_suspect
+from tests.conftest import TestingSessionLocal, engine
 
 def test_evaluate_reveal_layer_untouched():
     knowledge_item = {"content_layers": ["fact 1", "fact 2"]}
@@ -93,3 +101,76 @@ def test_evaluate_reveal_layer_observed_boost():
     
     # Normally allowed_layer is 1. Since observed + high rel + pressure > 40, it bumps to 2
     assert evaluate_reveal_layer(knowledge_item, suspect_state, topic_state) == 2
+
+
+def _knowledge_scenario(db, n_items: int):
+    scenario = ScenarioModel(title=f"Knowledge {n_items}")
+    db.add(scenario)
+    db.flush()
+
+    items = [
+        {"id": f"faca_{i}", "topic_id": "faca", "content_layers": [f"faca {i}.1", f"faca {i}.2"]}
+        for i in range(n_items)
+    ] + [{"id": "local_0", "topic_id": "local", "content_layers": ["local 0.1"]}]
+    suspect = SuspectModel(scenario_id=scenario.id, name="John Doe", knowledge_items=items)
+    db.add(suspect)
+    db.flush()
+
+    session = SessionModel(scenario_id=scenario.id)
+    db.add(session)
+    db.flush()
+
+    db.add(SessionSuspectStateModel(session_id=session.id, suspect_id=suspect.id, patience=100.0))
+    db.add(SessionSuspectTopicStateModel(
+        session_id=session.id, suspect_id=suspect.id, topic_id="faca", status="touched", times_touched=1
+    ))
+    db.commit()
+    return session.id, suspect.id
+
+
+def _count_statements(fn):
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+    return result, len(statements)
+
+
+def test_allowed_knowledge_facts_batches_reads_and_writes():
+    db = TestingSessionLocal()
+    try:
+        small = _knowledge_scenario(db, n_items=1)
+        large = _knowledge_scenario(db, n_items=8)
+
+        def run(session_id, suspect_id):
+            return get_allowed_knowledge_facts(session_id, suspect_id, ["faca", "local", "faca"], db=db)
+
+        # Warm the catalog so only session state queries are counted
+        get_catalog_for_suspect(small[1], db)
+        get_catalog_for_suspect(large[1], db)
+
+        _, small_count = _count_statements(lambda: run(*small))
+        facts, large_count = _count_statements(lambda: run(*large))
+
+        assert small_count == large_count
+        # "local" was never touched: nothing revealed for it
+        assert facts["new_knowledge_this_turn"] == [f"faca {i}.1" for i in range(8)]
+
+        depths = dict(db.query(
+            SessionSuspectKnowledgeStateModel.knowledge_id,
+            SessionSuspectKnowledgeStateModel.max_revealed_depth
+        ).filter(SessionSuspectKnowledgeStateModel.session_id == large[0]).all())
+        assert depths == {f"faca_{i}": 1 for i in range(8)}
+
+        # Second read: already revealed layers are known, nothing new
+        facts = run(*large)
+        assert facts["known_knowledge"] == [f"faca {i}.1" for i in range(8)]
+        assert facts["new_knowledge_this_turn"] == []
+    finally:
+        db.close()
@@ -0,0 +1,123 @@
+import pytest
+from dataclasses import FrozenInstanceError
+
+from app.core.exceptions import NotFoundError
+from app.infra.db_models import ScenarioModel, SuspectModel, EvidenceModel, SecretModel
+from app.services.scenario_catalog import (
+    CatalogSecret,
+    SecretIndex,
+    get_scenario_catalog,
+    get_catalog_for_suspect,
+    invalidate_scenario_catalog
+)
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def catalog_db():
+    db = TestingSessionLocal()
+
+    scenario = ScenarioModel(
+        title="Catalog Scenario",
+        topics=[{"id": "faca", "aliases": ["faca"], "is_sensitive": True}]
+    )
+    db.add(scenario)
+    db.flush()
+
+    suspect = SuspectModel(
+        scenario_id=scenario.id,
+        name="Suspect",
+        knowledge_items=[{"id": "k1", "topic_id": "faca", "content_layers": ["a", "b"]}]
+    )
+    evidence = EvidenceModel(scenario_id=scenario.id, name="Knife", related_topic_id="faca")
+    db.add_all([suspect, evidence])
+    db.flush()
+
+    db.add_all([
+        SecretModel(suspect_id=suspect.id, evidence_id=evidence.id, content="core", is_core=True),
+        SecretModel(suspect_id=suspect.id, evidence_id=evidence.id, content="minor", is_core=False),
+    ])
+    db.commit()
+
+    yield {"db": db, "scenario_id": scenario.id, "suspect_id": suspect.id, "evidence_id": evidence.id}
+
+    db.close()
+
+
+def test_catalog_indexes_scenario_data(catalog_db):
+    catalog = get_scenario_catalog(catalog_db["scenario_id"], catalog_db["db"])
+
+    suspect = catalog.get_suspect(catalog_db["suspect_id"])
+    assert suspect.name == "Suspect"
+    assert len(suspect.secrets) == 2
+    assert len(suspect.secrets_by_evidence[catalog_db["evidence_id"]]) == 2
+    assert suspect.knowledge_items[0]["content_layers"] == ("a", "b")
+    assert catalog.get_evidence(catalog_db["evidence_id"]).related_topic_id == "faca"
+    assert catalog.topics[0]["id"] == "faca"
+
+
+def test_catalog_is_cached_and_frozen(catalog_db):
+    db = catalog_db["db"]
+    catalog = get_scenario_catalog(catalog_db["scenario_id"], db)
+
+    # Database edits are invisible until the scenario is invalidated
+    db.query(ScenarioModel).filter(ScenarioModel.id == catalog_db["scenario_id"]).update({"title": "Changed"})
+    db.commit()
+    assert get_scenario_catalog(catalog_db["scenario_id"], db) is catalog
+
+    with pytest.raises(FrozenInstanceError):
+        catalog.title = "Mutated"
+    with pytest.raises(TypeError):
+        catalog.topics[0]["id"] = "other"
+
+
+def test_catalog_invalidation_bumps_version(catalog_db):
+    db = catalog_db["db"]
+    old = get_scenario_catalog(catalog_db["scenario_id"], db)
+
+    db.query(ScenarioModel).filter(ScenarioModel.id == catalog_db["scenario_id"]).update({"title": "Reloaded"})
+    db.commit()
+    invalidate_scenario_catalog(catalog_db["scenario_id"])
+
+    new = get_scenario_catalog(catalog_db["scenario_id"], db)
+    assert new.title == "Reloaded"
+    assert new.version > old.version
+
+
+def test_catalog_for_suspect(catalog_db):
+    catalog, suspect = get_catalog_for_suspect(catalog_db["suspect_id"], catalog_db["db"])
+    assert catalog.id == catalog_db["scenario_id"]
+    assert suspect.id == catalog_db["suspect_id"]
+
+    with pytest.raises(NotFoundError):
+        get_catalog_for_suspect(9999, catalog_db["db"])
+
+
+def _secret(secret_id, evidence_id, is_core):
+    return CatalogSecret(id=secret_id, suspect_id=1, evidence_id=evidence_id, content=f"s{secret_id}", is_core=is_core)
+
+
+def test_secret_index_masks_and_progress_over_core_secrets():
+    index = SecretIndex.build([
+        _secret(10, evidence_id=1, is_core=True),
+        _secret(11, evidence_id=1, is_core=False),
+        _secret(12, evidence_id=2, is_core=True),
+    ])
+
+    evidence_mask = index.evidence_masks[1]
+    assert [s.id for s in index.secrets_in(evidence_mask)] == [10, 11]
+
+    # Unknown ids (e.g. removed by a reload) are ignored
+    revealed = index.mask_of([11, 999])
+    assert [s.id for s in index.secrets_in(evidence_mask & ~revealed)] == [10]
+
+    assert index.progress(revealed) == 0.0
+    assert index.progress(index.mask_of([10, 11])) == 0.5
+    assert index.progress(index.mask_of([10, 12])) == 1.0
+
+
+def test_secret_index_progress_without_core_secrets():
+    regular = SecretIndex.build([_secret(i, evidence_id=1, is_core=False) for i in range(200)])
+    assert regular.progress(regular.mask_of(range(50))) == 0.25
+
+    assert SecretIndex.build([]).progress(0) == 1.0
@@ -1,9 +1,10 @@
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from app.services.session_service import calculate_suspect_progress
 from app.infra.db_models import SecretModel, SessionSuspectStateModel
 from app.core.exceptions import NotFoundError
+from app.services.scenario_catalog import SecretIndex
 
 def build_secret(sid, is_core):
     s = MagicMock(spec=SecretModel)
@@ -11,6 +12,11 @@ def build_secret(sid, is_core):
     s.is_core = is_core
     return s
 
+def calculate_with_secrets(db, secrets):
+    suspect = MagicMock(secret_index=SecretIndex.build(secrets))
+    with patch("app.services.session_service.get_catalog_for_suspect", return_value=(MagicMock(), suspect)):
+        return calculate_suspect_progress(session_id=1, suspect_id=1, db=db)
+
 def test_calculate_progress_with_core_secrets():
     db = MagicMock()
     
@@ -20,16 +26,18 @@ def test_calculate_progress_with_core_secrets():
     db.query.return_value.filter.return_value.first.return_value = state
     
     # Mock secrets: 2 core, 1 regular
-    db.query.return_value.filter.return_value.all.return_value = [
+    secrets = [
         build_secret(10, True),
         build_secret(11, True),
         build_secret(12, False)
     ]
     
-    progress = calculate_suspect_progress(session_id=1, suspect_id=1, db=db)
+    progress = calculate_with_secrets(db, secrets)
     
     # Expected: 1 revealed core / 2 total core = 0.5
     assert progress == 0.5
+    # Secrets come from the scenario catalog; only the state is queried
+    assert db.query.call_count == 1
 
 def test_calculate_progress_with_only_regular_secrets():
     db = MagicMock()
@@ -39,14 +47,14 @@ def test_calculate_progress_with_only_regular_secrets():
     db.query.return_value.filter.return_value.first.return_value = state
     
     # Mock secrets: 0 core, 4 regular
-    db.query.return_value.filter.return_value.all.return_value = [
+    secrets = [
         build_secret(20, False),
         build_secret(21, False),
         build_secret(22, False),
         build_secret(23, False)
     ]
     
-    progress = calculate_suspect_progress(session_id=1, suspect_id=1, db=db)
+    progress = calculate_with_secrets(db, secrets)
     
     # Expected: 2 revealed regular / 4 total regular = 0.5
     assert progress == 0.5
@@ -59,9 +67,9 @@ def test_calculate_progress_with_no_secrets():
     db.query.return_value.filter.return_value.first.return_value = state
     
     # Mock secrets: Empty
-    db.query.return_value.filter.return_value.all.return_value = []
+    secrets = []
     
-    progress = calculate_suspect_progress(session_id=1, suspect_id=1, db=db)
+    progress = calculate_with_secrets(db, secrets)
     
     # Expected: 0 secrets means 100% progress
     assert progress == 1.0
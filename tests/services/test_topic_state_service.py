@@ -1,6 +1,7 @@
 import pytest
 from app.services.topic_state_service import get_topic_state, update_topic_hit
-from app.infra.db_models import SessionSuspectTopicStateModel
+from app.infra.db_models import SessionSuspectTopicStateModel, ScenarioModel, SessionModel
+from app.services.turn_snapshot import TurnSnapshot
 from tests.conftest import TestingSessionLocal
 
 @pytest.fixture
@@ -73,3 +74,47 @@ def test_update_topic_hit_heat_clamping(db_session_with_topic):
         db=db_session_with_topic
     )
     assert state["sensitive_heat"] == 0.0 # Clamped min 0.0
+
+def test_get_topic_state_defaults_to_untouched_without_row():
+    db = TestingSessionLocal()
+    try:
+        state = get_topic_state(session_id=999, suspect_id=888, topic_id="never_hit", db=db)
+        assert state == {"topic_id": "never_hit", "status": "untouched", "times_touched": 0, "sensitive_heat": 0.0}
+        assert db.query(SessionSuspectTopicStateModel).count() == 0
+    finally:
+        db.close()
+
+def test_update_topic_hit_materializes_row_on_first_hit():
+    db = TestingSessionLocal()
+    try:
+        state = update_topic_hit(session_id=999, suspect_id=888, topic_id="new_topic", heat_delta=15.0, db=db)
+        assert state["times_touched"] == 1
+        assert state["status"] == "touched"
+
+        state = update_topic_hit(session_id=999, suspect_id=888, topic_id="new_topic", db=db)
+        assert state["times_touched"] == 2
+        assert state["sensitive_heat"] == 15.0
+        assert db.query(SessionSuspectTopicStateModel).count() == 1
+    finally:
+        db.close()
+
+def test_update_topic_hit_with_snapshot_registers_new_row():
+    db = TestingSessionLocal()
+    try:
+        scenario = ScenarioModel(title="Lazy Topics")
+        db.add(scenario)
+        db.flush()
+        session = SessionModel(scenario_id=scenario.id)
+        db.add(session)
+        db.commit()
+
+        snapshot = TurnSnapshot.load(session.id, 888, db)
+        update_topic_hit(session_id=session.id, suspect_id=888, topic_id="knife", heat_delta=15.0, snapshot=snapshot)
+        snapshot.flush()
+        db.commit()
+
+        assert get_topic_state(session.id, 888, "knife", snapshot=snapshot)["times_touched"] == 1
+        row = db.query(SessionSuspectTopicStateModel).filter_by(session_id=session.id, topic_id="knife").one()
+        assert (row.status, row.times_touched, row.sensitive_heat) == ("touched", 1, 15.0)
+    finally:
+        db.close()
@@ -0,0 +1,99 @@
+import pytest
+from sqlalchemy import event
+
+from app.infra.db_models import (
+    ScenarioModel, SuspectModel, SessionModel, SessionSuspectStateModel,
+    SessionSuspectTopicStateModel, SessionSuspectKnowledgeStateModel
+)
+from app.core.exceptions import NotFoundError
+from app.services.interrogation_turn_service import run_interrogation_turn
+from app.services.turn_snapshot import TurnSnapshot
+from tests.conftest import TestingSessionLocal, engine
+
+
+def _setup_session(db, topic_count: int):
+    topics = [
+        {"id": f"topic_{i}", "aliases": [f"palavra{i}"], "is_sensitive": False}
+        for i in range(topic_count)
+    ]
+    scenario = ScenarioModel(title=f"Snapshot {topic_count}", topics=topics)
+    db.add(scenario)
+    db.flush()
+
+    suspect = SuspectModel(
+        scenario_id=scenario.id,
+        name="Suspect",
+        knowledge_items=[
+            {"id": f"k_{i}", "topic_id": f"topic_{i}", "content_layers": [f"fact {i}"]}
+            for i in range(topic_count)
+        ]
+    )
+    db.add(suspect)
+    db.flush()
+
+    session = SessionModel(scenario_id=scenario.id)
+    db.add(session)
+    db.flush()
+
+    db.add(SessionSuspectStateModel(session_id=session.id, suspect_id=suspect.id, patience=50.0))
+    db.add_all([
+        SessionSuspectTopicStateModel(session_id=session.id, suspect_id=suspect.id, topic_id=t["id"])
+        for t in topics
+    ])
+    db.commit()
+    return session.id, suspect.id, " ".join(f"palavra{i}" for i in range(topic_count))
+
+
+def _count_selects_for_turn(topic_count: int) -> int:
+    db = TestingSessionLocal()
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    try:
+        session_id, suspect_id, text = _setup_session(db, topic_count)
+        # Warm the scenario catalog so only session-state reads are counted
+        run_interrogation_turn(session_id, suspect_id, "ola", None, db)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            result = run_interrogation_turn(session_id, suspect_id, text, None, db)
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert result["npc_message"]["text"]
+        return len(statements)
+    finally:
+        db.close()
+
+
+def test_turn_query_count_is_independent_of_topic_count():
+    assert _count_selects_for_turn(2) == _count_selects_for_turn(25)
+
+
+def test_snapshot_loads_all_session_state():
+    db = TestingSessionLocal()
+    try:
+        session_id, suspect_id, _ = _setup_session(db, 3)
+        db.add(SessionSuspectKnowledgeStateModel(
+            session_id=session_id, suspect_id=suspect_id, knowledge_id="k_0", max_revealed_depth=1
+        ))
+        db.commit()
+
+        snapshot = TurnSnapshot.load(session_id, suspect_id, db)
+
+        assert snapshot.session.id == session_id
+        assert snapshot.state.suspect_id == suspect_id
+        assert set(snapshot.topic_states) == {"topic_0", "topic_1", "topic_2"}
+        assert snapshot.get_knowledge_state("k_0").max_revealed_depth == 1
+        assert snapshot.get_knowledge_state("k_1") is None
+
+        # Unknown suspect: session found, state left for callers to validate
+        assert TurnSnapshot.load(session_id, 9999, db).state is None
+
+        with pytest.raises(NotFoundError):
+            TurnSnapshot.load(9999, suspect_id, db)
+    finally:
+        db.close()
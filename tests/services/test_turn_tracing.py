@@ -0,0 +1,124 @@
+import asyncio
+import json
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from app.core import tracing
+from app.core.config import settings
+from app.infra.db_models import ScenarioModel, SuspectModel, SessionModel, SessionSuspectStateModel
+from app.services.ai_adapter import NpcAIAdapter
+from app.services.interrogation_turn_service import arun_interrogation_turn
+from tests.conftest import TestingSessionLocal
+
+
+class UsageReportingAdapter(NpcAIAdapter):
+    async def agenerate_reply(self, *args, **kwargs) -> str:
+        tracing.record_llm_usage(120, 30)
+        return "Eu estava em casa."
+
+
+def _setup_session(db):
+    scenario = ScenarioModel(title="Traced Turn")
+    db.add(scenario)
+    db.flush()
+
+    suspect = SuspectModel(scenario_id=scenario.id, name="Marina", personality="neutro")
+    db.add(suspect)
+    db.flush()
+
+    session = SessionModel(scenario_id=scenario.id)
+    db.add(session)
+    db.flush()
+
+    db.add(SessionSuspectStateModel(session_id=session.id, suspect_id=suspect.id))
+    db.commit()
+    return session.id, suspect.id
+
+
+def _logged_traces(caplog):
+    return [
+        json.loads(r.getMessage()) for r in caplog.records if r.name == "app.turn_trace"
+    ]
+
+
+def test_tracing_disabled_is_a_shared_noop(monkeypatch):
+    monkeypatch.setattr(settings, "TURN_TRACING", False)
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+
+    with tracing.start_turn_trace("interrogation_turn") as trace:
+        assert trace is None
+        assert tracing.current_trace() is None
+        assert tracing.span("stage") is tracing.span("other")
+        tracing.record_llm_usage(10, 10)
+
+
+def test_trace_records_spans_queries_and_errors(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "TURN_TRACING", True)
+    caplog.set_level(logging.INFO, logger="app.turn_trace")
+    db = TestingSessionLocal()
+    try:
+        with tracing.start_turn_trace("interrogation_turn", session_id=1) as trace:
+            with tracing.span("lookup"):
+                db.query(ScenarioModel).all()
+                db.query(SuspectModel).all()
+
+            # A nested turn reuses the active trace
+            with tracing.start_turn_trace("nested") as nested:
+                assert nested is trace
+
+            with pytest.raises(ValueError):
+                with tracing.span("failing"):
+                    raise ValueError("boom")
+    finally:
+        db.close()
+
+    assert tracing.current_trace() is None
+    lookup, failing = trace.spans
+    assert lookup["name"] == "lookup" and lookup["queries"] == 2
+    assert failing["error"] == "ValueError"
+
+    (logged,) = _logged_traces(caplog)
+    assert logged["event"] == "turn_trace"
+    assert logged["session_id"] == 1
+    assert logged["queries"] == 2
+    assert logged["duration_ms"] >= lookup["duration_ms"]
+
+
+def test_async_turn_trace_covers_phases_and_llm_usage(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "TURN_TRACING", True)
+    monkeypatch.setattr(settings, "DEBUG_TURN_TRACE", True)
+    caplog.set_level(logging.INFO, logger="app.turn_trace")
+
+    finished = []
+    monkeypatch.setattr(tracing, "_finish_hooks", [finished.append])
+
+    db = TestingSessionLocal()
+    try:
+        session_id, suspect_id = _setup_session(db)
+
+        with patch("app.services.chat_service.ai", UsageReportingAdapter()):
+            result = asyncio.run(
+                arun_interrogation_turn(session_id, suspect_id, "onde você estava?", None, db)
+            )
+    finally:
+        db.close()
+
+    (logged,) = _logged_traces(caplog)
+    span_names = [s["name"] for s in logged["spans"]]
+    for stage in ("snapshot_load", "player_message", "message_analysis", "turn_resolution",
+                  "reveal_policy", "prepare_npc_reply", "commit", "llm", "npc_reply_save"):
+        assert stage in span_names
+
+    # Spans from the worker-thread phases land on the same trace
+    assert logged["queries"] > 0
+    assert logged["queries"] >= sum(s["queries"] for s in logged["spans"])
+    assert logged["llm_calls"] == 1
+    assert logged["llm_input_tokens"] == 120
+    assert logged["llm_output_tokens"] == 30
+    assert len(finished) == 1
+
+    # The debug trace carries the timings of the mechanical phase
+    timings = result["debug_trace"].timings
+    assert "snapshot_load" in [s["name"] for s in timings["spans"]]
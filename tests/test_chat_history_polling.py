@@ -0,0 +1,128 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.main import app
+from app.infra.db_models import (
+    ScenarioModel, SuspectModel, SessionModel, SessionSuspectStateModel, NpcChatMessageModel
+)
+from tests.conftest import TestingSessionLocal, engine
+
+client = TestClient(app)
+
+
+def _session_with_two_suspects(db):
+    scenario = ScenarioModel(title="Polling")
+    db.add(scenario)
+    db.flush()
+
+    suspects = [SuspectModel(name=name, scenario_id=scenario.id) for name in ("Ana", "Bruno")]
+    db.add_all(suspects)
+    db.flush()
+
+    session = SessionModel(scenario_id=scenario.id)
+    db.add(session)
+    db.flush()
+
+    for suspect in suspects:
+        db.add(SessionSuspectStateModel(session_id=session.id, suspect_id=suspect.id))
+    db.commit()
+    return session.id, [s.id for s in suspects]
+
+
+def _add_message(db, session_id, suspect_id, text, sender_type="player") -> int:
+    message = NpcChatMessageModel(session_id=session_id, suspect_id=suspect_id, sender_type=sender_type, text=text)
+    db.add(message)
+    db.commit()
+    return message.id
+
+
+def test_messages_are_paginated_with_after_id_cursor():
+    db = TestingSessionLocal()
+    try:
+        session_id, (ana, _) = _session_with_two_suspects(db)
+        ids = [_add_message(db, session_id, ana, f"msg {i}") for i in range(5)]
+        url = f"/sessions/{session_id}/suspects/{ana}/messages"
+
+        assert [m["id"] for m in client.get(url).json()] == ids
+
+        first_page = client.get(url, params={"limit": 2}).json()
+        assert [m["text"] for m in first_page] == ["msg 0", "msg 1"]
+
+        next_page = client.get(url, params={"after_id": first_page[-1]["id"], "limit": 2}).json()
+        assert [m["text"] for m in next_page] == ["msg 2", "msg 3"]
+    finally:
+        db.close()
+
+
+def test_unchanged_poll_returns_304_after_a_single_query():
+    db = TestingSessionLocal()
+    try:
+        session_id, (ana, _) = _session_with_two_suspects(db)
+        _add_message(db, session_id, ana, "Onde você estava?")
+        url = f"/sessions/{session_id}/suspects/{ana}/messages"
+
+        etag = client.get(url).headers["ETag"]
+
+        statements = []
+
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_execute)
+        try:
+            res = client.get(url, headers={"If-None-Match": etag})
+        finally:
+            event.remove(engine, "before_cursor_execute", before_execute)
+
+        assert res.status_code == 304
+        assert res.headers["ETag"] == etag
+        assert len(statements) == 1
+
+        _add_message(db, session_id, ana, "Em casa.", sender_type="npc")
+        res = client.get(url, headers={"If-None-Match": etag})
+        assert res.status_code == 200
+        assert res.headers["ETag"] != etag
+        assert len(res.json()) == 2
+    finally:
+        db.close()
+
+
+def test_empty_history_keeps_404_for_unknown_suspect():
+    db = TestingSessionLocal()
+    try:
+        session_id, _ = _session_with_two_suspects(db)
+        res = client.get(f"/sessions/{session_id}/suspects/9999/messages", headers={"If-None-Match": "*"})
+        assert res.status_code == 404
+    finally:
+        db.close()
+
+
+def test_changes_feed_returns_new_messages_and_states_across_suspects():
+    db = TestingSessionLocal()
+    try:
+        session_id, (ana, bruno) = _session_with_two_suspects(db)
+        seen = _add_message(db, session_id, ana, "primeira")
+        _add_message(db, session_id, bruno, "segunda")
+        last = _add_message(db, session_id, bruno, "terceira", sender_type="npc")
+
+        res = client.get(f"/sessions/{session_id}/changes", params={"since": seen})
+        assert res.status_code == 200
+        body = res.json()
+        assert body["status"] == "in_progress"
+        assert body["last_message_id"] == last
+        assert body["has_more"] is False
+        assert [m["text"] for m in body["messages"]] == ["segunda", "terceira"]
+        assert [s["suspect_id"] for s in body["suspects"]] == [bruno]
+        assert body["suspects"][0]["progress"] == 0.0
+
+        page = client.get(f"/sessions/{session_id}/changes", params={"since": 0, "limit": 2}).json()
+        assert page["has_more"] is True
+        assert len(page["messages"]) == 2
+
+        idle = client.get(f"/sessions/{session_id}/changes", params={"since": last}).json()
+        assert idle["messages"] == [] and idle["suspects"] == []
+        assert idle["last_message_id"] == last
+
+        assert client.get("/sessions/9999/changes").status_code == 404
+    finally:
+        db.close()
@@ -0,0 +1,79 @@
+import threading
+
+from sqlalchemy import inspect, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.infra.db import build_engine, build_engine_kwargs, run_migrations
+from app.infra.db_models import Base
+
+
+def test_sqlite_file_profile_enables_wal_and_pragmas(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'game.db'}")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -settings.SQLITE_CACHE_SIZE_KIB
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == settings.DB_POOL_SIZE
+    finally:
+        engine.dispose()
+
+
+def test_sqlite_reads_do_not_block_behind_an_open_write(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'game.db'}")
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO t (id) VALUES (1)"))
+
+        writer = engine.connect()
+        writer.execute(text("INSERT INTO t (id) VALUES (2)"))  # write txn left open
+
+        result = {}
+
+        def read():
+            with engine.connect() as conn:
+                result["count"] = conn.execute(text("SELECT COUNT(*) FROM t")).scalar()
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join(timeout=2)
+
+        assert result == {"count": 1}  # snapshot read, no "database is locked"
+        writer.rollback()
+        writer.close()
+    finally:
+        engine.dispose()
+
+
+def test_postgres_profile_uses_a_sized_queue_pool():
+    kwargs = build_engine_kwargs("postgresql+psycopg://game:secret@db/game")
+
+    assert kwargs["poolclass"] is QueuePool
+    assert kwargs["pool_size"] == settings.DB_POOL_SIZE
+    assert kwargs["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert kwargs["pool_pre_ping"] is True
+    assert "connect_args" not in kwargs
+
+
+def test_migrations_upgrade_a_database_created_by_an_older_version(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'game.db'}")
+    try:
+        Base.metadata.create_all(bind=engine)
+        # Simulate a database created before the content hash and turn journal
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE scenarios DROP COLUMN content_hash"))
+            conn.execute(text("ALTER TABLE scenarios DROP COLUMN schema_version"))
+            conn.execute(text("DROP TABLE interrogation_turns"))
+
+        run_migrations(bind=engine)
+        run_migrations(bind=engine)  # idempotent
+
+        inspector = inspect(engine)
+        assert {"content_hash", "schema_version"} <= {c["name"] for c in inspector.get_columns("scenarios")}
+        assert "interrogation_turns" in inspector.get_table_names()
+    finally:
+        engine.dispose()
@@ -0,0 +1,85 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.metrics import MetricsRegistry, TURNS, HTTP_QUERIES, SESSIONS
+from app.infra.db_models import ScenarioModel, SuspectModel, SessionModel, SessionSuspectStateModel
+from tests.conftest import TestingSessionLocal
+
+client = TestClient(app)
+
+
+def _setup_session(db):
+    scenario = ScenarioModel(title="Metrics")
+    db.add(scenario)
+    db.flush()
+
+    suspect = SuspectModel(scenario_id=scenario.id, name="Marina", personality="neutro")
+    db.add(suspect)
+    db.flush()
+
+    session = SessionModel(scenario_id=scenario.id)
+    db.add(session)
+    db.flush()
+
+    db.add(SessionSuspectStateModel(session_id=session.id, suspect_id=suspect.id))
+    db.commit()
+    return session.id, suspect.id
+
+
+def test_registry_renders_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests_total", "Requests.", ("route",))
+    latency = registry.histogram("test_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    requests.inc(route='/a"b')
+    requests.inc(2, route='/a"b')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    text = registry.render()
+    assert "# TYPE test_requests_total counter" in text
+    assert 'test_requests_total{route="/a\\"b"} 3' in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "test_latency_seconds_sum 5.55" in text
+    assert "test_latency_seconds_count 3" in text
+
+
+def test_gauge_replace_swaps_all_samples_at_once():
+    registry = MetricsRegistry()
+    sessions = registry.gauge("test_sessions", "Sessions.", ("status",))
+    sessions.set(3, status="finished")
+
+    sessions.replace([(2, {"status": "in_progress"})])
+
+    assert sessions.value(status="in_progress") == 2
+    assert sessions.value(status="finished") == 0
+    assert 'test_sessions{status="finished"}' not in registry.render()
+
+
+def test_metrics_endpoint_reports_turns_requests_and_sessions():
+    db = TestingSessionLocal()
+    try:
+        session_id, suspect_id = _setup_session(db)
+    finally:
+        db.close()
+
+    route = "/sessions/{session_id}/suspects/{suspect_id}/messages"
+    turns_before = TURNS.value(outcome="ok")
+    requests_before = HTTP_QUERIES.count(method="POST", route=route)
+
+    resp = client.post(f"/sessions/{session_id}/suspects/{suspect_id}/messages", json={"text": "onde você estava?"})
+    assert resp.status_code == 200
+
+    assert TURNS.value(outcome="ok") == turns_before + 1
+    # Requests are labelled by route template; statements run in worker threads count too
+    assert HTTP_QUERIES.count(method="POST", route=route) == requests_before + 1
+    assert HTTP_QUERIES.sum(method="POST", route=route) > 0
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'detective_turn_stage_duration_seconds_count{stage="snapshot_load"}' in resp.text
+    assert SESSIONS.value(status="in_progress") >= 1
@@ -0,0 +1,113 @@
+"""
+EXPLAIN QUERY PLAN checks for the interrogation hot path: every query must be
+an index SEARCH, never a full table SCAN nor a temp B-tree sort.
+"""
+import pytest
+from sqlalchemy import and_
+
+from app.infra.db_models import (
+    SessionModel, SuspectModel, EvidenceModel, SecretModel, NpcChatMessageModel,
+    SessionSuspectStateModel, SessionSuspectTopicStateModel,
+    SessionSuspectKnowledgeStateModel, SessionEvidenceUsageModel, InterrogationTurnModel
+)
+from tests.conftest import TestingSessionLocal, engine
+
+
+def _hot_path_queries(db):
+    return {
+        "turn snapshot: session + suspect state": db.query(SessionModel, SessionSuspectStateModel).outerjoin(
+            SessionSuspectStateModel,
+            and_(
+                SessionSuspectStateModel.session_id == SessionModel.id,
+                SessionSuspectStateModel.suspect_id == 1
+            )
+        ).filter(SessionModel.id == 1),
+        "turn snapshot: topic states": db.query(SessionSuspectTopicStateModel).filter(
+            SessionSuspectTopicStateModel.session_id == 1,
+            SessionSuspectTopicStateModel.suspect_id == 1
+        ),
+        "turn snapshot: knowledge states": db.query(SessionSuspectKnowledgeStateModel).filter(
+            SessionSuspectKnowledgeStateModel.session_id == 1,
+            SessionSuspectKnowledgeStateModel.suspect_id == 1
+        ),
+        "chat history": db.query(NpcChatMessageModel).filter(
+            NpcChatMessageModel.session_id == 1,
+            NpcChatMessageModel.suspect_id == 1
+        ).order_by(NpcChatMessageModel.timestamp.asc()),
+        "chat history window": db.query(NpcChatMessageModel).filter(
+            NpcChatMessageModel.session_id == 1,
+            NpcChatMessageModel.suspect_id == 1
+        ).order_by(NpcChatMessageModel.timestamp.desc(), NpcChatMessageModel.id.desc()).limit(10),
+        "last message id (ETag)": db.query(NpcChatMessageModel.id).filter(
+            NpcChatMessageModel.session_id == 1,
+            NpcChatMessageModel.suspect_id == 1
+        ).order_by(NpcChatMessageModel.id.desc()).limit(1),
+        "chat history page": db.query(NpcChatMessageModel).filter(
+            NpcChatMessageModel.session_id == 1,
+            NpcChatMessageModel.suspect_id == 1,
+            NpcChatMessageModel.id > 10
+        ).order_by(NpcChatMessageModel.id.asc()).limit(50),
+        "session changes": db.query(NpcChatMessageModel).filter(
+            NpcChatMessageModel.session_id == 1,
+            NpcChatMessageModel.id > 10
+        ).order_by(NpcChatMessageModel.id.asc()).limit(101),
+        "evidence-bearing messages": db.query(NpcChatMessageModel.evidence_id, NpcChatMessageModel.text).filter(
+            NpcChatMessageModel.session_id == 1,
+            NpcChatMessageModel.suspect_id == 1,
+            NpcChatMessageModel.evidence_id.isnot(None)
+        ).order_by(NpcChatMessageModel.id.asc()),
+        "recent player messages": db.query(NpcChatMessageModel.text).filter(
+            NpcChatMessageModel.session_id == 1,
+            NpcChatMessageModel.suspect_id == 1,
+            NpcChatMessageModel.sender_type == "player",
+            NpcChatMessageModel.id < 100
+        ).order_by(NpcChatMessageModel.id.desc()).limit(3),
+        "evidence usage": db.query(SessionEvidenceUsageModel.evidence_id).filter(
+            SessionEvidenceUsageModel.session_id == 1,
+            SessionEvidenceUsageModel.suspect_id == 1,
+            SessionEvidenceUsageModel.evidence_id.in_([1, 2])
+        ),
+        "session suspect states": db.query(SessionSuspectStateModel).filter(
+            SessionSuspectStateModel.session_id == 1
+        ),
+        "secrets by suspect": db.query(SecretModel).filter(SecretModel.suspect_id == 1),
+        "secrets by suspect and evidence": db.query(SecretModel).filter(
+            SecretModel.suspect_id == 1,
+            SecretModel.evidence_id == 1
+        ),
+        "suspects by scenario": db.query(SuspectModel).filter(SuspectModel.scenario_id == 1),
+        "evidences by scenario": db.query(EvidenceModel).filter(EvidenceModel.scenario_id == 1),
+        "turn by turn_id": db.query(InterrogationTurnModel).filter(
+            InterrogationTurnModel.session_id == 1,
+            InterrogationTurnModel.suspect_id == 1,
+            InterrogationTurnModel.turn_id == "t-1"
+        ),
+    }
+
+
+def _explain(query) -> list:
+    sql = str(query.statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def _query_names() -> list:
+    db = TestingSessionLocal()
+    try:
+        return sorted(_hot_path_queries(db))
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("name", _query_names())
+def test_hot_path_query_uses_an_index(name):
+    db = TestingSessionLocal()
+    try:
+        plan = _explain(_hot_path_queries(db)[name])
+    finally:
+        db.close()
+
+    assert plan
+    for detail in plan:
+        assert not detail.startswith("SCAN"), f"{name}: full scan in plan {plan}"
+        assert "TEMP B-TREE" not in detail, f"{name}: sort without index in plan {plan}"
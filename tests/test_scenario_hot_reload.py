@@ -0,0 +1,178 @@
+import copy
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api.scenarios as scenarios_api
+from app.main import app
+from app.core.config import settings
+from app.core.exceptions import DomainError
+from app.infra.db_models import ScenarioModel, SuspectModel, SecretModel, SessionSuspectStateModel
+from app.services.scenario_catalog import get_scenario_catalog
+from app.services.scenario_loader import sync_scenario_from_json
+from app.services.session_service import create_session
+from tests.conftest import TestingSessionLocal
+
+client = TestClient(app)
+
+BASE_SCENARIO = {
+    "title": "Reload Case",
+    "culprit": "Ana",
+    "suspects": [
+        {"name": "Ana", "backstory": "Cook"},
+        {"name": "Bruno", "backstory": "Driver"}
+    ],
+    "evidences": [{"name": "Knife"}, {"name": "Letter"}],
+    "secrets": [
+        {"suspect": "Ana", "evidence": "Knife", "content": "I cleaned it", "is_core": True},
+        {"suspect": "Bruno", "evidence": "Letter", "content": "I wrote it"}
+    ],
+    "topics": [{"id": "knife", "label": "Knife", "aliases": ["faca"]}]
+}
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def test_sync_skips_unchanged_files(tmp_path):
+    path = _write(tmp_path / "case.json", BASE_SCENARIO)
+    db = TestingSessionLocal()
+    try:
+        created = sync_scenario_from_json(path, db=db)
+        again = sync_scenario_from_json(path, db=db)
+
+        assert created["status"] == "created"
+        assert again == {**created, "status": "unchanged"}
+        assert db.query(ScenarioModel).count() == 1
+    finally:
+        db.close()
+
+
+def test_sync_applies_diff_without_touching_sessions(tmp_path):
+    path = _write(tmp_path / "case.json", BASE_SCENARIO)
+    db = TestingSessionLocal()
+    try:
+        scenario_id = sync_scenario_from_json(path, db=db)["scenario_id"]
+        session = create_session(scenario_id, db=db)
+        ids_before = {s.name: s.id for s in db.query(SuspectModel).filter_by(scenario_id=scenario_id)}
+        ana_secret = db.query(SecretModel).filter_by(suspect_id=ids_before["Ana"]).one()
+
+        state = db.query(SessionSuspectStateModel).filter_by(
+            session_id=session["id"], suspect_id=ids_before["Ana"]
+        ).one()
+        state.revealed_secret_ids = [ana_secret.id]
+        db.commit()
+
+        get_scenario_catalog(scenario_id, db)  # cached before the edit
+
+        edited = copy.deepcopy(BASE_SCENARIO)
+        edited["suspects"][0]["backstory"] = "Head chef"
+        edited["suspects"].append({"name": "Carla"})
+        edited["secrets"][0]["content"] = "I cleaned the knife"
+        edited["topics"][0]["aliases"].append("lamina")
+        _write(tmp_path / "case.json", edited)
+
+        result = sync_scenario_from_json(path, db=db)
+        db.expire_all()
+
+        assert result["status"] == "updated"
+        ids_after = {s.name: s.id for s in db.query(SuspectModel).filter_by(scenario_id=scenario_id)}
+        assert ids_after["Ana"] == ids_before["Ana"] and ids_after["Bruno"] == ids_before["Bruno"]
+        assert "Carla" in ids_after
+
+        secret = db.query(SecretModel).filter_by(id=ana_secret.id).one()
+        assert secret.content == "I cleaned the knife"
+
+        state = db.query(SessionSuspectStateModel).filter_by(
+            session_id=session["id"], suspect_id=ids_before["Ana"]
+        ).one()
+        assert state.revealed_secret_ids == [ana_secret.id]
+
+        catalog = get_scenario_catalog(scenario_id, db)
+        assert catalog.get_suspect(ids_before["Ana"]).backstory == "Head chef"
+        assert "lamina" in catalog.topics[0]["aliases"]
+    finally:
+        db.close()
+
+
+def test_sync_refuses_to_remove_suspect_used_by_a_session(tmp_path):
+    path = _write(tmp_path / "case.json", BASE_SCENARIO)
+    db = TestingSessionLocal()
+    try:
+        scenario_id = sync_scenario_from_json(path, db=db)["scenario_id"]
+        create_session(scenario_id, db=db)
+
+        edited = copy.deepcopy(BASE_SCENARIO)
+        edited["suspects"] = [s for s in edited["suspects"] if s["name"] != "Bruno"]
+        edited["secrets"] = [s for s in edited["secrets"] if s["suspect"] != "Bruno"]
+        _write(tmp_path / "case.json", edited)
+
+        with pytest.raises(DomainError, match="Cannot remove suspect 'Bruno'"):
+            sync_scenario_from_json(path, db=db)
+
+        assert db.query(SuspectModel).filter_by(scenario_id=scenario_id).count() == 2
+    finally:
+        db.close()
+
+
+def test_sync_adds_states_for_new_suspects_and_recomputes_progress(tmp_path):
+    path = _write(tmp_path / "case.json", BASE_SCENARIO)
+    db = TestingSessionLocal()
+    try:
+        scenario_id = sync_scenario_from_json(path, db=db)["scenario_id"]
+        session = create_session(scenario_id, db=db)
+        ids = {s.name: s.id for s in db.query(SuspectModel).filter_by(scenario_id=scenario_id)}
+        ana_secret = db.query(SecretModel).filter_by(suspect_id=ids["Ana"]).one()
+
+        state = db.query(SessionSuspectStateModel).filter_by(
+            session_id=session["id"], suspect_id=ids["Ana"]
+        ).one()
+        state.revealed_secret_ids = [ana_secret.id]
+        state.progress = 1.0
+        db.commit()
+
+        edited = copy.deepcopy(BASE_SCENARIO)
+        edited["suspects"].append({"name": "Carla"})
+        edited["evidences"].append({"name": "Ring"})
+        edited["secrets"].append({"suspect": "Ana", "evidence": "Ring", "content": "I lost it", "is_core": True})
+        edited["secrets"].append({"suspect": "Carla", "evidence": "Ring", "content": "I found it"})
+        _write(tmp_path / "case.json", edited)
+
+        sync_scenario_from_json(path, db=db)
+        db.expire_all()
+
+        states = {
+            s.suspect_id: s
+            for s in db.query(SessionSuspectStateModel).filter_by(session_id=session["id"])
+        }
+        carla_id = db.query(SuspectModel).filter_by(scenario_id=scenario_id, name="Carla").one().id
+        assert states[carla_id].progress == 0.0 and states[carla_id].is_closed is False
+        assert states[ids["Ana"]].progress == 0.5  # 1 of 2 core secrets now
+    finally:
+        db.close()
+
+
+def test_reload_endpoint_requires_the_admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "SCENARIO_RELOAD_TOKEN", "")
+    assert client.post("/scenarios/reload").status_code == 404
+
+    monkeypatch.setattr(settings, "SCENARIO_RELOAD_TOKEN", "secret")
+    assert client.post("/scenarios/reload").status_code == 403
+    assert client.post("/scenarios/reload", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+
+def test_reload_endpoint_reports_each_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(scenarios_api, "SCENARIOS_DIR", tmp_path)
+    monkeypatch.setattr(settings, "SCENARIO_RELOAD_TOKEN", "secret")
+    _write(tmp_path / "case.json", BASE_SCENARIO)
+
+    headers = {"X-Admin-Token": "secret"}
+    first = client.post("/scenarios/reload", headers=headers)
+    second = client.post("/scenarios/reload", headers=headers)
+
+    assert first.status_code == 200
+    assert [r["status"] for r in first.json()] == ["created"]
+    assert [r["status"] for r in second.json()] == ["unchanged"]
@@ -2,8 +2,9 @@ import pytest
 import os
 import json
 import tempfile
+from app.services import scenario_loader
 from app.services.scenario_loader import load_scenario_from_json
-from app.infra.db_models import ScenarioModel
+from app.infra.db_models import ScenarioModel, SecretModel
 from tests.conftest import TestingSessionLocal
 
 def test_scenario_loader_with_topics():
@@ -91,3 +92,98 @@ def test_scenario_loader_with_knowledge_items():
         db.close()
         if tmp_path and os.path.exists(tmp_path):
             os.remove(tmp_path)
+
+
+def _large_scenario(title, n_suspects=20, n_evidences=30, n_secrets=500):
+    return {
+        "title": title,
+        "culprit": "Suspect 7",
+        "suspects": [{"name": f"Suspect {i}"} for i in range(n_suspects)],
+        "evidences": [
+            {"name": f"Evidence {i}", "is_mandatory": i % 10 == 0} for i in range(n_evidences)
+        ],
+        "secrets": [
+            {
+                "suspect": f"Suspect {i % n_suspects}",
+                "evidence": f"Evidence {i % n_evidences}",
+                "content": f"Secret {i}"
+            }
+            for i in range(n_secrets)
+        ]
+    }
+
+
+def test_scenario_loader_bulk_links_ids(tmp_path):
+    path = tmp_path / "large.json"
+    path.write_text(json.dumps(_large_scenario("Large Case")), encoding="utf-8")
+
+    db = TestingSessionLocal()
+    try:
+        scenario = load_scenario_from_json(str(path), db=db)
+
+        suspects = {s.name: s for s in scenario.suspects}
+        evidences = {e.name: e for e in scenario.evidences}
+        assert len(suspects) == 20 and len(evidences) == 30
+        assert scenario.culprit_id == suspects["Suspect 7"].id
+        assert sorted(scenario.required_evidence_ids) == sorted(
+            evidences[f"Evidence {i}"].id for i in (0, 10, 20)
+        )
+
+        secrets = db.query(SecretModel).filter(
+            SecretModel.suspect_id.in_([s.id for s in suspects.values()])
+        ).all()
+        assert len(secrets) == 500
+        for secret in secrets:
+            i = int(secret.content.split()[-1])
+            assert secret.suspect_id == suspects[f"Suspect {i % 20}"].id
+            assert secret.evidence_id == evidences[f"Evidence {i % 30}"].id
+    finally:
+        db.close()
+
+
+def test_load_scenarios_from_dir_reports_each_file(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps(_large_scenario("Case A", n_secrets=5)), encoding="utf-8")
+    broken = _large_scenario("Case B", n_secrets=5)
+    broken["culprit"] = "Ghost"
+    (tmp_path / "b.json").write_text(json.dumps(broken), encoding="utf-8")
+
+    results = scenario_loader.load_scenarios_from_dir(str(tmp_path), workers=1)
+
+    assert [r["title"] for r in results if "error" not in r] == ["Case A"]
+    assert "not found among suspects" in results[1]["error"]
+
+    db = TestingSessionLocal()
+    try:
+        assert [s.title for s in db.query(ScenarioModel).all()] == ["Case A"]
+    finally:
+        db.close()
+
+
+def test_parallel_load_invalidates_the_parent_catalog(tmp_path, monkeypatch):
+    from concurrent.futures import Future
+
+    class InlineExecutor:
+        """Runs submissions inline, standing in for the worker processes."""
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, fn, path):
+            future = Future()
+            future.set_result({"path": path, "scenario_id": 7, "title": "Case A", "status": "updated"})
+            return future
+
+    invalidated = []
+    monkeypatch.setattr(scenario_loader, "ProcessPoolExecutor", InlineExecutor)
+    monkeypatch.setattr(scenario_loader, "invalidate_scenario_catalog", invalidated.append)
+    (tmp_path / "a.json").write_text("{}", encoding="utf-8")
+
+    scenario_loader.load_scenarios_from_dir(str(tmp_path), workers=2)
+
+    assert invalidated == [7]
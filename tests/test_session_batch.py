@@ -0,0 +1,112 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.main import app
+from app.infra.db_models import (
+    ScenarioModel, SuspectModel, EvidenceModel, SecretModel,
+    SessionModel, SessionSuspectStateModel, SessionSuspectTopicStateModel
+)
+from app.core.exceptions import DomainError
+from app.services.session_service import create_sessions
+from tests.conftest import TestingSessionLocal, engine
+
+client = TestClient(app)
+
+
+def _scenario(db, n_suspects: int, n_topics: int) -> int:
+    scenario = ScenarioModel(
+        title=f"Batch {n_suspects}x{n_topics}",
+        topics=[{"id": f"topic_{i}", "label": f"Topic {i}"} for i in range(n_topics)]
+    )
+    db.add(scenario)
+    db.flush()
+
+    evidence = EvidenceModel(name="Photo", scenario_id=scenario.id)
+    db.add(evidence)
+    db.flush()
+
+    for i in range(n_suspects):
+        suspect = SuspectModel(name=f"Suspect {i}", scenario_id=scenario.id)
+        db.add(suspect)
+        db.flush()
+        if i > 0:  # Suspect 0 has no secrets at all
+            db.add(SecretModel(suspect_id=suspect.id, evidence_id=evidence.id, content="s", is_core=i % 2 == 1))
+
+    db.commit()
+    return scenario.id
+
+
+def _count_statements(fn) -> int:
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+    return len(statements)
+
+
+def test_batch_endpoint_creates_sessions_with_initial_states():
+    db = TestingSessionLocal()
+    try:
+        scenario_id = _scenario(db, n_suspects=3, n_topics=2)
+
+        res = client.post("/sessions/batch", json={"scenario_id": scenario_id, "count": 4})
+
+        assert res.status_code == 200
+        session_ids = res.json()["session_ids"]
+        assert len(session_ids) == 4
+        assert db.query(SessionModel).filter(SessionModel.id.in_(session_ids)).count() == 4
+
+        states = db.query(SessionSuspectStateModel).filter(
+            SessionSuspectStateModel.session_id.in_(session_ids)
+        ).all()
+        assert len(states) == 4 * 3
+        closed = {s.suspect_id for s in states if s.is_closed}
+        assert closed == {db.query(SuspectModel.id).filter_by(name="Suspect 0").scalar()}
+
+        # Topic states are materialized on first hit only
+        topic_states = db.query(SessionSuspectTopicStateModel).filter(
+            SessionSuspectTopicStateModel.session_id.in_(session_ids)
+        ).count()
+        assert topic_states == 0
+    finally:
+        db.close()
+
+
+def test_batch_endpoint_validates_scenario_and_count():
+    assert client.post("/sessions/batch", json={"scenario_id": 999, "count": 2}).status_code == 404
+    assert client.post("/sessions/batch", json={"scenario_id": 1, "count": 0}).status_code == 422
+
+
+def test_create_sessions_statement_count_is_independent_of_scenario_size():
+    db = TestingSessionLocal()
+    try:
+        small = _scenario(db, n_suspects=2, n_topics=1)
+        large = _scenario(db, n_suspects=12, n_topics=8)
+
+        small_count = _count_statements(lambda: create_sessions(small, 1, db=db))
+        large_count = _count_statements(lambda: create_sessions(large, 5, db=db))
+
+        assert small_count == large_count
+    finally:
+        db.close()
+
+
+def test_create_sessions_rejects_non_positive_counts():
+    db = TestingSessionLocal()
+    try:
+        scenario_id = _scenario(db, n_suspects=1, n_topics=0)
+        db.commit()
+
+        for count in (0, -3):
+            with pytest.raises(DomainError, match="at least 1"):
+                create_sessions(scenario_id, count, db=db)
+        assert db.query(SessionModel).filter_by(scenario_id=scenario_id).count() == 0
+    finally:
+        db.close()
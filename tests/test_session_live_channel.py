@@ -0,0 +1,84 @@
+import asyncio
+import os
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.main import app
+from app.infra.db_models import ScenarioModel, SuspectModel, EvidenceModel
+from app.services.event_bus import InProcessEventBus, get_event_bus, session_channel
+from app.services.scenario_loader import load_scenario_from_json
+from tests.conftest import TestingSessionLocal
+
+client = TestClient(app)
+
+
+def test_in_process_bus_delivers_events_published_from_other_threads():
+    async def scenario():
+        bus = InProcessEventBus(max_queued=2)
+        with bus.subscribe("session:1") as subscription:
+            publisher = threading.Thread(
+                target=lambda: [bus.publish("session:1", {"n": n}) for n in range(3)]
+            )
+            publisher.start()
+            await asyncio.to_thread(publisher.join)
+            bus.publish("session:2", {"n": "other channel"})
+
+            # Queue holds 2 events: the oldest one was dropped
+            received = [await asyncio.wait_for(subscription.get(), 1) for _ in range(2)]
+            assert received == [{"n": 1}, {"n": 2}]
+
+        assert bus.subscriber_count("session:1") == 0
+
+    asyncio.run(scenario())
+
+
+def test_live_channel_pushes_turns_state_and_verdict():
+    db = TestingSessionLocal()
+    try:
+        load_scenario_from_json(os.path.join("scenarios", "piloto.json"), db=db)
+        scenario_id = db.query(ScenarioModel).first().id
+        marina_id = db.query(SuspectModel).filter(SuspectModel.name == "Marina Souza").one().id
+        relatorio_id = db.query(EvidenceModel).filter(EvidenceModel.name == "Relatório Contábil Alterado").one().id
+    finally:
+        db.close()
+
+    session_id = client.post("/sessions", json={"scenario_id": scenario_id}).json()["session_id"]
+
+    with client.websocket_connect(f"/sessions/{session_id}/live") as ws:
+        snapshot = ws.receive_json()
+        assert snapshot["type"] == "snapshot"
+        assert snapshot["data"]["session"]["id"] == session_id
+
+        turn = client.post(
+            f"/sessions/{session_id}/suspects/{marina_id}/messages",
+            json={"text": "Explique este relatório.", "evidence_id": relatorio_id}
+        ).json()
+
+        state_event = ws.receive_json()
+        assert state_event["type"] == "suspect_state"
+        assert state_event["suspect_id"] == marina_id
+        assert state_event["data"] == {"suspect_id": marina_id, **turn["suspect_state"]}
+
+        turn_event = ws.receive_json()
+        assert turn_event["type"] == "turn"
+        assert turn_event["data"]["npc_message"] == turn["npc_message"]
+        assert turn_event["data"]["turn_id"] == turn["turn_id"]
+
+        client.post(f"/sessions/{session_id}/accuse", json={"suspect_id": marina_id, "evidence_ids": [relatorio_id]})
+
+        verdict_event = ws.receive_json()
+        assert verdict_event["type"] == "verdict"
+        assert verdict_event["data"]["status"] == "finished"
+        assert verdict_event["data"]["chosen_suspect_id"] == marina_id
+
+    assert get_event_bus().subscriber_count(session_channel(session_id)) == 0
+
+
+def test_live_channel_closes_for_unknown_session():
+    with client.websocket_connect("/sessions/9999/live") as ws:
+        with pytest.raises(WebSocketDisconnect) as exc:
+            ws.receive_json()
+    assert exc.value.code == 4404
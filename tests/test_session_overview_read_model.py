@@ -0,0 +1,140 @@
+import os
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.main import app
+from app.infra.db_models import (
+    ScenarioModel, SuspectModel, EvidenceModel, SessionModel, SessionOverviewModel
+)
+from app.services.scenario_loader import load_scenario_from_json
+from app.services.session_overview_service import _update_overview, build_session_overview
+from tests.conftest import TestingSessionLocal, engine
+
+client = TestClient(app)
+
+
+def _load_piloto():
+    db = TestingSessionLocal()
+    try:
+        load_scenario_from_json(os.path.join("scenarios", "piloto.json"), db=db)
+        scenario = db.query(ScenarioModel).first()
+        marina = db.query(SuspectModel).filter(SuspectModel.name == "Marina Souza").one()
+        relatorio = db.query(EvidenceModel).filter(EvidenceModel.name == "Relatório Contábil Alterado").one()
+        return scenario.id, marina.id, relatorio.id
+    finally:
+        db.close()
+
+
+def _rebuilt_overview(session_id: int) -> dict:
+    db = TestingSessionLocal()
+    try:
+        return build_session_overview(db.get(SessionModel, session_id), db)
+    finally:
+        db.close()
+
+
+def test_overview_is_maintained_by_turns_and_finalize():
+    scenario_id, marina_id, relatorio_id = _load_piloto()
+    session_id = client.post("/sessions", json={"scenario_id": scenario_id}).json()["session_id"]
+
+    assert client.get(f"/sessions/{session_id}").json() == _rebuilt_overview(session_id)
+
+    client.post(
+        f"/sessions/{session_id}/suspects/{marina_id}/messages",
+        json={"text": "Explique este relatório.", "evidence_id": relatorio_id}
+    )
+
+    overview = client.get(f"/sessions/{session_id}").json()
+    assert overview == _rebuilt_overview(session_id)
+
+    marina = next(s for s in overview["suspects"] if s["suspect_id"] == marina_id)
+    assert marina["evidence_used"] == [relatorio_id]
+    assert marina["progress"] > 0.0
+
+    suspects = client.get(f"/sessions/{session_id}/suspects").json()
+    assert {s["suspect_id"]: s["progress"] for s in suspects}[marina_id] == marina["progress"]
+
+    client.post(f"/sessions/{session_id}/accuse", json={"suspect_id": marina_id, "evidence_ids": [relatorio_id]})
+    assert client.get(f"/sessions/{session_id}").json()["session"]["status"] == "finished"
+
+
+def test_overview_read_is_a_single_primary_key_lookup():
+    scenario_id, _, _ = _load_piloto()
+    session_id = client.post("/sessions", json={"scenario_id": scenario_id}).json()["session_id"]
+
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        assert client.get(f"/sessions/{session_id}").status_code == 200
+        assert client.get(f"/sessions/{session_id}/suspects").status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+
+    assert len(statements) == 2
+    assert all("FROM session_overviews" in s for s in statements)
+
+
+def test_missing_overview_is_rebuilt_on_read():
+    scenario_id, _, _ = _load_piloto()
+    session_id = client.post("/sessions", json={"scenario_id": scenario_id}).json()["session_id"]
+
+    db = TestingSessionLocal()
+    try:
+        db.query(SessionOverviewModel).delete()
+        db.commit()
+
+        assert client.get(f"/sessions/{session_id}").json() == _rebuilt_overview(session_id)
+        assert db.get(SessionOverviewModel, session_id) is not None
+    finally:
+        db.close()
+
+    assert client.get("/sessions/9999").status_code == 404
+    assert client.get("/sessions/9999/suspects").status_code == 404
+
+
+def test_overview_update_reapplies_its_change_after_a_concurrent_write():
+    scenario_id, marina_id, _ = _load_piloto()
+    session_id = client.post("/sessions", json={"scenario_id": scenario_id}).json()["session_id"]
+
+    db = TestingSessionLocal()
+    try:
+        other_id = next(
+            s["suspect_id"] for s in db.get(SessionOverviewModel, session_id).payload["suspects"]
+            if s["suspect_id"] != marina_id
+        )
+
+        def set_progress(suspect_id, progress):
+            def change(payload):
+                return {**payload, "suspects": [
+                    {**e, "progress": progress} if e["suspect_id"] == suspect_id else e
+                    for e in payload["suspects"]
+                ]}
+            return change
+
+        calls = []
+        marina_change = set_progress(marina_id, 0.5)
+
+        def racing_change(payload):
+            if not calls:
+                # Another turn writes the row after we read it
+                _update_overview(session_id, set_progress(other_id, 0.25), db)
+            calls.append(payload)
+            return marina_change(payload)
+
+        _update_overview(session_id, racing_change, db)
+        db.commit()
+        db.expire_all()
+
+        overview = db.get(SessionOverviewModel, session_id)
+        progress = {s["suspect_id"]: s["progress"] for s in overview.payload["suspects"]}
+        assert progress[marina_id] == 0.5
+        assert progress[other_id] == 0.25  # not overwritten by the stale copy
+        assert len(calls) == 2
+        assert overview.version == 2
+    finally:
+        db.close()
@@ -0,0 +1,81 @@
+import json
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.ai_adapter import NpcAIAdapter
+from tests.conftest import TestingSessionLocal
+from app.infra.db_models import ScenarioModel, SuspectModel, NpcChatMessageModel
+
+client = TestClient(app)
+
+
+class ChunkedNpcAIAdapter(NpcAIAdapter):
+    async def astream_reply(self, *args, **kwargs):
+        for chunk in ["Eu ", "não ", "sei."]:
+            yield chunk
+
+
+def _parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _create_session():
+    db = TestingSessionLocal()
+    try:
+        scenario = ScenarioModel(title="Stream Test")
+        db.add(scenario)
+        db.commit()
+
+        suspect = SuspectModel(name="Marina", scenario_id=scenario.id)
+        db.add(suspect)
+        db.commit()
+        scenario_id, suspect_id = scenario.id, suspect.id
+    finally:
+        db.close()
+
+    res = client.post("/sessions", json={"scenario_id": scenario_id})
+    return res.json()["session_id"], suspect_id
+
+
+def test_stream_sends_mechanics_first_then_tokens_and_persists_reply():
+    session_id, suspect_id = _create_session()
+
+    with patch("app.services.chat_service.ai", ChunkedNpcAIAdapter()):
+        res = client.post(
+            f"/sessions/{session_id}/suspects/{suspect_id}/messages/stream",
+            json={"text": "Onde você estava?", "turn_id": "t-1"}
+        )
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/event-stream")
+
+    events = _parse_sse(res.text)
+    names = [name for name, _ in events]
+    assert names == ["turn", "token", "token", "token", "done"]
+
+    turn = events[0][1]
+    assert turn["turn_id"] == "t-1"
+    assert turn["evidence_effect"] == "none"
+    assert "suspect_state" in turn and "topic_signal" in turn and "feedback_hints" in turn
+    assert "npc_message" not in turn
+
+    assert "".join(data["text"] for name, data in events if name == "token") == "Eu não sei."
+    assert events[-1][1]["npc_message"]["text"] == "Eu não sei."
+
+    db = TestingSessionLocal()
+    try:
+        npc = db.query(NpcChatMessageModel).filter_by(session_id=session_id, sender_type="npc").one()
+        assert npc.text == "Eu não sei."
+    finally:
+        db.close()
+
+
+def test_stream_returns_http_error_for_mechanical_failures():
+    res = client.post("/sessions/9999/suspects/1/messages/stream", json={"text": "Oi"})
+    assert res.status_code == 404